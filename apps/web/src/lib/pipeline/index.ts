@@ -116,10 +116,10 @@ export async function runPipeline(
 
   // Step 5: Create report in DB
   console.log("[Pipeline] Step 5: Creating report...");
-  // Dedup: upsert by unique (periodStart, periodEnd)
+  // Dedup: upsert by unique (periodStart, periodEnd, shard); this pipeline is never sharded
   const report = await prisma.report.upsert({
     where: {
-      periodStart_periodEnd: { periodStart: pStart, periodEnd: pEnd },
+      periodStart_periodEnd_shard: { periodStart: pStart, periodEnd: pEnd, shard: "" },
     },
     update: {
       status: "processing",
@@ -0,0 +1,415 @@
+"""
+Approximate nearest-neighbour indexes for the competitor corpus.
+
+Indexes are built offline from the corpus embeddings and persisted under
+ANN_INDEX_DIR as .npy arrays plus a JSON manifest and name list. At query time
+the arrays are opened with mmap_mode="r", so only the pages a search touches
+are read. Every backend is a CorpusIndex, so saturation checks use them
+unchanged; corpora below ANN_MIN_CORPUS (or a missing backend library) fall
+back to an exact scan over the same memory-mapped matrix.
+
+The pgvector backend instead keeps the corpus in Postgres (corpus_projects)
+behind an HNSW/IVFFlat index and queries it with db.nearest_projects_batch.
+
+Usage:
+  python ann.py build [--backend ivf|hnsw|pgvector]
+  python ann.py bench [--synthetic N] [--queries Q] [--k K]
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import psycopg2
+
+try:
+    import hnswlib
+    HAS_HNSWLIB = True
+except ImportError:
+    HAS_HNSWLIB = False
+
+from config import (
+    ANN_BACKEND, ANN_INDEX_DIR, ANN_MIN_CORPUS, ANN_NLIST, ANN_NPROBE,
+    HNSW_M, HNSW_EF_CONSTRUCTION, HNSW_EF_SEARCH, PGVECTOR_INDEX, load_fixture,
+)
+from clustering import CorpusIndex, l2_normalize, top_k_rows
+from embedding_store import EmbeddingStore, load_embedding_fixture
+import db
+
+log = logging.getLogger("pipeline")
+
+BACKENDS = ("ivf", "hnsw")
+
+
+# ═══════════════════════════════════════
+# Backends
+# ═══════════════════════════════════════
+
+class IVFIndex(CorpusIndex):
+    """
+    Inverted-file index: k-means centroids partition the corpus into lists.
+
+    Rows are stored grouped by list, so list `i` is the contiguous slice
+    `matrix[offsets[i]:offsets[i + 1]]` and a query scans only the `nprobe`
+    lists whose centroids are closest to it.
+    """
+
+    def __init__(
+        self,
+        names: list[str],
+        matrix: np.ndarray,
+        centroids: np.ndarray,
+        offsets: np.ndarray,
+        meta: dict[str, dict] | None = None,
+        nprobe: int = ANN_NPROBE,
+    ):
+        self.names = list(names)
+        self.matrix = matrix
+        self.centroids = centroids
+        self.offsets = offsets
+        self.meta = meta or {}
+        self.nprobe = nprobe
+
+    def search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        queries = l2_normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        k = min(k, len(self))
+        probe_order = np.argsort(-(queries @ self.centroids.T), axis=1)
+
+        indices = np.empty((len(queries), k), dtype=np.int64)
+        sims = np.empty((len(queries), k), dtype=np.float32)
+        for qi, query in enumerate(queries):
+            # Probe nprobe lists, and keep going until there are at least k rows
+            ranges, count = [], 0
+            for probed, lst in enumerate(probe_order[qi], start=1):
+                lo, hi = int(self.offsets[lst]), int(self.offsets[lst + 1])
+                if hi > lo:
+                    ranges.append((lo, hi))
+                    count += hi - lo
+                if probed >= self.nprobe and count >= k:
+                    break
+            rows = np.concatenate([np.arange(lo, hi) for lo, hi in ranges])
+            block = np.concatenate([self.matrix[lo:hi] for lo, hi in ranges])
+            top, top_sims = top_k_rows((block @ query)[None, :], k)
+            indices[qi] = rows[top[0]]
+            sims[qi] = top_sims[0]
+        return indices, sims
+
+
+class HNSWIndex(CorpusIndex):
+    """Hierarchical navigable small-world graph (hnswlib) over inner product."""
+
+    def __init__(
+        self,
+        names: list[str],
+        matrix: np.ndarray,
+        graph: "hnswlib.Index",
+        meta: dict[str, dict] | None = None,
+        ef: int = HNSW_EF_SEARCH,
+    ):
+        self.names = list(names)
+        self.matrix = matrix
+        self.graph = graph
+        self.meta = meta or {}
+        self.ef = ef
+
+    def search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        queries = l2_normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        k = min(k, len(self))
+        self.graph.set_ef(max(self.ef, k))
+        labels, distances = self.graph.knn_query(queries, k=k)
+        # hnswlib's "ip" distance is 1 - <a, b>
+        return labels.astype(np.int64), 1.0 - distances
+
+
+class PgVectorIndex(CorpusIndex):
+    """
+    Corpus stored in Postgres (corpus_projects) and searched by its pgvector index.
+
+    Nothing is loaded up front: a project gets a row number in `names` the
+    first time a search returns it, so search() results index `names` like
+    any other CorpusIndex.
+    """
+
+    def __init__(self, count: int, meta: dict[str, dict] | None = None):
+        self.names: list[str] = []
+        self.count = count
+        self.meta = meta or {}
+        self._rows: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        As CorpusIndex.search, in one round trip. An approximate index may return
+        fewer than k rows; the gaps are padded with index -1 and similarity -inf.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = min(k, len(self))
+        found = db.nearest_projects_batch(list(queries), k)
+
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+        sims = np.full((len(queries), k), -np.inf, dtype=np.float64)
+        with self._lock:
+            for qi, hits in enumerate(found):
+                for j, hit in enumerate(hits[:k]):
+                    if hit["name"] not in self._rows:
+                        self._rows[hit["name"]] = len(self.names)
+                        self.names.append(hit["name"])
+                    self.meta.setdefault(hit["name"], {"url": hit["url"]})
+                    indices[qi, j] = self._rows[hit["name"]]
+                    sims[qi, j] = hit["similarity"]
+        return indices, sims
+
+
+# ═══════════════════════════════════════
+# Build / load
+# ═══════════════════════════════════════
+
+def build_index(
+    embeddings: Mapping[str, Sequence[float]],
+    backend: str = "ivf",
+    directory: Path = ANN_INDEX_DIR,
+    nlist: int = ANN_NLIST,
+) -> Path:
+    """Build an index over `embeddings` and persist it to `directory` (replaced atomically)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown ANN backend {backend!r} (expected one of {', '.join(BACKENDS)})")
+    if backend == "hnsw" and not HAS_HNSWLIB:
+        raise RuntimeError("hnsw backend requires hnswlib (pip install hnswlib)")
+
+    names = list(embeddings.keys())
+    if isinstance(embeddings, EmbeddingStore):
+        matrix = l2_normalize(np.asarray(embeddings.matrix, dtype=np.float32))
+    else:
+        matrix = l2_normalize(np.asarray([embeddings[n] for n in names], dtype=np.float32))
+    manifest = {
+        "backend": backend,
+        "count": len(names),
+        "dim": int(matrix.shape[1]),
+        "built_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=f".{directory.name}.", dir=directory.parent))
+    try:
+        if backend == "ivf":
+            nlist = nlist or max(1, int(4 * np.sqrt(len(names))))
+            centroids, assignment = _train_ivf(matrix, nlist)
+            order = np.argsort(assignment, kind="stable")
+            names = [names[i] for i in order]
+            matrix = matrix[order]
+            offsets = np.searchsorted(assignment[order], np.arange(nlist + 1)).astype(np.int64)
+            np.save(tmp / "centroids.npy", centroids)
+            np.save(tmp / "offsets.npy", offsets)
+            manifest["nlist"] = nlist
+        else:
+            graph = hnswlib.Index(space="ip", dim=matrix.shape[1])
+            graph.init_index(max_elements=len(names), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+            graph.add_items(matrix, np.arange(len(names)))
+            graph.save_index(str(tmp / "hnsw.bin"))
+            manifest.update(M=HNSW_M, ef_construction=HNSW_EF_CONSTRUCTION)
+
+        np.save(tmp / "vectors.npy", matrix)
+        with open(tmp / "names.json", "w") as f:
+            json.dump(names, f)
+        with open(tmp / "manifest.json", "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        if directory.exists():
+            shutil.rmtree(directory)
+        tmp.rename(directory)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    log.info(f"Built {backend} index over {manifest['count']} vectors → {directory}")
+    return directory
+
+
+def load_index(
+    directory: Path = ANN_INDEX_DIR,
+    meta: dict[str, dict] | None = None,
+    min_corpus: int = ANN_MIN_CORPUS,
+) -> CorpusIndex | None:
+    """Open a persisted index memory-mapped; None if no index has been built."""
+    directory = Path(directory)
+    try:
+        with open(directory / "manifest.json") as f:
+            manifest = json.load(f)
+        with open(directory / "names.json") as f:
+            names = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    matrix = np.load(directory / "vectors.npy", mmap_mode="r")
+    backend = manifest["backend"]
+
+    if len(names) < min_corpus:
+        return CorpusIndex.from_matrix(names, matrix, meta)
+    if backend == "ivf":
+        return IVFIndex(
+            names, matrix,
+            np.load(directory / "centroids.npy", mmap_mode="r"),
+            np.load(directory / "offsets.npy"),
+            meta,
+        )
+    if backend == "hnsw" and HAS_HNSWLIB:
+        graph = hnswlib.Index(space="ip", dim=manifest["dim"])
+        graph.load_index(str(directory / "hnsw.bin"), max_elements=len(names))
+        return HNSWIndex(names, matrix, graph, meta)
+
+    log.warning(f"ANN backend {backend!r} unavailable; using exact search over {directory}")
+    return CorpusIndex.from_matrix(names, matrix, meta)
+
+
+def sync_pgvector(
+    embeddings: Mapping[str, Sequence[float]], projects: list[dict], index_type: str = PGVECTOR_INDEX,
+) -> int:
+    """Load the corpus into Postgres (corpus_projects) and (re)build its vector index on the loaded rows."""
+    db.ensure_vector_schema(index_type)
+    by_name = {p["name"]: p for p in projects}
+    count = db.upsert_corpus_projects([
+        {
+            "name": name,
+            "description": by_name.get(name, {}).get("description", ""),
+            "url": by_name.get(name, {}).get("url", ""),
+            "tags": by_name.get(name, {}).get("tags", []),
+            "embedding": embeddings[name],
+        }
+        for name in embeddings
+    ])
+    db.build_vector_index("corpus_projects", index_type, rebuild=True)
+    log.info(f"Synced {count} corpus projects to pgvector")
+    return count
+
+
+def load_pgvector_index(meta: dict[str, dict] | None = None) -> PgVectorIndex | None:
+    """Index over the Postgres corpus; None if the table is missing, empty or unreachable."""
+    try:
+        count = db.corpus_project_count()
+    except psycopg2.Error as e:
+        log.warning(f"pgvector corpus unavailable: {str(e).strip()}")
+        return None
+    if not count:
+        log.warning("corpus_projects is empty (run `python ann.py build --backend pgvector`)")
+        return None
+    return PgVectorIndex(count, meta)
+
+
+def _train_ivf(matrix: np.ndarray, nlist: int) -> tuple[np.ndarray, np.ndarray]:
+    """Spherical k-means centroids (trained on a sample) and each row's list."""
+    from sklearn.cluster import MiniBatchKMeans
+
+    rng = np.random.default_rng(0)
+    sample = matrix[rng.choice(len(matrix), min(len(matrix), 256 * nlist), replace=False)]
+    kmeans = MiniBatchKMeans(n_clusters=nlist, random_state=0, n_init=1, batch_size=4096)
+    kmeans.fit(sample)
+    centroids = l2_normalize(kmeans.cluster_centers_.astype(np.float32))
+
+    assignment = np.empty(len(matrix), dtype=np.int64)
+    for lo in range(0, len(matrix), 65_536):
+        assignment[lo:lo + 65_536] = np.argmax(matrix[lo:lo + 65_536] @ centroids.T, axis=1)
+    return centroids, assignment
+
+
+# ═══════════════════════════════════════
+# Recall benchmark
+# ═══════════════════════════════════════
+
+def benchmark(
+    embeddings: dict[str, list[float]],
+    backend: str = "ivf",
+    n_queries: int = 200,
+    k: int = 10,
+    noise: float = 0.05,
+) -> dict:
+    """Recall@k and latency of `backend` against exact search on perturbed corpus rows."""
+    names = list(embeddings.keys())
+    rng = np.random.default_rng(1)
+    base = np.asarray([embeddings[names[i]] for i in rng.choice(len(names), n_queries)], dtype=np.float32)
+    queries = l2_normalize(base) + rng.normal(0, noise, base.shape).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        build_index(embeddings, backend, Path(tmp) / "index")
+        build_s = time.perf_counter() - t0
+
+        ann_index = load_index(Path(tmp) / "index", min_corpus=0)
+        exact_index = CorpusIndex.from_matrix(ann_index.names, ann_index.matrix)
+
+        t0 = time.perf_counter()
+        exact_idx, _ = exact_index.search(queries, k)
+        exact_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        ann_idx, _ = ann_index.search(queries, k)
+        ann_s = time.perf_counter() - t0
+
+        exact_sat = exact_index.saturation_batch(queries.tolist())
+        ann_sat = ann_index.saturation_batch(queries.tolist())
+
+    recall = np.mean([len(set(a) & set(e)) / k for a, e in zip(ann_idx, exact_idx)])
+    return {
+        "backend": backend,
+        "corpus": len(names),
+        "queries": n_queries,
+        "k": k,
+        f"recall@{k}": round(float(recall), 4),
+        "saturation_level_agreement": round(
+            float(np.mean([a["level"] == e["level"] for a, e in zip(ann_sat, exact_sat)])), 4,
+        ),
+        "build_s": round(build_s, 3),
+        "exact_ms_per_query": round(1000 * exact_s / n_queries, 3),
+        "ann_ms_per_query": round(1000 * ann_s / n_queries, 3),
+    }
+
+
+def _synthetic_corpus(n: int, dim: int = 384, topics: int = 200) -> dict[str, list[float]]:
+    """Clustered random vectors standing in for a large project corpus."""
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, topics, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    return {f"project-{i}": row for i, row in enumerate(vectors)}
+
+
+# ═══════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s",
+                        datefmt="%H:%M:%S", stream=sys.stdout)
+
+    parser = argparse.ArgumentParser(description="Build or benchmark the competitor corpus ANN index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Build an index from projects_embeddings.json")
+    build.add_argument("--backend", choices=(*BACKENDS, "pgvector"),
+                       default=ANN_BACKEND if ANN_BACKEND in (*BACKENDS, "pgvector") else "ivf")
+    build.add_argument("--out", type=Path, default=ANN_INDEX_DIR)
+    build.add_argument("--nlist", type=int, default=ANN_NLIST)
+    bench = sub.add_parser("bench", help="Measure recall@k against exact search")
+    bench.add_argument("--backend", choices=BACKENDS, default="ivf")
+    bench.add_argument("--synthetic", type=int, metavar="N",
+                       help="Benchmark on N synthetic vectors instead of the fixture corpus")
+    bench.add_argument("--queries", type=int, default=200)
+    bench.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build" and args.backend == "pgvector":
+        sync_pgvector(load_embedding_fixture("projects_embeddings"), load_fixture("projects.json"))
+    elif args.command == "build":
+        build_index(load_embedding_fixture("projects_embeddings"), args.backend, args.out, args.nlist)
+    else:
+        corpus = _synthetic_corpus(args.synthetic) if args.synthetic else load_embedding_fixture("projects_embeddings")
+        print(json.dumps(benchmark(corpus, args.backend, args.queries, args.k), indent=2))
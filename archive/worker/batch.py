@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Batch mode: many report runs (periods × entity shards) across a process pool.
+
+Jobs are the cross product of the periods (--start/--end split into --days
+windows, or explicit --period START:END) and the shards (--shard NAME=PATH, a
+signals file or per-source directory; without any, one unsharded run per period
+on SIGNALS_PATH). Each job is an ordinary run_pipeline call producing its own
+report.
+
+Entity embeddings and the competitor corpus are loaded once, in the parent,
+before the workers are forked, so every worker reads the same pages
+copy-on-write instead of loading and normalizing its own copy (an ANN index is
+memory-mapped and shared through the page cache either way), and the clustering
+libraries are imported there too. Where fork is not available, each worker
+loads them once at start-up.
+
+With --incremental, a shard's periods run in order within one worker, so each
+report can carry narratives over from the previous one; different shards
+still run in parallel.
+
+Per-job profiles are aggregated into BATCH_STATS_DIR/batch-<timestamp>.json
+(not next to the reports: the stats carry raw error messages and the reports
+directory is served publicly). With PROFILE_PROMETHEUS_PATH set, each job
+writes its own file, named after its report ID.
+
+Usage:
+    python3 batch.py --start 2025-01-01 --end 2026-01-01 [--workers 4] [--incremental]
+    python3 batch.py --period 2025-06-01:2025-06-15 --shard defi=signals/defi --shard depin=signals/depin
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Ensure worker/ is on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from config import INCREMENTAL_NARRATIVES, STREAM_INGEST, BATCH_STATS_DIR
+import clustering
+import db
+import run_fortnight
+from profiling import profiler
+
+log = logging.getLogger("pipeline")
+
+# Embeddings and corpus loaded before the pool starts (inherited by forked workers)
+_shared: dict = {}
+
+
+# ═══════════════════════════════════════
+# Job planning
+# ═══════════════════════════════════════
+
+def fortnights(start: datetime, end: datetime, days: int = 14) -> list[tuple[datetime, datetime]]:
+    """Consecutive `days`-long windows from `start`; the last one ends on or before `end`."""
+    periods = []
+    while start + timedelta(days=days) <= end:
+        periods.append((start, start + timedelta(days=days)))
+        start += timedelta(days=days)
+    return periods
+
+
+def plan_jobs(
+    periods: list[tuple[datetime, datetime]],
+    shards: dict[str, Path | None],
+    incremental: bool = False,
+) -> list[list[dict]]:
+    """
+    Jobs grouped into chains that each run in one worker, in order: one chain
+    per shard with `incremental` (reports build on the previous period), else
+    one chain per job.
+    """
+    chains = []
+    for shard, signals in shards.items():
+        jobs = [
+            {
+                "name": f"{shard or 'all'}:{start.date()}",
+                "shard": shard, "signals": str(signals) if signals else None,
+                "period_start": start, "period_end": end,
+            }
+            for start, end in sorted(periods)
+        ]
+        chains.extend([jobs] if incremental else [[job] for job in jobs])
+    return chains
+
+
+# ═══════════════════════════════════════
+# Workers
+# ═══════════════════════════════════════
+
+def load_shared() -> None:
+    """Load what every job reads but never modifies."""
+    if not _shared:
+        _shared["embeddings"] = run_fortnight.load_embeddings()
+        _shared["corpus"] = run_fortnight.load_corpus()
+
+
+def per_job_prometheus_path(path: str) -> str:
+    """PROFILE_PROMETHEUS_PATH with a {report_id} placeholder, so concurrent jobs do not overwrite one file."""
+    if not path or "{report_id}" in path:
+        return path
+    p = Path(path)
+    return str(p.with_name(f"{p.stem}.{{report_id}}{p.suffix}"))
+
+
+def _init_worker() -> None:
+    # A forked child must not reuse the parent's database connections
+    db.forget_pool()
+    load_shared()  # no-op when inherited through fork
+    run_fortnight.PROFILE_PROMETHEUS_PATH = per_job_prometheus_path(run_fortnight.PROFILE_PROMETHEUS_PATH)
+
+
+def run_chain(chain: list[dict], incremental: bool, stream: bool) -> list[dict]:
+    """Run a chain of jobs in order; after a failure the rest of the chain is skipped."""
+    results = []
+    failed = False
+    for job in chain:
+        result = {k: v.isoformat() if isinstance(v, datetime) else v for k, v in job.items()}
+        if failed:
+            results.append({**result, "status": "skipped"})
+            continue
+        # A job failing before run_pipeline resets the profiler must not report the previous job's stats
+        profiler.reset()
+        try:
+            run_fortnight.run_pipeline(
+                job["period_start"], job["period_end"],
+                incremental=incremental, stream=stream,
+                signals=Path(job["signals"]) if job["signals"] else None,
+                shard=job["shard"], preloaded=_shared,
+            )
+            result["status"] = "complete"
+        except Exception as e:
+            result.update(status="failed", error=f"{type(e).__name__}: {e}")
+            failed = True
+        profile = profiler.to_dict()
+        result.update(
+            report_id=profile["report_id"], pid=os.getpid(),
+            wall_s=profile["wall_s"], cpu_s=profile["cpu_s"],
+            peak_rss_bytes=profile["peak_rss_bytes"], counters=profile["counters"],
+            critical_path=[c["step"] for c in profile["critical_path"]],
+        )
+        results.append(result)
+    return results
+
+
+# ═══════════════════════════════════════
+# Stats
+# ═══════════════════════════════════════
+
+def aggregate(results: list[dict], wall_s: float, workers: int) -> dict:
+    """Batch totals over per-job results."""
+    ran = [r for r in results if "wall_s" in r]
+    counters: Counter = Counter()
+    for r in ran:
+        counters.update(r["counters"])
+    job_wall = sum(r["wall_s"] for r in ran)
+    statuses = Counter(r["status"] for r in results)
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "workers": workers,
+        "jobs": len(results),
+        **{status: statuses.get(status, 0) for status in ("complete", "failed", "skipped")},
+        "wall_s": round(wall_s, 3),
+        "job_wall_s": round(job_wall, 3),
+        # Sum of job wall times over batch wall time: how much the pool overlapped
+        "parallelism": round(job_wall / wall_s, 2) if wall_s else 0.0,
+        "cpu_s": round(sum(r["cpu_s"] for r in ran), 3),
+        "max_peak_rss_bytes": max((r["peak_rss_bytes"] or 0 for r in ran), default=0),
+        "counters": dict(counters),
+        "results": sorted(results, key=lambda r: (r["shard"] or "", r["period_start"])),
+    }
+
+
+def run_batch(
+    chains: list[list[dict]],
+    workers: int,
+    incremental: bool = INCREMENTAL_NARRATIVES,
+    stream: bool = STREAM_INGEST,
+) -> dict:
+    """Run every chain (in-process with one worker) and return the aggregated stats."""
+    t0 = time.perf_counter()
+    results: list[dict] = []
+    if workers <= 1:
+        load_shared()
+        prometheus_path = run_fortnight.PROFILE_PROMETHEUS_PATH
+        run_fortnight.PROFILE_PROMETHEUS_PATH = per_job_prometheus_path(prometheus_path)
+        try:
+            for chain in chains:
+                results.extend(run_chain(chain, incremental, stream))
+        finally:
+            run_fortnight.PROFILE_PROMETHEUS_PATH = prometheus_path
+        return aggregate(results, time.perf_counter() - t0, 1)
+
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else None)
+    if ctx.get_start_method() == "fork":
+        load_shared()
+        clustering.import_backends()  # otherwise every worker pays the import on its first cluster step
+        log.info(f"Loaded shared embeddings and corpus ({len(_shared['corpus'])} projects) before forking")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker) as pool:
+        futures = {pool.submit(run_chain, chain, incremental, stream): chain for chain in chains}
+        for future in as_completed(futures):
+            chain_results = future.result()
+            results.extend(chain_results)
+            for r in chain_results:
+                log.info(f"Batch: {r['name']} {r['status']}"
+                         + (f" in {r['wall_s']:.1f}s" if "wall_s" in r else "")
+                         + (f" ({r['error']})" if r.get("error") else ""))
+    return aggregate(results, time.perf_counter() - t0, workers)
+
+
+def _date(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+def _period(value: str) -> tuple[datetime, datetime]:
+    start, sep, end = value.partition(":")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected START:END, got {value!r}")
+    return _date(start), _date(end)
+
+
+def _shard(value: str) -> tuple[str, Path]:
+    name, sep, path = value.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected NAME=PATH, got {value!r}")
+    return name, Path(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run many report periods/shards across a process pool")
+    parser.add_argument("--start", type=_date, help="First period start (YYYY-MM-DD)")
+    parser.add_argument("--end", type=_date, help="Last period end (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=14, help="Period length for --start/--end")
+    parser.add_argument("--period", type=_period, action="append", default=[], metavar="START:END",
+                        help="Explicit period (repeatable)")
+    parser.add_argument("--shard", type=_shard, action="append", default=[], metavar="NAME=PATH",
+                        help="Entity shard: a signals file or per-source directory (repeatable)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--incremental", action=argparse.BooleanOptionalAction, default=INCREMENTAL_NARRATIVES,
+                        help="Carry narratives forward period to period within each shard")
+    parser.add_argument("--stream", action=argparse.BooleanOptionalAction, default=STREAM_INGEST)
+    parser.add_argument("--out", type=Path, help="Stats file (default: BATCH_STATS_DIR/batch-<time>.json)")
+    args = parser.parse_args()
+
+    if bool(args.start) != bool(args.end):
+        parser.error("--start and --end go together")
+    periods = list(args.period)
+    if args.start:
+        periods += fortnights(args.start, args.end, args.days)
+    if not periods:
+        parser.error("no periods: give --start/--end or --period")
+    shards = dict(args.shard) or {None: None}
+    if len(shards) != len(args.shard or [None]):
+        parser.error("duplicate shard name")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(processName)s %(message)s",
+                        datefmt="%H:%M:%S", stream=sys.stdout, force=True)
+
+    chains = plan_jobs(periods, shards, args.incremental)
+    workers = max(1, min(args.workers, len(chains)))
+    log.info(f"Batch: {sum(map(len, chains))} jobs ({len(periods)} periods × {len(shards)} shards) "
+             f"in {len(chains)} chains on {workers} workers")
+
+    stats = run_batch(chains, workers, args.incremental, args.stream)
+    out = args.out or BATCH_STATS_DIR / f"batch-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(stats, indent=2))
+
+    log.info(
+        f"Batch done: {stats['complete']} complete, {stats['failed']} failed, {stats['skipped']} skipped "
+        f"in {stats['wall_s']:.1f}s (parallelism {stats['parallelism']}x); stats: {out}"
+    )
+    sys.exit(1 if stats["failed"] else 0)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Exact vs scalable candidate clustering across candidate-set sizes.
+
+For each size, clusters the same synthetic candidates with
+cluster_candidates(mode="exact") and with each scalable variant, and reports
+wall time, peak traced memory (tracemalloc sees NumPy/SciPy buffers) and the
+adjusted Rand index against the exact labels.
+
+Usage:
+    python3 benchmarks/bench_clustering.py [--sizes 200 1000 5000] [--backend dbscan]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from sklearn.metrics import adjusted_rand_score
+
+# Ensure worker/ is on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import clustering
+from clustering import cluster_candidates
+from synthetic import topic_vectors
+
+
+def _labels(clusters: list[dict], n: int) -> np.ndarray:
+    out = np.empty(n, dtype=np.int64)
+    for cl in clusters:
+        out[cl["member_indices"]] = cl["cluster_id"]
+    return out
+
+
+def _measure(fn) -> tuple[list[dict], float, float]:
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    wall = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, wall, peak / 2**20
+
+
+def run(sizes: list[int], reduce_dim: int, backend: str) -> list[dict]:
+    rows = []
+    for n in sizes:
+        X = topic_vectors(n)
+        names = [f"c{i}" for i in range(n)]
+        exact, exact_s, exact_mb = _measure(lambda: cluster_candidates(X, names, mode="exact", backend=backend))
+        exact_labels = _labels(exact, n)
+        rows.append({"n": n, "variant": "exact", "wall_s": round(exact_s, 3),
+                     "peak_mb": round(exact_mb, 1), "clusters": len(exact), "ari": 1.0})
+
+        for reduce in ("none", "pca", "random"):
+            scalable, wall, mb = _measure(lambda: cluster_candidates(
+                X, names, mode="scalable", backend=backend, reduce=reduce, reduce_dim=reduce_dim,
+            ))
+            rows.append({
+                "n": n,
+                "variant": f"scalable/{reduce}",
+                "wall_s": round(wall, 3),
+                "peak_mb": round(mb, 1),
+                "clusters": len(scalable),
+                "ari": round(float(adjusted_rand_score(exact_labels, _labels(scalable, n))), 4),
+            })
+        for row in rows[-4:]:
+            print(json.dumps(row), flush=True)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 1000, 2000, 5000])
+    parser.add_argument("--reduce-dim", type=int, default=64)
+    parser.add_argument("--backend", choices=("hdbscan", "dbscan"),
+                        default="hdbscan" if clustering.HAS_HDBSCAN else "dbscan",
+                        help="dbscan runs the no-hdbscan fallback paths")
+    parser.add_argument("--out", type=Path, help="Also write results as JSON")
+    args = parser.parse_args()
+
+    if args.backend == "hdbscan" and not clustering.HAS_HDBSCAN:
+        parser.error("hdbscan is not installed")
+
+    results = run(args.sizes, args.reduce_dim, args.backend)
+    if args.out:
+        args.out.write_text(json.dumps({"backend": args.backend, "results": results}, indent=2))
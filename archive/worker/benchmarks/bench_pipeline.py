@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Per-stage timings of the fortnight pipeline on synthetic data.
+
+For each entity count, generates signals (benchmarks/synthetic.py) and times
+score_signals, cluster_candidates, compute_saturation, persist_report and
+export_report_json. Results are written as JSON; --compare reports the change
+against an earlier results file and exits 1 on a regression.
+
+persist_report runs against an in-process stub of the connection pool: SQL is
+built and every parameter adapted by psycopg2, but nothing is sent. With
+--db postgres it writes to DATABASE_URL instead (use a scratch database).
+
+Usage:
+    python3 benchmarks/bench_pipeline.py [--entities 1000 10000] [--out bench.json]
+    python3 benchmarks/bench_pipeline.py --compare baseline.json [--threshold 1.25]
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import psycopg2.extensions
+
+# Ensure worker/ is on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import db
+import run_fortnight
+from clustering import CorpusIndex, cluster_candidates, compute_saturation
+from config import MAX_NARRATIVES, TOP_K
+from synthetic import synthetic_corpus, synthetic_embeddings, synthetic_narratives, synthetic_signals
+
+STAGES = ("score_signals", "cluster_candidates", "compute_saturation", "persist_report", "export_report_json")
+
+
+# ═══════════════════════════════════════
+# Stub database
+# ═══════════════════════════════════════
+
+class _StubCursor:
+    """Adapts parameters like psycopg2 and counts statements instead of sending them."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+        self.connection = self
+        self.encoding = "UTF8"
+        self._pending: list = []
+        self._last: list = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mogrify(self, template, args) -> bytes:
+        if isinstance(template, bytes):
+            template = template.decode()
+        self._pending.append(args)
+        quoted = []
+        for arg in args:
+            adapted = psycopg2.extensions.adapt(arg)
+            if hasattr(adapted, "encoding"):
+                adapted.encoding = "utf8"
+            quoted.append(adapted.getquoted())
+        return template.encode() % tuple(quoted)
+
+    def execute(self, query, params=None) -> None:
+        self.stats["statements"] += 1
+        self.stats["bytes"] += len(query)
+        self._last, self._pending = self._pending, []
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self) -> list:
+        # Only upsert_entities fetches: RETURNING key, id from (id, kind, key, ...) rows
+        return [(args[2], args[0]) for args in self._last]
+
+
+class _StubConnection:
+    closed = 0
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def cursor(self):
+        return _StubCursor(self.stats)
+
+    def commit(self) -> None:
+        self.stats["commits"] += 1
+
+    def rollback(self) -> None:
+        pass
+
+
+class _StubPool:
+    def __init__(self):
+        self.stats = {"statements": 0, "bytes": 0, "commits": 0}
+
+    def getconn(self):
+        return _StubConnection(self.stats)
+
+    def putconn(self, conn, close: bool = False) -> None:
+        pass
+
+
+# ═══════════════════════════════════════
+# Benchmark
+# ═══════════════════════════════════════
+
+def _time(fn, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {
+        "min_s": round(min(times), 6),
+        "median_s": round(statistics.median(times), 6),
+        "mean_s": round(statistics.fmean(times), 6),
+        "repeat": repeat,
+    }
+
+
+def run(entities: int, args: argparse.Namespace) -> list[dict]:
+    """Time every stage at one entity count. Returns one row per stage."""
+    candidates_n = args.candidates or max(TOP_K, entities // 20)
+    sizes = {
+        "entities": entities, "snippets": args.snippets, "candidates": candidates_n,
+        "corpus": args.corpus, "narratives": MAX_NARRATIVES, "dim": args.dim,
+    }
+
+    signals = synthetic_signals(entities, snippets=args.snippets)
+    scored = run_fortnight.score_signals(signals)
+    candidates = scored[:candidates_n]
+    keys = [c["signal"]["key"] for c in candidates]
+    embeddings = synthetic_embeddings(keys, args.dim)
+    vectors = [embeddings[k] for k in keys]
+    labels = [c["signal"]["label"] for c in candidates]
+    corpus_embeddings, corpus_meta = synthetic_corpus(args.corpus, args.dim)
+    corpus = CorpusIndex(corpus_embeddings, corpus_meta)
+    groups = synthetic_narratives(candidates, embeddings, narratives=MAX_NARRATIVES)
+    ideas = [vectors[i % len(vectors)] for i in range(sum(len(g["ideas"]) for g in groups))]
+    period = run_fortnight.default_period()
+
+    pool = _StubPool() if args.db == "stub" else None
+    if pool:
+        db._pool = pool
+    report_id = "bench" if pool else db.create_report(*period, config_json={"benchmark": True})
+
+    stages = {
+        "score_signals": lambda: run_fortnight.score_signals(signals),
+        "cluster_candidates": lambda: cluster_candidates(vectors, labels, min_cluster_size=2),
+        "compute_saturation": lambda: [compute_saturation(e, corpus, corpus_meta) for e in ideas],
+        "persist_report": lambda: run_fortnight.persist_report(report_id, groups, candidates, embeddings),
+        "export_report_json": lambda: run_fortnight.export_report_json(report_id, *period, groups),
+    }
+    rows = []
+    for name in STAGES:
+        row = {"stage": name, **sizes, **_time(stages[name], args.repeat)}
+        if name == "persist_report" and pool:
+            # Per run: the stub accumulates across repeats
+            row.update({k: v // args.repeat for k, v in pool.stats.items()})
+        rows.append(row)
+        print(json.dumps(row), flush=True)
+    return rows
+
+
+def compare(results: list[dict], baseline_path: Path, threshold: float) -> bool:
+    """Print median ratios against a baseline results file. Returns True if any stage regressed."""
+    def key(row: dict) -> tuple:
+        return tuple(row[k] for k in ("stage", "entities", "snippets", "candidates", "corpus", "dim"))
+
+    baseline = {key(row): row for row in json.loads(baseline_path.read_text())["results"]}
+    regressed = False
+    print(f"\n{'stage':<22}{'entities':>10}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for row in results:
+        before = baseline.get(key(row))
+        if before is None:
+            continue
+        ratio = row["median_s"] / max(before["median_s"], 1e-9)
+        flag = ""
+        if ratio > threshold:
+            regressed, flag = True, "  REGRESSION"
+        print(f"{row['stage']:<22}{row['entities']:>10}{before['median_s']:>12.4f}"
+              f"{row['median_s']:>12.4f}{ratio:>8.2f}{flag}")
+    return regressed
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parent, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--entities", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--snippets", type=int, default=5, help="Social snippets per entity")
+    parser.add_argument("--candidates", type=int, default=0,
+                        help="Candidates to cluster and persist (default: max(TOP_K, entities/20))")
+    parser.add_argument("--corpus", type=int, default=5000, help="Competitor corpus size")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", choices=("stub", "postgres"), default="stub")
+    parser.add_argument("--out", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE", help="Earlier --out file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="With --compare, a median this many times slower is a regression")
+    args = parser.parse_args()
+
+    logging.getLogger("pipeline").setLevel(logging.WARNING)
+    run_fortnight.REPORTS_OUTPUT_DIR = Path(tempfile.mkdtemp(prefix="bench-reports-"))
+
+    results = [row for n in args.entities for row in run(n, args)]
+    if args.out:
+        args.out.write_text(json.dumps({
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "db": args.db,
+            "results": results,
+        }, indent=2))
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Cold-start import budget for the worker.
+
+Imports a module (run_fortnight by default) in a fresh interpreter under
+`python -X importtime` and fails if its cumulative import time exceeds the
+budget, or if any dependency that should only load with its stage (sklearn,
+hdbscan, anthropic, requests, pyarrow, python-dotenv, ...) was imported.
+The best of --repeat runs is used, since the first run may compile .pyc files.
+
+Usage:
+    python3 benchmarks/import_budget.py [--budget-ms 400] [--module run_fortnight]
+
+tests/test_import_budget.py runs the same checks under pytest; the time
+budget only with IMPORT_BUDGET_MS set (e.g. IMPORT_BUDGET_MS=400).
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+WORKER_DIR = Path(__file__).resolve().parent.parent
+
+# Top-level packages that must not be imported just by loading the module
+LAZY_PACKAGES = (
+    "sklearn", "scipy", "hdbscan", "anthropic",
+    "requests", "urllib3", "pyarrow", "dotenv",
+)
+
+
+def measure(module: str) -> tuple[float, dict[str, float], set[str]]:
+    """
+    Import `module` in a new interpreter. Returns (cumulative ms, {direct import: ms},
+    set of top-level packages imported on the way).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=WORKER_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    total_ms = None
+    direct: dict[str, float] = {}
+    packages: set[str] = set()
+    # Lines are "import time: self [us] | cumulative | name", indented two spaces
+    # per level, with children listed before their parent: collect entries until
+    # the next top-level import and keep them only if that import is `module`
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        name = name.strip()
+        if depth > 0:
+            packages.add(name.split(".")[0])
+            if depth == 1:
+                direct[name] = int(cumulative) / 1000
+        elif name == module:
+            total_ms = int(cumulative) / 1000
+            break
+        else:
+            direct, packages = {}, set()
+    if total_ms is None:
+        raise RuntimeError(f"{module} not found in -X importtime output")
+    return total_ms, direct, packages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--module", default="run_fortnight")
+    parser.add_argument("--budget-ms", type=float, default=400.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="Slowest direct imports to list")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(max(1, args.repeat))]
+    total_ms, direct, packages = min(runs, key=lambda r: r[0])
+
+    print(f"import {args.module}: {total_ms:.1f} ms (best of {len(runs)}, budget {args.budget_ms:.0f} ms)")
+    for name, ms in sorted(direct.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {name:<28}{ms:>9.1f} ms")
+
+    failed = False
+    eager = sorted(set(LAZY_PACKAGES) & set.union(*(r[2] for r in runs)))
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: {total_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,167 @@
+"""
+Synthetic inputs for the worker benchmarks, shaped like the fixtures.
+
+  - synthetic_signals: merged signals as ingest_signals returns them for
+    demo_signals.json (per-source metrics plus social snippets)
+  - synthetic_embeddings: {key: vector} like demo_embeddings.json
+  - synthetic_corpus: projects_embeddings.json + projects.json equivalents
+  - synthetic_narratives: narrative groups with investigation results, ideas
+    and action packs, as persist_report and export_report_json receive them
+
+Everything is seeded, so a given size always produces the same data.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+# Ensure worker/ is on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from clustering import centroid, centroid_radius
+from config import IDEAS_PER_NARRATIVE
+from scoring import FEATURE_COLUMNS
+from tools import ToolResult
+
+KINDS = ("protocol", "repo", "program", "token")
+SNIPPET_CLASSES = ("announcement", "pain_point", "question", "hype")
+TOOLS = ("repo_inspector", "idl_differ", "dependency_tracker", "social_pain_finder")
+
+
+def topic_vectors(n: int, dim: int = 384, topics: int | None = None, seed: int = 0) -> np.ndarray:
+    """Rows drawn around `topics` random directions (~10 per topic by default)."""
+    rng = np.random.default_rng(seed)
+    topics = topics or max(2, n // 10)
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    return centers[rng.integers(0, topics, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def synthetic_signals(n: int, snippets: int = 5, coverage: float = 0.8, seed: int = 0) -> list[dict]:
+    """
+    `n` merged signals. Each source is present with probability `coverage`;
+    baselines are log-normal and current values a log-normal multiple of them.
+    Signals with social data carry `snippets` snippets.
+    """
+    rng = np.random.default_rng(seed)
+    epoch = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    first_seen_days = rng.integers(0, 760, n).tolist()
+    kinds = rng.integers(0, len(KINDS), n).tolist()
+
+    per_source = {}
+    for source, feature_cols in FEATURE_COLUMNS.items():
+        baseline = rng.lognormal(5.0, 2.0, (n, len(feature_cols)))
+        current = baseline * rng.lognormal(0.0, 0.5, baseline.shape)
+        present = (rng.random(n) < coverage).tolist()
+        per_source[source] = (list(feature_cols.values()), current.round(4).tolist(),
+                              baseline.round(4).tolist(), present)
+    snippet_classes = rng.integers(0, len(SNIPPET_CLASSES), (n, snippets)).tolist()
+
+    signals = []
+    for i in range(n):
+        sig = {
+            "kind": KINDS[kinds[i]],
+            "key": f"entity-{i}",
+            "label": f"Entity {i}",
+            "first_seen": (epoch + timedelta(days=first_seen_days[i])).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        for source, (pairs, current, baseline, present) in per_source.items():
+            sig[source] = {}
+            if present[i]:
+                for j, (cur_name, base_name) in enumerate(pairs):
+                    sig[source][cur_name] = current[i][j]
+                    sig[source][base_name] = baseline[i][j]
+        if sig["social"]:
+            sig["social"]["snippets"] = [
+                {"text": f"Snippet {k} about {sig['label']}: fills, fees and onboarding.",
+                 "class": SNIPPET_CLASSES[c]}
+                for k, c in enumerate(snippet_classes[i])
+            ]
+        signals.append(sig)
+    return signals
+
+
+def synthetic_embeddings(keys: list[str], dim: int = 384, seed: int = 0) -> dict[str, np.ndarray]:
+    """{key: vector} with topic structure, so clustering finds groups."""
+    matrix = topic_vectors(len(keys), dim, seed=seed)
+    return dict(zip(keys, matrix))
+
+
+def synthetic_corpus(n: int, dim: int = 384, seed: int = 1) -> tuple[dict[str, np.ndarray], dict[str, dict]]:
+    """Competitor corpus: ({name: vector}, {name: {url, description}})."""
+    names = [f"Project {i}" for i in range(n)]
+    embeddings = dict(zip(names, topic_vectors(n, dim, seed=seed)))
+    meta = {
+        name: {"url": f"https://example.com/projects/{i}", "description": f"{name} on Solana."}
+        for i, name in enumerate(names)
+    }
+    return embeddings, meta
+
+
+def _action_pack(title: str, size: int) -> dict:
+    body = f"# {title}\n\n" + ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (size // 57 + 1))[:size]
+    return {"spec.md": body, "tech.md": body, "milestones.md": body, "deps.json": '{"next": "14.2.x"}'}
+
+
+def synthetic_narratives(
+    candidates: list[dict],
+    embeddings: dict[str, np.ndarray],
+    narratives: int = 10,
+    ideas: int = IDEAS_PER_NARRATIVE,
+    evidence: int = 2,
+    pack_bytes: int = 4096,
+) -> list[dict]:
+    """
+    Group scored candidates round-robin into `narratives` narratives. Every
+    member gets one result per investigation tool (with `evidence` evidence
+    items each), and every narrative `ideas` ideas with saturation and an
+    action pack of roughly 3 x `pack_bytes` text.
+    """
+    groups = []
+    for n in range(min(narratives, len(candidates))):
+        members = candidates[n::narratives]
+        for member in members:
+            label = member["signal"]["label"]
+            member["investigation_results"] = [
+                ToolResult(
+                    tool=tool,
+                    input_json={"entity": label},
+                    output_summary=f"{tool} findings for {label}.",
+                    evidence_links=[f"https://example.com/{tool}/{member['signal']['key']}"],
+                    evidence_items=[
+                        {"type": "dev", "title": f"{tool} #{e}: {label}",
+                         "url": f"https://example.com/{tool}/{e}", "snippet": "Observed change."}
+                        for e in range(evidence)
+                    ],
+                )
+                for tool in TOOLS
+            ]
+        title = f"Narrative {n}"
+        vectors = [embeddings[m["signal"]["key"]] for m in members]
+        center = centroid(vectors)
+        groups.append({
+            "cluster_id": n,
+            "title": title,
+            "summary": f"{title}: {len(members)} related entities gaining momentum.",
+            "members": members,
+            "member_labels": [m["signal"]["label"] for m in members],
+            "member_keys": [m["signal"]["key"] for m in members],
+            "centroid": center.tolist(),
+            "radius": centroid_radius(vectors, center),
+            "ideas": [
+                {
+                    "title": f"{title} idea {i}",
+                    "pitch": "A tool that makes this easier.",
+                    "target_user": "Solana developers",
+                    "mvp_scope": "CLI plus dashboard",
+                    "why_now": "Activity is accelerating.",
+                    "validation": "Repeated pain points in social snippets.",
+                    "saturation": {"level": "low", "score": 0.3, "neighbors": []},
+                    "pivot": "",
+                    "action_pack": _action_pack(f"{title} idea {i}", pack_bytes),
+                }
+                for i in range(ideas)
+            ],
+        })
+    return groups
@@ -0,0 +1,93 @@
+"""
+Stage checkpoints for the fortnight pipeline.
+
+After each step, run_pipeline pickles that step's output into
+<CHECKPOINT_DIR>/<report_id>/<step name>.pkl, next to a meta.json describing
+the run. A resumed run loads the outputs of completed steps its remaining
+steps consume, so retrying a late failure skips ingestion, scoring,
+investigations and LLM calls.
+"""
+
+import json
+import os
+import pickle
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from config import CHECKPOINT_DIR
+
+# Checkpointed steps in a dependency-respecting order (see run_pipeline's step graph)
+STEP_NAMES = (
+    "ingest", "score", "select", "investigate", "cluster",
+    "summarize", "ideas", "persist_entities", "persist", "export",
+)
+
+
+def parse_step(value: str) -> int:
+    """Accept a step number (1-10) or name (e.g. "ideas") and return its number."""
+    if value.isdigit() and 1 <= int(value) <= len(STEP_NAMES):
+        return int(value)
+    if value in STEP_NAMES:
+        return STEP_NAMES.index(value) + 1
+    raise ValueError(f"Unknown step {value!r}; expected 1-{len(STEP_NAMES)} or one of {', '.join(STEP_NAMES)}")
+
+
+class Checkpoints:
+    """Checkpoint directory of a single report run."""
+
+    def __init__(self, report_id: str, root: Path = CHECKPOINT_DIR):
+        self.report_id = report_id
+        self.dir = Path(root) / report_id
+
+    def _step_path(self, name: str) -> Path:
+        return self.dir / f"{name}.pkl"
+
+    def save_meta(self, period_start: datetime, period_end: datetime, config_json: dict) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self.dir / "meta.json", json.dumps({
+            "report_id": self.report_id,
+            "period_start": period_start.isoformat(),
+            "period_end": period_end.isoformat(),
+            "config": config_json,
+        }).encode())
+
+    def load_meta(self) -> dict:
+        path = self.dir / "meta.json"
+        if not path.exists():
+            raise FileNotFoundError(f"No checkpoints for report {self.report_id} in {self.dir}")
+        meta = json.loads(path.read_text())
+        meta["period_start"] = datetime.fromisoformat(meta["period_start"])
+        meta["period_end"] = datetime.fromisoformat(meta["period_end"])
+        return meta
+
+    def save(self, name: str, output: Any) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self._step_path(name), pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def load(self, name: str) -> Any:
+        path = self._step_path(name)
+        if not path.exists():
+            raise FileNotFoundError(f"No checkpoint for step {name} of report {self.report_id}")
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def completed(self) -> set[str]:
+        """Names of the steps with a saved checkpoint."""
+        return {name for name in STEP_NAMES if self._step_path(name).exists()}
+
+    def discard(self, names: set[str]) -> None:
+        """Drop the checkpoints of `names` so those steps run again."""
+        for name in names:
+            self._step_path(name).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
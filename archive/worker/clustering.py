@@ -1,26 +1,38 @@
 """Clustering candidates into narratives using HDBSCAN."""
 
+import importlib.util
 import numpy as np
+from collections.abc import Mapping, Sequence
 from typing import Any
 
-try:
-    import hdbscan
-    HAS_HDBSCAN = True
-except ImportError:
-    HAS_HDBSCAN = False
+# hdbscan and sklearn take over a second to import, so they are loaded only
+# when a clustering stage runs (a run resumed after "cluster" never needs them)
+HAS_HDBSCAN = importlib.util.find_spec("hdbscan") is not None
 
-from sklearn.cluster import DBSCAN
-from sklearn.metrics.pairwise import cosine_distances
+from config import (
+    CLUSTER_MODE, CLUSTER_SCALABLE_MIN, CLUSTER_REDUCE, CLUSTER_REDUCE_DIM, CLUSTER_EPS,
+    CLUSTER_BACKEND,
+)
+from embedding_store import EmbeddingStore
 
 
 def cluster_candidates(
     embeddings: list[list[float]],
     labels: list[str],
     min_cluster_size: int = 2,
+    mode: str = CLUSTER_MODE,
+    backend: str = CLUSTER_BACKEND,
+    reduce: str = CLUSTER_REDUCE,
+    reduce_dim: int = CLUSTER_REDUCE_DIM,
 ) -> list[dict]:
     """
     Cluster candidate embeddings into narrative groups.
 
+    `mode` is "exact", "scalable" (see cluster_scalable, which also takes
+    `reduce` and `reduce_dim`) or "auto", which picks scalable once there are
+    at least CLUSTER_SCALABLE_MIN candidates. `backend` is "hdbscan", "dbscan"
+    (cosine DBSCAN) or "auto" (hdbscan when installed).
+
     Returns a list of clusters, each with:
       - cluster_id: int
       - member_indices: list[int]
@@ -30,9 +42,16 @@ def cluster_candidates(
         # Single candidate = single cluster
         return [{"cluster_id": 0, "member_indices": [0], "member_labels": labels[:1]}]
 
+    use_hdbscan = _use_hdbscan(backend)
+    if mode == "scalable" or (mode == "auto" and len(embeddings) >= CLUSTER_SCALABLE_MIN):
+        return _group_clusters(
+            cluster_scalable(embeddings, min_cluster_size, reduce, reduce_dim, backend=backend), labels,
+        )
+
     X = np.array(embeddings)
 
-    if HAS_HDBSCAN:
+    if use_hdbscan:
+        import hdbscan
         clusterer = hdbscan.HDBSCAN(
             min_cluster_size=min_cluster_size,
             metric="euclidean",
@@ -41,10 +60,126 @@ def cluster_candidates(
         cluster_labels = clusterer.fit_predict(X)
     else:
         # Fallback to DBSCAN with cosine distance
+        from sklearn.cluster import DBSCAN
+        from sklearn.metrics.pairwise import cosine_distances
         dist_matrix = cosine_distances(X)
-        clusterer = DBSCAN(eps=0.5, min_samples=min_cluster_size, metric="precomputed")
+        clusterer = DBSCAN(eps=CLUSTER_EPS, min_samples=min_cluster_size, metric="precomputed")
         cluster_labels = clusterer.fit_predict(dist_matrix)
 
+    return _group_clusters(cluster_labels, labels)
+
+
+def cluster_scalable(
+    embeddings,
+    min_cluster_size: int = 2,
+    reduce: str = CLUSTER_REDUCE,
+    reduce_dim: int = CLUSTER_REDUCE_DIM,
+    eps: float = CLUSTER_EPS,
+    backend: str = CLUSTER_BACKEND,
+) -> np.ndarray:
+    """
+    Cluster labels (-1 = noise) for large candidate sets without an n×n distance matrix.
+
+    Rows are L2-normalized, so euclidean distance is a monotone function of
+    cosine distance (|a - b|² = 2·(1 - cos)), then optionally reduced with PCA
+    or a Gaussian random projection and re-normalized. HDBSCAN clusters them
+    with its tree-based core distances; with the dbscan `backend` (or without
+    hdbscan), DBSCAN runs on a sparse radius-neighbour graph holding only pairs
+    within cosine distance `eps`.
+    """
+    use_hdbscan = _use_hdbscan(backend)
+    X = l2_normalize(np.asarray(embeddings, dtype=np.float32))
+
+    if reduce != "none" and X.shape[1] > reduce_dim and len(X) > reduce_dim:
+        if reduce == "pca":
+            from sklearn.decomposition import PCA
+            reducer = PCA(n_components=reduce_dim, svd_solver="randomized", random_state=0)
+        elif reduce == "random":
+            from sklearn.random_projection import GaussianRandomProjection
+            reducer = GaussianRandomProjection(n_components=reduce_dim, random_state=0)
+        else:
+            raise ValueError(f"Unknown reduction {reduce!r} (expected none, pca or random)")
+        X = l2_normalize(reducer.fit_transform(X).astype(np.float32))
+
+    if use_hdbscan:
+        import hdbscan
+        clusterer = hdbscan.HDBSCAN(
+            min_cluster_size=min_cluster_size,
+            metric="euclidean",
+            cluster_selection_method="eom",
+        )
+        return clusterer.fit_predict(X)
+
+    from sklearn.cluster import DBSCAN
+    from sklearn.neighbors import radius_neighbors_graph
+    # Cosine distance eps ⇔ euclidean radius √(2·eps) on unit vectors
+    graph = radius_neighbors_graph(X, radius=float(np.sqrt(2.0 * eps)), mode="distance")
+    # DBSCAN reads sparse precomputed input as "pairs not stored are beyond eps"
+    graph.data = graph.data ** 2 / 2.0  # euclidean → cosine distance
+    return DBSCAN(eps=eps, min_samples=min_cluster_size, metric="precomputed").fit_predict(graph)
+
+
+def _use_hdbscan(backend: str) -> bool:
+    if backend == "auto":
+        return HAS_HDBSCAN
+    if backend not in ("hdbscan", "dbscan"):
+        raise ValueError(f"Unknown clustering backend {backend!r} (expected auto, hdbscan or dbscan)")
+    if backend == "hdbscan" and not HAS_HDBSCAN:
+        raise RuntimeError("The hdbscan backend requires hdbscan (pip install hdbscan)")
+    return backend == "hdbscan"
+
+
+def import_backends() -> None:
+    """Import the clustering libraries now (e.g. once in a parent process before forking workers)."""
+    if HAS_HDBSCAN:
+        import hdbscan  # noqa: F401
+    import sklearn.cluster  # noqa: F401
+    import sklearn.neighbors  # noqa: F401
+
+
+def _nonzero_rows(vectors) -> np.ndarray:
+    """Rows of `vectors` (a 2-D array) that are not all zero, i.e. not a missing embedding."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    return matrix[np.any(matrix != 0, axis=1)]
+
+
+def centroid(vectors) -> np.ndarray:
+    """
+    Unit-length mean direction of a set of embeddings. Zero vectors (missing
+    embeddings) are ignored; if every vector is zero the centroid is too.
+    """
+    unit = l2_normalize(_nonzero_rows(vectors))
+    if not len(unit):
+        return np.zeros(np.shape(vectors)[1], dtype=np.float32)
+    return l2_normalize(unit.mean(axis=0, keepdims=True))[0]
+
+
+def centroid_radius(vectors, center) -> float:
+    """
+    Lowest cosine similarity between any of `vectors` and `center`, ignoring
+    zero vectors; 1.0 when there is nothing to measure.
+    """
+    unit = l2_normalize(_nonzero_rows(vectors))
+    if not len(unit) or not np.any(center):
+        return 1.0
+    return float((unit @ np.asarray(center, dtype=np.float32)).min())
+
+
+def assign_to_centroids(embeddings, centroids, threshold) -> np.ndarray:
+    """
+    Index of each row's most similar centroid, or -1 when its cosine similarity is
+    below `threshold` (a scalar, or one value per centroid). Zero rows (missing
+    embeddings) are never assigned.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    sims = l2_normalize(embeddings) @ l2_normalize(np.asarray(centroids, dtype=np.float32)).T
+    threshold = np.broadcast_to(np.asarray(threshold, dtype=np.float32), (sims.shape[1],))
+    best = sims.argmax(axis=1)
+    accepted = (sims[np.arange(len(sims)), best] >= threshold[best]) & np.any(embeddings != 0, axis=1)
+    return np.where(accepted, best, -1)
+
+
+def _group_clusters(cluster_labels, labels: list[str]) -> list[dict]:
     # Group by cluster
     clusters: dict[int, list[int]] = {}
     noise_indices: list[int] = []
@@ -72,47 +207,110 @@ def cluster_candidates(
     return result
 
 
-def compute_saturation(
-    idea_embedding: list[float],
-    corpus_embeddings: dict[str, list[float]],
-    corpus_meta: dict[str, dict],
-    top_k: int = 3,
-) -> dict:
+class CorpusIndex:
     """
-    Compute saturation score by finding nearest neighbors in project corpus.
+    Project corpus prepared once for repeated nearest-neighbour queries.
 
-    Returns:
-      {
-        "level": "low" | "medium" | "high",
-        "score": float (0-1),
-        "neighbors": [{"name", "similarity", "url"}]
-      }
+    Rows are L2-normalized float32 vectors, so cosine similarity for a whole
+    batch of queries is a single matrix multiply.
     """
-    if not corpus_embeddings or not idea_embedding:
-        return {"level": "low", "score": 0.0, "neighbors": []}
-
-    idea_vec = np.array([idea_embedding])
-    names = list(corpus_embeddings.keys())
-    corpus_vecs = np.array([corpus_embeddings[n] for n in names])
-
-    # Cosine similarity
-    from sklearn.metrics.pairwise import cosine_similarity
-    sims = cosine_similarity(idea_vec, corpus_vecs)[0]
-
-    # Get top K
-    top_indices = np.argsort(sims)[::-1][:top_k]
-    neighbors = []
-    for idx in top_indices:
-        name = names[idx]
-        meta = corpus_meta.get(name, {})
-        neighbors.append({
+
+    def __init__(self, embeddings: Mapping[str, Sequence[float]], meta: dict[str, dict] | None = None):
+        self.names = list(embeddings.keys())
+        if isinstance(embeddings, EmbeddingStore):
+            matrix = np.asarray(embeddings.matrix, dtype=np.float32)  # one vectorized read
+        else:
+            matrix = np.asarray([embeddings[n] for n in self.names], dtype=np.float32)
+        self.matrix = l2_normalize(matrix) if matrix.size else matrix
+        self.meta = meta or {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_matrix(
+        cls, names: list[str], matrix: np.ndarray, meta: dict[str, dict] | None = None,
+    ) -> "CorpusIndex":
+        """Wrap an already L2-normalized float32 matrix (e.g. a memmap) without copying it."""
+        index = cls.__new__(cls)
+        index.names = list(names)
+        index.matrix = matrix
+        index.meta = meta or {}
+        return index
+
+    def search(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k corpus rows by cosine similarity for each query row.
+
+        Returns (indices, similarities), both shaped (n_queries, k) and sorted by
+        descending similarity.
+        """
+        queries = l2_normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        return top_k_rows(queries @ self.matrix.T, k)
+
+    def saturation_batch(
+        self,
+        idea_embeddings: list[list[float]],
+        top_k: int = 3,
+        meta: dict[str, dict] | None = None,
+    ) -> list[dict]:
+        """Saturation results (see compute_saturation) for many ideas in one query."""
+        results: list[dict] = [_EMPTY_SATURATION] * len(idea_embeddings)
+        live = [i for i, emb in enumerate(idea_embeddings) if emb is not None and len(emb)]
+        if not live or not len(self):
+            return [dict(r) for r in results]
+
+        found = self.neighbors([idea_embeddings[i] for i in live], top_k)
+        meta = meta or self.meta
+        for i, pairs in zip(live, found):
+            if pairs:
+                results[i] = _saturation_result([n for n, _ in pairs], [s for _, s in pairs], meta)
+        return [dict(r) for r in results]
+
+    def neighbors(self, queries: list[Sequence[float]], k: int) -> list[list[tuple[str, float]]]:
+        """(name, similarity) of the k nearest corpus entries per query, best first."""
+        indices, sims = self.search(np.asarray(queries), k)
+        return [
+            [(self.names[j], float(s)) for j, s in zip(row_idx, row_sims) if j >= 0]  # -1: no hit
+            for row_idx, row_sims in zip(indices, sims)
+        ]
+
+
+_EMPTY_SATURATION = {"level": "low", "score": 0.0, "neighbors": []}
+
+
+def l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length; zero rows stay zero (similarity 0)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_rows(sims: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Column indices and values of the k largest entries per row, best first."""
+    k = min(k, sims.shape[1])
+    if k < sims.shape[1]:
+        # O(n) selection of the top k, then sort only those k
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+    else:
+        top = np.tile(np.arange(sims.shape[1]), (sims.shape[0], 1))
+    top_sims = np.take_along_axis(sims, top, axis=1)
+    order = np.argsort(-top_sims, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_sims, order, axis=1)
+
+
+def _saturation_result(names: list[str], sims: list[float], corpus_meta: dict[str, dict]) -> dict:
+    neighbors = [
+        {
             "name": name,
-            "similarity": round(float(sims[idx]), 3),
-            "url": meta.get("url", ""),
-        })
+            "similarity": round(float(sim), 3),
+            "url": corpus_meta.get(name, {}).get("url", ""),
+        }
+        for name, sim in zip(names, sims)
+    ]
 
     # Score = average similarity of top K
-    avg_sim = float(np.mean([sims[i] for i in top_indices]))
+    avg_sim = float(np.mean(sims))
 
     if avg_sim >= 0.75:
         level = "high"
@@ -126,3 +324,29 @@ def compute_saturation(
         "score": round(avg_sim, 3),
         "neighbors": neighbors,
     }
+
+
+def compute_saturation(
+    idea_embedding: list[float],
+    corpus_embeddings: "dict[str, list[float]] | CorpusIndex",
+    corpus_meta: dict[str, dict],
+    top_k: int = 3,
+) -> dict:
+    """
+    Compute saturation score by finding nearest neighbors in project corpus.
+
+    Pass a prebuilt CorpusIndex to avoid re-normalizing the corpus per call.
+
+    Returns:
+      {
+        "level": "low" | "medium" | "high",
+        "score": float (0-1),
+        "neighbors": [{"name", "similarity", "url"}]
+      }
+    """
+    # len(), not truthiness: embeddings may be NumPy rows (e.g. from an EmbeddingStore)
+    if not len(corpus_embeddings) or not len(idea_embedding):
+        return dict(_EMPTY_SATURATION)
+
+    index = corpus_embeddings if isinstance(corpus_embeddings, CorpusIndex) else CorpusIndex(corpus_embeddings)
+    return index.saturation_batch([idea_embedding], top_k, corpus_meta)[0]
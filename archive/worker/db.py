@@ -2,16 +2,131 @@
 
 import json
 import hashlib
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterator
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 
-from config import get_db_params
+from config import (
+    get_db_params, DB_POOL_MIN, DB_POOL_MAX,
+    PGVECTOR_ENABLED, PGVECTOR_INDEX, PGVECTOR_IVFFLAT_LISTS, PGVECTOR_PROBES,
+    EMBEDDING_DIM, HNSW_M, HNSW_EF_CONSTRUCTION, HNSW_EF_SEARCH,
+)
+from profiling import profiler
 
 
-def _conn():
-    return psycopg2.connect(**get_db_params())
+# ───── Connection pool & unit of work ─────
+class _CountingCursor(psycopg2.extensions.cursor):
+    """Cursor that reports each statement sent to the server as a round trip."""
+
+    def execute(self, query, vars=None):
+        profiler.count("db_round_trips")
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        profiler.count("db_round_trips")
+        return super().executemany(query, vars_list)
+
+
+_pool: psycopg2.pool.ThreadedConnectionPool | None = None
+_pool_lock = threading.Lock()
+_local = threading.local()
+
+
+class Session:
+    """A unit of work: one pooled connection and one transaction."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def cursor(self):
+        return self.conn.cursor()
+
+
+def _get_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = psycopg2.pool.ThreadedConnectionPool(
+                    DB_POOL_MIN, DB_POOL_MAX, cursor_factory=_CountingCursor, **get_db_params(),
+                )
+    return _pool
+
+
+def close_pool() -> None:
+    """Close every pooled connection (e.g. at process exit)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+def forget_pool() -> None:
+    """
+    Drop (without closing) a pool inherited through fork(): its connections
+    belong to the parent process. The child opens its own on first use.
+    """
+    global _pool, _pool_lock, _local
+    _pool = None
+    _pool_lock = threading.Lock()
+    _local = threading.local()
+
+
+@contextmanager
+def session() -> Iterator[Session]:
+    """
+    Run a block of db calls over one connection in one transaction.
+
+    Every db.* function called inside the block (on this thread) joins the
+    session instead of committing on its own. The transaction commits when the
+    block exits and rolls back if it raises. Nested sessions join the outer one.
+    """
+    current = getattr(_local, "session", None)
+    if current is not None:
+        yield current
+        return
+
+    pool = _get_pool()
+    conn = pool.getconn()
+    _local.session = Session(conn)
+    try:
+        yield _local.session
+        conn.commit()
+        profiler.count("db_round_trips")
+    except BaseException:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        _local.session = None
+        pool.putconn(conn, close=bool(conn.closed))
+
+
+@contextmanager
+def _conn() -> Iterator[Any]:
+    """Yield the active session's connection, or a pooled one committed on exit."""
+    current = getattr(_local, "session", None)
+    if current is not None:
+        yield current.conn
+        return
+
+    pool = _get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+        conn.commit()
+        profiler.count("db_round_trips")
+    except BaseException:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn, close=bool(conn.closed))
 
 
 def _cuid() -> str:
@@ -22,21 +137,101 @@ def _cuid() -> str:
     return f"c{ts}{rand}"
 
 
-def create_report(period_start: datetime, period_end: datetime, config_json: dict) -> str:
-    """Create a new report record and return its ID."""
-    report_id = _cuid()
+def new_id() -> str:
+    """A fresh row ID, for callers that need it before the row is written."""
+    return _cuid()
+
+
+def create_report(
+    period_start: datetime, period_end: datetime, config_json: dict, shard: str | None = None,
+) -> str:
+    """
+    Create the report record for (period, shard) and return its ID.
+
+    Reports are unique per (period_start, period_end, shard): running a period
+    again reuses its row (reset to processing) rather than failing, like the
+    web pipeline's upsert. The run's persist steps replace the old rows.
+    """
     config_str = json.dumps(config_json)
     hash_val = hashlib.sha256(f"{period_start}{period_end}{config_str}".encode()).hexdigest()[:16]
 
     with _conn() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                """INSERT INTO reports (id, period_start, period_end, created_at, config_json, hash, status)
-                   VALUES (%s, %s, %s, %s, %s::jsonb, %s, %s)""",
-                (report_id, period_start, period_end, datetime.now(timezone.utc), config_str, hash_val, "processing"),
+                """INSERT INTO reports (id, period_start, period_end, shard, created_at, config_json, hash, status)
+                   VALUES (%s, %s, %s, %s, %s, %s::jsonb, %s, %s)
+                   ON CONFLICT (period_start, period_end, shard) DO UPDATE
+                   SET created_at = EXCLUDED.created_at, config_json = EXCLUDED.config_json,
+                       hash = EXCLUDED.hash, status = EXCLUDED.status
+                   RETURNING id""",
+                (_cuid(), period_start, period_end, shard or "", datetime.now(timezone.utc),
+                 config_str, hash_val, "processing"),
             )
-        conn.commit()
-    return report_id
+            return cur.fetchone()[0]
+
+
+# ───── Bulk writers ─────
+# Each takes a list of row dicts (keyed like the single-row function's keyword
+# arguments, plus an optional "id") and writes them with one execute_values
+# round trip per BATCH_PAGE_SIZE rows. They return the row IDs in input order,
+# except upsert_entities, which returns a key → id map.
+BATCH_PAGE_SIZE = 1000
+
+
+def upsert_entities(rows: list[dict]) -> dict[str, str]:
+    """
+    Bulk upsert entities by key and return a key → id map.
+
+    Row keys: kind, key, label, first_seen, metrics_json, embedding. New keys are
+    inserted; existing ones get last_seen, metrics_json and embedding refreshed.
+    A single INSERT ... ON CONFLICT statement makes this safe under concurrent workers.
+    """
+    # ON CONFLICT cannot touch the same row twice in one statement; last row per key wins
+    by_key = {row["key"]: row for row in rows}
+    if not by_key:
+        return {}
+
+    now = datetime.now(timezone.utc)
+    values = [
+        (_cuid(), r["kind"], r["key"], r["label"], r["first_seen"], now,
+         json.dumps(r["metrics_json"]), _float_list(r.get("embedding")))
+        + ((_vector_literal(r.get("embedding")),) if PGVECTOR_ENABLED else ())
+        for r in by_key.values()
+    ]
+    # embedding_vec mirrors embedding as a pgvector column for indexed similarity search
+    vec_column, vec_update, vec_template = (
+        (", embedding_vec", ", embedding_vec = EXCLUDED.embedding_vec", ", %s::vector")
+        if PGVECTOR_ENABLED else ("", "", "")
+    )
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            returned = psycopg2.extras.execute_values(
+                cur,
+                f"""INSERT INTO entities (id, kind, key, label, first_seen, last_seen, metrics_json, embedding{vec_column})
+                   VALUES %s
+                   ON CONFLICT (key) DO UPDATE SET
+                       last_seen = EXCLUDED.last_seen,
+                       metrics_json = EXCLUDED.metrics_json,
+                       embedding = EXCLUDED.embedding{vec_update}
+                   RETURNING key, id""",
+                values,
+                template=f"(%s, %s, %s, %s, %s, %s, %s::jsonb, %s::double precision[]{vec_template})",
+                page_size=BATCH_PAGE_SIZE,
+                fetch=True,
+            )
+    return {key: entity_id for key, entity_id in returned}
+
+
+def _float_list(vector) -> list[float]:
+    """Plain floats for a double precision[] column (accepts lists or NumPy rows)."""
+    return [] if vector is None else [float(x) for x in vector]
+
+
+def _vector_literal(vector) -> str | None:
+    """pgvector text form '[x,y,...]'; None (SQL NULL) for a missing or empty vector."""
+    if vector is None or not len(vector):
+        return None
+    return "[" + ",".join(repr(float(x)) for x in vector) + "]"
 
 
 def upsert_entity(
@@ -45,47 +240,129 @@ def upsert_entity(
     embedding: list[float] | None = None,
 ) -> str:
     """Upsert an entity and return its ID."""
-    entity_id = _cuid()
-    now = datetime.now(timezone.utc)
-    emb = embedding or []
+    return upsert_entities([{
+        "kind": kind, "key": key, "label": label, "first_seen": first_seen,
+        "metrics_json": metrics_json, "embedding": embedding,
+    }])[key]
+
 
+def _insert_many(table: str, columns: tuple[str, ...], template: str, values: list[tuple]) -> None:
+    if not values:
+        return
     with _conn() as conn:
         with conn.cursor() as cur:
-            # Check if exists
-            cur.execute("SELECT id FROM entities WHERE key = %s", (key,))
-            row = cur.fetchone()
-            if row:
-                entity_id = row[0]
-                cur.execute(
-                    """UPDATE entities SET last_seen = %s, metrics_json = %s::jsonb, embedding = %s
-                       WHERE id = %s""",
-                    (now, json.dumps(metrics_json), emb, entity_id),
-                )
-            else:
-                cur.execute(
-                    """INSERT INTO entities (id, kind, key, label, first_seen, last_seen, metrics_json, embedding)
-                       VALUES (%s, %s, %s, %s, %s, %s, %s::jsonb, %s)""",
-                    (entity_id, kind, key, label, first_seen, now, json.dumps(metrics_json), emb),
-                )
-        conn.commit()
-    return entity_id
+            psycopg2.extras.execute_values(
+                cur,
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s",
+                values,
+                template=template,
+                page_size=BATCH_PAGE_SIZE,
+            )
+
+
+def _ids(rows: list[dict]) -> list[str]:
+    return [row.get("id") or _cuid() for row in rows]
+
+
+def create_candidates(rows: list[dict]) -> list[str]:
+    """Bulk-insert candidates. Row keys: report_id, entity_id, momentum, novelty, quality, total_score, features_json."""
+    ids = _ids(rows)
+    _insert_many(
+        "candidates",
+        ("id", "report_id", "entity_id", "momentum", "novelty", "quality", "total_score", "features_json"),
+        "(%s, %s, %s, %s, %s, %s, %s, %s::jsonb)",
+        [
+            (cid, r["report_id"], r["entity_id"], r["momentum"], r["novelty"], r["quality"],
+             r["total_score"], json.dumps(r["features_json"]))
+            for cid, r in zip(ids, rows)
+        ],
+    )
+    return ids
+
+
+def create_narratives(rows: list[dict]) -> list[str]:
+    """Bulk-insert narratives. Row keys: report_id, title, summary, momentum, novelty, saturation, scores_json."""
+    ids = _ids(rows)
+    now = datetime.now(timezone.utc)
+    _insert_many(
+        "narratives",
+        ("id", "report_id", "title", "summary", "momentum", "novelty", "saturation", "scores_json", "created_at"),
+        "(%s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s)",
+        [
+            (nid, r["report_id"], r["title"], r["summary"], r["momentum"], r["novelty"],
+             r["saturation"], json.dumps(r["scores_json"]), now)
+            for nid, r in zip(ids, rows)
+        ],
+    )
+    return ids
 
 
+def create_evidence_items(rows: list[dict]) -> list[str]:
+    """Bulk-insert narrative evidence. Row keys: narrative_id, ev_type, title, url, snippet, metrics_json."""
+    ids = _ids(rows)
+    _insert_many(
+        "narrative_evidence",
+        ("id", "narrative_id", "type", "title", "url", "snippet", "metrics_json"),
+        "(%s, %s, %s, %s, %s, %s, %s::jsonb)",
+        [
+            (eid, r["narrative_id"], r["ev_type"], r["title"], r.get("url", ""), r.get("snippet", ""),
+             json.dumps(r.get("metrics_json") or {}))
+            for eid, r in zip(ids, rows)
+        ],
+    )
+    return ids
+
+
+def create_investigation_steps(rows: list[dict]) -> list[str]:
+    """Bulk-insert investigation steps. Row keys: narrative_id, step_index, tool, input_json, output_summary, links."""
+    ids = _ids(rows)
+    now = datetime.now(timezone.utc)
+    _insert_many(
+        "investigation_steps",
+        ("id", "narrative_id", "step_index", "tool", "input_json", "output_summary", "links_json", "created_at"),
+        "(%s, %s, %s, %s, %s::jsonb, %s, %s::jsonb, %s)",
+        [
+            (sid, r["narrative_id"], r["step_index"], r["tool"], json.dumps(r["input_json"]),
+             r["output_summary"], json.dumps(r["links"]), now)
+            for sid, r in zip(ids, rows)
+        ],
+    )
+    return ids
+
+
+def create_ideas(rows: list[dict]) -> list[str]:
+    """
+    Bulk-insert ideas. Row keys: narrative_id, title, pitch, target_user, mvp_scope,
+    why_now, validation, saturation_json, pivot, action_pack_files_json.
+    """
+    ids = _ids(rows)
+    _insert_many(
+        "ideas",
+        ("id", "narrative_id", "title", "pitch", "target_user", "mvp_scope", "why_now", "validation",
+         "saturation_json", "pivot", "action_pack_files_json"),
+        "(%s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s, %s::jsonb)",
+        [
+            (iid, r["narrative_id"], r["title"], r["pitch"], r["target_user"], r["mvp_scope"],
+             r["why_now"], r["validation"], json.dumps(r["saturation_json"]), r["pivot"],
+             json.dumps(r["action_pack_files_json"]))
+            for iid, r in zip(ids, rows)
+        ],
+    )
+    return ids
+
+
+# ───── Single-row writers ─────
+
 def create_candidate(
     report_id: str, entity_id: str,
     momentum: float, novelty: float, quality: float,
     total_score: float, features_json: dict,
 ) -> str:
-    cid = _cuid()
-    with _conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """INSERT INTO candidates (id, report_id, entity_id, momentum, novelty, quality, total_score, features_json)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s::jsonb)""",
-                (cid, report_id, entity_id, momentum, novelty, quality, total_score, json.dumps(features_json)),
-            )
-        conn.commit()
-    return cid
+    return create_candidates([{
+        "report_id": report_id, "entity_id": entity_id,
+        "momentum": momentum, "novelty": novelty, "quality": quality,
+        "total_score": total_score, "features_json": features_json,
+    }])[0]
 
 
 def create_narrative(
@@ -93,48 +370,31 @@ def create_narrative(
     momentum: float, novelty: float, saturation: float,
     scores_json: dict,
 ) -> str:
-    nid = _cuid()
-    with _conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """INSERT INTO narratives (id, report_id, title, summary, momentum, novelty, saturation, scores_json, created_at)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s)""",
-                (nid, report_id, title, summary, momentum, novelty, saturation, json.dumps(scores_json), datetime.now(timezone.utc)),
-            )
-        conn.commit()
-    return nid
+    return create_narratives([{
+        "report_id": report_id, "title": title, "summary": summary,
+        "momentum": momentum, "novelty": novelty, "saturation": saturation,
+        "scores_json": scores_json,
+    }])[0]
 
 
 def create_evidence(
     narrative_id: str, ev_type: str, title: str,
     url: str = "", snippet: str = "", metrics_json: dict | None = None,
 ) -> str:
-    eid = _cuid()
-    with _conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """INSERT INTO narrative_evidence (id, narrative_id, type, title, url, snippet, metrics_json)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s::jsonb)""",
-                (eid, narrative_id, ev_type, title, url, snippet, json.dumps(metrics_json or {})),
-            )
-        conn.commit()
-    return eid
+    return create_evidence_items([{
+        "narrative_id": narrative_id, "ev_type": ev_type, "title": title,
+        "url": url, "snippet": snippet, "metrics_json": metrics_json,
+    }])[0]
 
 
 def create_investigation_step(
     narrative_id: str, step_index: int, tool: str,
     input_json: dict, output_summary: str, links: list[str],
 ) -> str:
-    sid = _cuid()
-    with _conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """INSERT INTO investigation_steps (id, narrative_id, step_index, tool, input_json, output_summary, links_json, created_at)
-                   VALUES (%s, %s, %s, %s, %s::jsonb, %s, %s::jsonb, %s)""",
-                (sid, narrative_id, step_index, tool, json.dumps(input_json), output_summary, json.dumps(links), datetime.now(timezone.utc)),
-            )
-        conn.commit()
-    return sid
+    return create_investigation_steps([{
+        "narrative_id": narrative_id, "step_index": step_index, "tool": tool,
+        "input_json": input_json, "output_summary": output_summary, "links": links,
+    }])[0]
 
 
 def create_idea(
@@ -143,21 +403,247 @@ def create_idea(
     validation: str, saturation_json: dict, pivot: str,
     action_pack_files_json: dict,
 ) -> str:
-    iid = _cuid()
+    return create_ideas([{
+        "narrative_id": narrative_id, "title": title, "pitch": pitch,
+        "target_user": target_user, "mvp_scope": mvp_scope, "why_now": why_now,
+        "validation": validation, "saturation_json": saturation_json, "pivot": pivot,
+        "action_pack_files_json": action_pack_files_json,
+    }])[0]
+
+
+def delete_report_candidates(report_id: str) -> None:
+    """Delete a report's candidates (before writing them again, e.g. on resume)."""
     with _conn() as conn:
         with conn.cursor() as cur:
-            cur.execute(
-                """INSERT INTO ideas (id, narrative_id, title, pitch, target_user, mvp_scope, why_now, validation, saturation_json, pivot, action_pack_files_json)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s, %s::jsonb)""",
-                (iid, narrative_id, title, pitch, target_user, mvp_scope, why_now, validation,
-                 json.dumps(saturation_json), pivot, json.dumps(action_pack_files_json)),
-            )
-        conn.commit()
-    return iid
+            cur.execute("DELETE FROM candidates WHERE report_id = %s", (report_id,))
+
+
+def delete_report_narratives(report_id: str) -> None:
+    """Delete a report's narratives; their evidence, investigation steps and ideas cascade."""
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM narratives WHERE report_id = %s", (report_id,))
 
 
 def update_report_status(report_id: str, status: str) -> None:
     with _conn() as conn:
         with conn.cursor() as cur:
             cur.execute("UPDATE reports SET status = %s WHERE id = %s", (status, report_id))
-        conn.commit()
+
+
+def load_previous_narratives(period_start: datetime, shard: str | None = None) -> list[dict]:
+    """
+    Narratives of the latest complete report ending on or before `period_start`
+    from the same `shard` (unsharded reports have shard "").
+
+    Only narratives persisted with tracking data (scores_json centroid and
+    lineage_id) are returned, each as {id, title, summary, lineage_id, centroid,
+    radius, member_keys, ideas}; ideas carry their action pack under "action_pack".
+    """
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """SELECT id FROM reports
+                   WHERE status = 'complete' AND period_end <= %s AND shard = %s
+                   ORDER BY period_end DESC, created_at DESC
+                   LIMIT 1""",
+                (period_start, shard or ""),
+            )
+            row = cur.fetchone()
+            if row is None:
+                return []
+
+            cur.execute(
+                """SELECT id, title, summary, scores_json FROM narratives
+                   WHERE report_id = %s AND scores_json ? 'centroid'
+                   ORDER BY created_at, id""",
+                (row[0],),
+            )
+            narratives = [
+                {
+                    "id": nid, "title": title, "summary": summary,
+                    "lineage_id": scores.get("lineage_id") or nid,
+                    "centroid": scores["centroid"],
+                    "radius": scores.get("radius", 1.0),
+                    "member_keys": scores.get("member_keys", []),
+                    "ideas": [],
+                }
+                for nid, title, summary, scores in cur.fetchall()
+            ]
+            if not narratives:
+                return []
+
+            by_id = {n["id"]: n for n in narratives}
+            cur.execute(
+                """SELECT narrative_id, title, pitch, target_user, mvp_scope, why_now, validation,
+                          action_pack_files_json
+                   FROM ideas WHERE narrative_id = ANY(%s)
+                   ORDER BY id""",
+                (list(by_id),),
+            )
+            for nid, title, pitch, target, mvp, why_now, validation, pack in cur.fetchall():
+                by_id[nid]["ideas"].append({
+                    "title": title, "pitch": pitch, "target_user": target, "mvp_scope": mvp,
+                    "why_now": why_now, "validation": validation, "action_pack": pack,
+                })
+    return narratives
+
+
+# ───── pgvector similarity ─────
+# entities.embedding_vec and corpus_projects.embedding are vector(EMBEDDING_DIM)
+# columns with an HNSW (or IVFFlat) cosine index. Prisma cannot declare these
+# index types, so ensure_vector_schema creates them idempotently. An IVFFlat
+# index trains its lists on the rows present when it is built, so it is only
+# created once a table has vectors, and build_vector_index rebuilds the corpus
+# index after each bulk load.
+_VECTOR_COLUMNS = {"entities": "embedding_vec", "corpus_projects": "embedding"}
+
+
+def _vector_index_name(table: str, index_type: str) -> str:
+    return f"{table}_{_VECTOR_COLUMNS[table]}_{index_type}_idx"
+
+
+def _vector_index_sql(table: str, index_type: str) -> str:
+    column = _VECTOR_COLUMNS[table]
+    if index_type == "ivfflat":
+        method = f"ivfflat ({column} vector_cosine_ops) WITH (lists = {PGVECTOR_IVFFLAT_LISTS})"
+    else:
+        method = f"hnsw ({column} vector_cosine_ops) WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})"
+    return f"CREATE INDEX IF NOT EXISTS {_vector_index_name(table, index_type)} ON {table} USING {method}"
+
+
+def _check_index_type(index_type: str) -> None:
+    if index_type not in ("hnsw", "ivfflat"):
+        raise ValueError(f"Unknown pgvector index type {index_type!r} (expected hnsw or ivfflat)")
+
+
+def build_vector_index(table: str, index_type: str = PGVECTOR_INDEX, rebuild: bool = False) -> bool:
+    """
+    Create `table`'s ANN index if missing; with `rebuild`, REINDEX an existing
+    IVFFlat index so its lists fit the current rows (HNSW indexes stay current).
+    An IVFFlat index is not built on a table without vectors. Returns whether
+    the index exists afterwards.
+    """
+    _check_index_type(index_type)
+    name = _vector_index_name(table, index_type)
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            if index_type == "ivfflat":
+                cur.execute(f"SELECT EXISTS (SELECT 1 FROM {table} WHERE {_VECTOR_COLUMNS[table]} IS NOT NULL)")
+                if not cur.fetchone()[0]:
+                    return False
+            cur.execute("SELECT to_regclass(%s) IS NOT NULL", (name,))
+            exists = cur.fetchone()[0]
+            if not exists:
+                cur.execute(_vector_index_sql(table, index_type))
+            elif rebuild and index_type == "ivfflat":
+                cur.execute(f"REINDEX INDEX {name}")
+    return True
+
+
+def ensure_vector_schema(index_type: str = PGVECTOR_INDEX) -> None:
+    """Create the pgvector extension, vector columns, corpus table and ANN indexes if missing."""
+    _check_index_type(index_type)
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            cur.execute(f"ALTER TABLE entities ADD COLUMN IF NOT EXISTS embedding_vec vector({EMBEDDING_DIM})")
+            cur.execute(f"""CREATE TABLE IF NOT EXISTS corpus_projects (
+                id          TEXT PRIMARY KEY,
+                name        TEXT NOT NULL UNIQUE,
+                description TEXT NOT NULL DEFAULT '',
+                url         TEXT NOT NULL DEFAULT '',
+                tags        TEXT[] NOT NULL DEFAULT '{{}}',
+                embedding   vector({EMBEDDING_DIM}) NOT NULL,
+                updated_at  TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )""")
+    for table in _VECTOR_COLUMNS:
+        build_vector_index(table, index_type)
+
+
+def upsert_corpus_projects(rows: list[dict]) -> int:
+    """
+    Bulk upsert competitor-corpus projects by name. Returns the number of rows written.
+
+    Row keys: name, description, url, tags, embedding.
+    """
+    by_name = {r["name"]: r for r in rows if r.get("embedding") is not None and len(r["embedding"])}
+    if not by_name:
+        return 0
+    now = datetime.now(timezone.utc)
+    values = [
+        (_cuid(), r["name"], r.get("description", ""), r.get("url", ""),
+         list(r.get("tags") or []), _vector_literal(r["embedding"]), now)
+        for r in by_name.values()
+    ]
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            psycopg2.extras.execute_values(
+                cur,
+                """INSERT INTO corpus_projects (id, name, description, url, tags, embedding, updated_at)
+                   VALUES %s
+                   ON CONFLICT (name) DO UPDATE SET
+                       description = EXCLUDED.description,
+                       url = EXCLUDED.url,
+                       tags = EXCLUDED.tags,
+                       embedding = EXCLUDED.embedding,
+                       updated_at = EXCLUDED.updated_at""",
+                values,
+                template="(%s, %s, %s, %s, %s::text[], %s::vector, %s)",
+                page_size=BATCH_PAGE_SIZE,
+            )
+    return len(values)
+
+
+def corpus_project_count() -> int:
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT count(*) FROM corpus_projects")
+            return cur.fetchone()[0]
+
+
+def nearest_projects_batch(embeddings: list, k: int = 3) -> list[list[dict]]:
+    """
+    The k corpus projects nearest (cosine) to each embedding, in one round trip.
+
+    Returns one list of {"name", "url", "similarity"} per input, best first.
+    Empty or all-zero embeddings (no cosine direction) get no neighbours.
+    """
+    queries = [(i, _vector_literal(e)) for i, e in enumerate(embeddings) if _has_direction(e)]
+    results: list[list[dict]] = [[] for _ in embeddings]
+    if not queries:
+        return results
+    with _conn() as conn:
+        with conn.cursor() as cur:
+            # Search breadth for this transaction only
+            cur.execute(
+                "SELECT set_config('hnsw.ef_search', %s, true), set_config('ivfflat.probes', %s, true)",
+                (str(max(HNSW_EF_SEARCH, k)), str(PGVECTOR_PROBES)),
+            )
+            cur.execute(
+                """SELECT q.i, p.name, p.url, p.similarity
+                   FROM unnest(%s::text[]) WITH ORDINALITY AS q(v, i)
+                   CROSS JOIN LATERAL (
+                       SELECT name, url, 1 - (embedding <=> q.v::vector) AS similarity
+                       FROM corpus_projects
+                       ORDER BY embedding <=> q.v::vector
+                       LIMIT %s
+                   ) p
+                   ORDER BY q.i, p.similarity DESC""",
+                ([literal for _, literal in queries], k),
+            )
+            rows = cur.fetchall()
+
+    for q, name, url, similarity in rows:
+        if similarity is not None:
+            results[queries[q - 1][0]].append({"name": name, "url": url, "similarity": float(similarity)})
+    return results
+
+
+def _has_direction(embedding) -> bool:
+    return embedding is not None and len(embedding) > 0 and any(x != 0 for x in embedding)
+
+
+def nearest_projects(embedding: list[float], k: int = 3) -> list[dict]:
+    """The k corpus projects nearest (cosine) to `embedding`, best first."""
+    return nearest_projects_batch([embedding], k)[0]
@@ -0,0 +1,120 @@
+"""
+Binary embedding store: a float32 .npy matrix plus a key index.
+
+`<stem>.npy` holds one row per key and `<stem>.keys.json` lists the keys in
+row order. `EmbeddingStore` opens the matrix with mmap_mode="r" and serves
+rows as zero-copy views, so opening a store costs only the key index and
+memory grows with the pages actually read.
+
+Usage:
+  python embedding_store.py convert [fixtures/demo_embeddings.json ...]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from collections.abc import Mapping, Iterator, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from config import FIXTURES_DIR
+
+log = logging.getLogger("pipeline")
+
+# JSON embedding fixtures converted by default
+EMBEDDING_FIXTURES = ("demo_embeddings", "projects_embeddings")
+
+
+class EmbeddingStore(Mapping):
+    """Read-only key → vector mapping over a (memory-mapped) float32 matrix."""
+
+    def __init__(self, keys: list[str], matrix: np.ndarray):
+        if len(keys) != len(matrix):
+            raise ValueError(f"{len(keys)} keys for {len(matrix)} embedding rows")
+        self.keys_list = list(keys)
+        self.matrix = matrix
+        self._rows = {key: i for i, key in enumerate(self.keys_list)}
+
+    @classmethod
+    def open(cls, stem: Path) -> "EmbeddingStore":
+        """Open `<stem>.npy` memory-mapped with its `<stem>.keys.json` index."""
+        stem = Path(stem)
+        with open(stem.with_suffix(".keys.json")) as f:
+            keys = json.load(f)
+        return cls(keys, np.load(stem.with_suffix(".npy"), mmap_mode="r"))
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.matrix[self._rows[key]]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys_list)
+
+    def __len__(self) -> int:
+        return len(self.keys_list)
+
+
+def write_store(embeddings: Mapping[str, Sequence[float]], stem: Path) -> Path:
+    """Write `embeddings` as `<stem>.npy` + `<stem>.keys.json` (each replaced atomically)."""
+    stem = Path(stem)
+    keys = list(embeddings.keys())
+    matrix = np.asarray([embeddings[k] for k in keys], dtype=np.float32)
+
+    npy, index = stem.with_suffix(".npy"), stem.with_suffix(".keys.json")
+    tmp_npy, tmp_index = npy.with_suffix(".npy.tmp"), index.with_suffix(".json.tmp")
+    with open(tmp_npy, "wb") as f:
+        np.save(f, matrix)
+    with open(tmp_index, "w") as f:
+        json.dump(keys, f)
+    os.replace(tmp_npy, npy)
+    os.replace(tmp_index, index)
+    return npy
+
+
+def convert_json(path: Path) -> Path:
+    """Convert a `{key: [floats]}` JSON fixture into a binary store next to it."""
+    path = Path(path)
+    with open(path) as f:
+        embeddings = json.load(f)
+    out = write_store(embeddings, path.with_suffix(""))
+    log.info(f"Converted {len(embeddings)} embeddings: {path.name} → {out.name}")
+    return out
+
+
+def load_embedding_fixture(stem: str, directory: Path | None = None) -> Mapping[str, Sequence[float]]:
+    """
+    Embeddings fixture `stem`: the binary store when converted and up to date,
+    otherwise the JSON file. Raises FileNotFoundError if neither exists.
+    """
+    base = Path(directory or FIXTURES_DIR) / stem
+    npy, source = base.with_suffix(".npy"), base.with_suffix(".json")
+    if npy.exists() and base.with_suffix(".keys.json").exists():
+        if source.exists() and source.stat().st_mtime > npy.stat().st_mtime:
+            log.warning(f"{npy.name} is older than {source.name}; re-run `python embedding_store.py convert`")
+        else:
+            return EmbeddingStore.open(base)
+
+    if not source.exists():
+        raise FileNotFoundError(f"Fixture not found: {source}")
+    with open(source) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s",
+                        datefmt="%H:%M:%S", stream=sys.stdout)
+
+    parser = argparse.ArgumentParser(description="Convert JSON embedding fixtures to binary stores")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="Write <name>.npy + <name>.keys.json next to each JSON file")
+    convert.add_argument("paths", nargs="*", type=Path,
+                         default=[FIXTURES_DIR / f"{stem}.json" for stem in EMBEDDING_FIXTURES])
+    args = parser.parse_args()
+
+    for p in args.paths:
+        convert_json(p)
@@ -0,0 +1,371 @@
+"""
+Streaming signal ingestion.
+
+Signals are yielded one merged dict at a time ({key, label, kind, first_seen,
+onchain, dev, social}) so scoring can consume them without holding the whole
+input in memory. Supported inputs:
+
+  - NDJSON (.ndjson / .jsonl): one merged signal per line
+  - JSON array of merged signals: decoded element by element
+  - The demo fixture shape {entities, signals: {onchain, dev, social}}: its
+    per-source records are joined on entity_key, so this one is loaded whole
+  - A directory of per-source dumps, one file per source (entities, onchain,
+    dev, social) as .parquet or .ndjson/.jsonl. Each file is validated against
+    SOURCE_SCHEMAS and only the declared columns are read (Parquet column
+    projection needs pyarrow: pip install pyarrow)
+
+Usage:
+  python ingest.py convert [fixtures/demo_signals.json] [-o fixtures/demo_signals.ndjson]
+  python ingest.py split [fixtures/demo_signals.json] -o signals/ [--format parquet|ndjson]
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+
+from datetime import datetime, timezone
+
+from config import FIXTURES_DIR
+from scoring import FEATURE_COLUMNS
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# pyarrow is imported when a Parquet file is actually read or written
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+log = logging.getLogger("pipeline")
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+SOURCES = ("onchain", "dev", "social")
+
+# ───── Per-source dump schemas: column → (type, required) ─────
+# Types: string | number | timestamp (ISO string, or a Parquet timestamp) | list.
+# Source metric columns are exactly the ones scoring reads (FEATURE_COLUMNS).
+SOURCE_SCHEMAS: dict[str, dict[str, tuple[str, bool]]] = {
+    "entities": {
+        "key": ("string", True),
+        "label": ("string", True),
+        "kind": ("string", False),
+        "first_seen": ("timestamp", False),
+    },
+    **{
+        source: {
+            "entity_key": ("string", True),
+            **{name: ("number", True) for pair in feature_cols.values() for name in pair},
+        }
+        for source, feature_cols in FEATURE_COLUMNS.items()
+    },
+}
+SOURCE_SCHEMAS["social"]["snippets"] = ("list", False)
+
+# Preferred first when a source has files in several formats
+SOURCE_SUFFIXES = (".parquet",) + NDJSON_SUFFIXES
+
+# Rows per Parquet record batch
+_PARQUET_BATCH_ROWS = 65_536
+
+# Characters read per refill when decoding a JSON array incrementally
+_CHUNK_SIZE = 1 << 16
+
+
+def merge_fixture(raw: dict) -> Iterator[dict]:
+    """Join a {entities, signals: {source: [...]}} fixture into merged signals."""
+    by_source = {
+        source: {s["entity_key"]: s for s in raw.get("signals", {}).get(source, [])}
+        for source in SOURCES
+    }
+    for ent in raw["entities"]:
+        merged = {**ent}
+        for source in SOURCES:
+            record = by_source[source].get(ent["key"], {})
+            merged[source] = {k: v for k, v in record.items() if k != "entity_key"}
+        yield merged
+
+
+def _ndjson_lines(path: Path) -> Iterator[tuple[int, dict]]:
+    with open(path, "rb") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield lineno, _loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{lineno}: invalid JSON ({e.msg})") from None
+
+
+def iter_ndjson(path: Path) -> Iterator[dict]:
+    """Yield one JSON object per non-blank line."""
+    for _, record in _ndjson_lines(path):
+        yield record
+
+
+def _iter_array_items(f, buf: str, chunk_size: int) -> Iterator:
+    """Decode array elements from `buf` (text after the opening "[") and then `f`."""
+    decoder = json.JSONDecoder()
+    pos, eof = 0, False
+    while True:
+        # Skip separators, refilling as needed
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+        if pos >= len(buf):
+            raise ValueError("Unterminated JSON array")
+        if buf[pos] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+            # An element ends at a separator or "]". A number cut at the buffer edge
+            # may decode as a shorter one ("-4" of "-4.5e-3"), so wait for more text
+            complete = (end < len(buf) and buf[end] in " \t\r\n,]") or eof
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if complete:
+            yield item
+            pos = end
+        else:
+            more = f.read(chunk_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+
+
+def iter_json(path: Path, chunk_size: int = _CHUNK_SIZE) -> Iterator[dict]:
+    """Yield merged signals from a JSON array (streamed) or a demo-shaped fixture."""
+    with open(path, encoding="utf-8") as f:
+        head = f.read(chunk_size).lstrip()
+        if head.startswith("["):
+            yield from _iter_array_items(f, head[1:], chunk_size)
+            return
+        raw = json.loads(head + f.read())
+
+    if isinstance(raw, dict) and "entities" in raw:
+        yield from merge_fixture(raw)
+    else:
+        raise ValueError(f"{path}: expected a JSON array or {{entities, signals}} object")
+
+
+# ═══════════════════════════════════════
+# Per-source dumps
+# ═══════════════════════════════════════
+
+def _valid_value(value, kind: str) -> bool:
+    if kind == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if kind == "list":
+        return isinstance(value, list)
+    return isinstance(value, str)
+
+
+def _project(record: dict, schema: dict[str, tuple[str, bool]], where: str) -> dict:
+    """Keep only `schema` columns of an NDJSON record, checking presence and types."""
+    if not isinstance(record, dict):
+        raise ValueError(f"{where}: expected a JSON object, got {type(record).__name__}")
+    out = {}
+    for col, (kind, required) in schema.items():
+        value = record.get(col)
+        if value is None:
+            if required:
+                raise ValueError(f"{where}: missing required column {col!r}")
+            continue
+        if not _valid_value(value, kind):
+            raise ValueError(f"{where}: column {col!r} should be {kind}, got {type(value).__name__}")
+        out[col] = value
+    return out
+
+
+def _arrow_type_ok(arrow_type, kind: str) -> bool:
+    import pyarrow as pa
+
+    if kind == "number":
+        return pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type)
+    if kind == "list":
+        return pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type)
+    is_string = pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+    return is_string or (kind == "timestamp" and pa.types.is_timestamp(arrow_type))
+
+
+def _iso(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat()
+
+
+def _read_parquet(path: Path, schema: dict[str, tuple[str, bool]]) -> Iterator[dict]:
+    if not HAS_PYARROW:
+        raise RuntimeError(f"Reading {path.name} requires pyarrow (pip install pyarrow)")
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(path)
+    arrow_schema = pf.schema_arrow
+    columns = []
+    for col, (kind, required) in schema.items():
+        if col not in arrow_schema.names:
+            if required:
+                raise ValueError(f"{path}: missing required column {col!r}")
+            continue
+        arrow_type = arrow_schema.field(col).type
+        if not _arrow_type_ok(arrow_type, kind):
+            raise ValueError(f"{path}: column {col!r} should be {kind}, got {arrow_type}")
+        columns.append(col)
+
+    # Column projection: other columns in the dump are never decoded
+    for batch in pf.iter_batches(batch_size=_PARQUET_BATCH_ROWS, columns=columns):
+        for col in columns:
+            if schema[col][1] and batch.column(col).null_count:
+                raise ValueError(f"{path}: null values in required column {col!r}")
+        data = batch.to_pydict()
+        for i in range(batch.num_rows):
+            record = {col: data[col][i] for col in columns if data[col][i] is not None}
+            if isinstance(record.get("first_seen"), datetime):
+                record["first_seen"] = _iso(record["first_seen"])
+            yield record
+
+
+def read_source(path: Path, schema: dict[str, tuple[str, bool]]) -> Iterator[dict]:
+    """Yield validated records of one per-source file, projected onto `schema`'s columns."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return _read_parquet(path, schema)
+    return (_project(record, schema, f"{path}:{lineno}") for lineno, record in _ndjson_lines(path))
+
+
+def source_files(directory: Path) -> dict[str, Path]:
+    """Map each source present in `directory` (entities, onchain, ...) to its file."""
+    files = {}
+    for name in SOURCE_SCHEMAS:
+        for suffix in SOURCE_SUFFIXES:
+            path = Path(directory) / f"{name}{suffix}"
+            if path.exists():
+                files[name] = path
+                break
+    return files
+
+
+def iter_source_dir(directory: Path) -> Iterator[dict]:
+    """
+    Yield merged signals from a directory of per-source dumps. Source tables are
+    held (projected) in memory for the join; entities are streamed. Missing source
+    files leave that source empty; entities is required.
+    """
+    files = source_files(directory)
+    if "entities" not in files:
+        raise FileNotFoundError(f"No entities file ({'/'.join(SOURCE_SUFFIXES)}) in {directory}")
+    log.info(f"  Per-source input: {', '.join(p.name for p in files.values())}")
+
+    by_source = {
+        source: {rec.pop("entity_key"): rec for rec in read_source(files[source], SOURCE_SCHEMAS[source])}
+        for source in SOURCES if source in files
+    }
+    for ent in read_source(files["entities"], SOURCE_SCHEMAS["entities"]):
+        for source in SOURCES:
+            ent[source] = by_source.get(source, {}).get(ent["key"], {})
+        yield ent
+
+
+def _empty_arrow_table(schema: dict[str, tuple[str, bool]]):
+    """A zero-row table with `schema`'s columns (from_pylist([]) would have none)."""
+    import pyarrow as pa
+
+    types = {"string": pa.string(), "number": pa.float64(), "timestamp": pa.string(), "list": pa.list_(pa.null())}
+    return pa.schema([(col, types[kind]) for col, (kind, _) in schema.items()]).empty_table()
+
+
+def write_source_dir(signals: Iterable[dict], directory: Path, fmt: str = "parquet") -> dict[str, int]:
+    """Split merged signals into one file per source under `directory`. Returns row counts."""
+    if fmt == "parquet":
+        if not HAS_PYARROW:
+            raise RuntimeError("Writing Parquet requires pyarrow (pip install pyarrow)")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+    tables: dict[str, list[dict]] = {name: [] for name in SOURCE_SCHEMAS}
+    for sig in signals:
+        tables["entities"].append({k: v for k, v in sig.items() if k not in SOURCES})
+        for source in SOURCES:
+            if sig.get(source):
+                tables[source].append({"entity_key": sig["key"], **sig[source]})
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, rows in tables.items():
+        if fmt == "parquet":
+            tmp = directory / f"{name}.parquet.tmp"
+            table = pa.Table.from_pylist(rows) if rows else _empty_arrow_table(SOURCE_SCHEMAS[name])
+            pq.write_table(table, tmp)
+            os.replace(tmp, directory / f"{name}.parquet")
+        else:
+            write_ndjson(rows, directory / f"{name}.ndjson")
+    return {name: len(rows) for name, rows in tables.items()}
+
+
+def iter_signals(path: Path) -> Iterator[dict]:
+    """Yield merged signals from `path`, picking the reader by file suffix (or directory)."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Signals not found: {path}")
+    if path.is_dir():
+        return iter_source_dir(path)
+    if path.suffix in NDJSON_SUFFIXES:
+        return iter_ndjson(path)
+    return iter_json(path)
+
+
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    """Consecutive lists of up to `size` items (itertools.batched before 3.12)."""
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def write_ndjson(signals: Iterable[dict], path: Path) -> int:
+    """Write signals one per line (atomically replacing `path`). Returns the count."""
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    count = 0
+    with open(tmp, "w", encoding="utf-8") as f:
+        for sig in signals:
+            f.write(json.dumps(sig, separators=(",", ":")))
+            f.write("\n")
+            count += 1
+    os.replace(tmp, path)
+    return count
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s",
+                        datefmt="%H:%M:%S", stream=sys.stdout)
+
+    parser = argparse.ArgumentParser(description="Signal input utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="Rewrite a signals file as NDJSON (one merged signal per line)")
+    convert.add_argument("path", nargs="?", type=Path, default=FIXTURES_DIR / "demo_signals.json")
+    convert.add_argument("-o", "--output", type=Path, help="Default: <path> with an .ndjson suffix")
+    split = sub.add_parser("split", help="Write one file per source (entities, onchain, dev, social)")
+    split.add_argument("path", nargs="?", type=Path, default=FIXTURES_DIR / "demo_signals.json")
+    split.add_argument("-o", "--output", type=Path, required=True, help="Output directory")
+    split.add_argument("--format", choices=("parquet", "ndjson"), default="parquet")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        out = args.output or args.path.with_suffix(".ndjson")
+        n = write_ndjson(iter_signals(args.path), out)
+        log.info(f"Wrote {n} signals: {args.path.name} → {out.name}")
+    else:
+        counts = write_source_dir(iter_signals(args.path), args.output, args.format)
+        log.info(f"Wrote {args.output}/: " + ", ".join(f"{name} {n}" for name, n in counts.items()))
@@ -0,0 +1,119 @@
+"""
+LLM access for the pipeline: a shared Anthropic client, an on-disk response
+cache keyed by prompt hash, and a bounded-concurrency map for fanning out
+independent prompts.
+"""
+
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, TypeVar
+
+from config import (
+    ANTHROPIC_API_KEY, LLM_MODEL, LLM_CONCURRENCY,
+    LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_BYTES,
+)
+from profiling import profiler
+from tools.cache import DiskCache
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_client: Any = None
+_cache: DiskCache | None = None
+_lock = threading.Lock()
+
+
+def get_client() -> Any:
+    """Shared Anthropic client, created on first use (its HTTP pool is reused)."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                import anthropic
+                _client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    return _client
+
+
+def set_client(client: Any) -> None:
+    """Swap in another client exposing `messages.create` (e.g. a local stub in tests)."""
+    global _client
+    with _lock:
+        _client = client
+
+
+def get_cache() -> DiskCache | None:
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = DiskCache(LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_BYTES)
+    return _cache
+
+
+def prompt_key(model: str, system: str, user: str, max_tokens: int) -> str:
+    payload = json.dumps([model, system, user, max_tokens], separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def complete(
+    system: str,
+    user: str,
+    max_tokens: int = 2048,
+    model: str = LLM_MODEL,
+    parse: Callable[[str], Any] | None = None,
+) -> Any:
+    """
+    Return the model's text for a prompt, served from the response cache when possible.
+
+    With `parse`, return parse(text) instead; a response is only cached once it
+    parses (parse raises ValueError otherwise, which propagates). Truncated
+    responses (stop_reason "max_tokens") are never cached.
+    """
+    cache = get_cache()
+    key = prompt_key(model, system, user, max_tokens)
+    if cache is not None:
+        hit = cache.get(key)
+        if hit is not None:
+            try:
+                result = parse(hit["text"]) if parse else hit["text"]
+            except ValueError:
+                pass  # cached before it was checked; ask again
+            else:
+                profiler.count("llm_cache_hits")
+                return result
+
+    resp = get_client().messages.create(
+        model=model,
+        max_tokens=max_tokens,
+        system=system,
+        messages=[{"role": "user", "content": user}],
+    )
+    profiler.count("llm_calls")
+    usage = getattr(resp, "usage", None)
+    if usage is not None:
+        profiler.count("llm_input_tokens", getattr(usage, "input_tokens", 0) or 0)
+        profiler.count("llm_output_tokens", getattr(usage, "output_tokens", 0) or 0)
+    text = resp.content[0].text
+    result = parse(text) if parse else text
+    if text and cache is not None and getattr(resp, "stop_reason", None) != "max_tokens":
+        cache.put(key, "llm", {"text": text})
+    return result
+
+
+def evict_cache() -> None:
+    cache = get_cache()
+    if cache is not None:
+        cache.evict()
+
+
+def map_bounded(fn: Callable[[T], R], items: Iterable[T], max_workers: int = LLM_CONCURRENCY) -> list[R]:
+    """Apply `fn` to items with at most `max_workers` in flight; results keep input order."""
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm") as pool:
+        return list(pool.map(fn, items))
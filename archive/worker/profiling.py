@@ -0,0 +1,237 @@
+"""
+Run profiling: where a fortnight run spends its time, memory and external calls.
+
+`profiler.stage(name)` records a block's wall time, process CPU time, peak RSS
+(and, with PROFILE_TRACEMALLOC, its traced-memory peak) together with the DB
+round trips, HTTP requests, LLM calls and tokens it caused. Those counters are
+bumped by db, tools.http_client and llm through `profiler.count()`; inside
+`profiler.tool(name)` (one investigation tool call, on whichever worker thread
+or asyncio task runs it) they are also attributed to that tool.
+
+Stages scheduled concurrently (see scheduler) overlap in time, so their
+counter deltas, RSS growth and traced peaks include whatever ran alongside;
+per-tool counters stay exact.
+
+run_pipeline writes the result as `<report_id>.profile.json` next to the
+exported report and, with PROFILE_PROMETHEUS_PATH set, in Prometheus text
+exposition format (e.g. for node_exporter's textfile collector).
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+from config import PROFILE_TRACEMALLOC
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+log = logging.getLogger("pipeline")
+
+# Counters bumped by the instrumented call sites
+COUNTERS = (
+    "db_round_trips",
+    "http_requests", "http_not_modified",
+    "llm_calls", "llm_cache_hits", "llm_input_tokens", "llm_output_tokens",
+    "tool_cache_hits",
+)
+
+
+def _peak_rss_bytes() -> int | None:
+    """High-water resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Profiler:
+    """Per-stage and per-tool measurements of one pipeline run (thread-safe counters)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Tool being run in the current thread or asyncio task (contexts are per task)
+        self._tool: ContextVar[str | None] = ContextVar("profiler_tool", default=None)
+        self._traced_stages = 0  # stages currently inside tracemalloc
+        self._started_tracing = False
+        self.reset()
+
+    def reset(self, report_id: str | None = None) -> None:
+        """Start a fresh profile (run_pipeline calls this once per run)."""
+        with self._lock:
+            self.report_id = report_id
+            self.started_at = datetime.now(timezone.utc)
+            self._wall0, self._cpu0 = time.perf_counter(), time.process_time()
+            self.totals: Counter = Counter()
+            self.stages: list[dict] = []
+            self.tools: dict[str, dict] = {}
+            self.critical_path: list[dict] = []
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add `n` to counter `name` for the run and for the current tool, if any."""
+        with self._lock:
+            self.totals[name] += n
+            tool = self._tool.get()
+            if tool is not None:
+                self.tools[tool]["counters"][name] += n
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict]:
+        """Measure a block as stage `name`; yields the record being built."""
+        record = {"stage": name, "status": "ok"}
+        with self._lock:
+            before = Counter(self.totals)
+        rss_before = _peak_rss_bytes()
+        traced = PROFILE_TRACEMALLOC
+        if traced:
+            with self._lock:
+                if self._traced_stages == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._started_tracing = True
+                else:
+                    tracemalloc.reset_peak()
+                self._traced_stages += 1
+        traced_base = tracemalloc.get_traced_memory()[0] if traced else 0
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+
+        try:
+            yield record
+        except BaseException:
+            record["status"] = "failed"
+            raise
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall0, 6)
+            record["cpu_s"] = round(time.process_time() - cpu0, 6)
+            rss_after = _peak_rss_bytes()
+            if rss_after is not None:
+                record["peak_rss_bytes"] = rss_after
+                record["peak_rss_growth_bytes"] = rss_after - rss_before
+            if traced:
+                with self._lock:
+                    record["traced_peak_bytes"] = max(0, tracemalloc.get_traced_memory()[1] - traced_base)
+                    self._traced_stages -= 1
+                    if self._traced_stages == 0 and self._started_tracing:
+                        tracemalloc.stop()
+                        self._started_tracing = False
+            with self._lock:
+                delta = Counter(self.totals)
+                delta.subtract(before)
+                record["counters"] = {k: v for k, v in delta.items() if v}
+                self.stages.append(record)
+            log.info(
+                f"  [{name}] {record['wall_s']:.2f}s wall, {record['cpu_s']:.2f}s cpu"
+                + "".join(f", {k}={v}" for k, v in record["counters"].items())
+            )
+
+    @contextmanager
+    def tool(self, name: str) -> Iterator[None]:
+        """Attribute counters raised in this thread or task to tool `name` and time the call."""
+        with self._lock:
+            self.tools.setdefault(name, {"calls": 0, "wall_s": 0.0, "counters": Counter()})
+        token = self._tool.set(name)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._tool.reset(token)
+            with self._lock:
+                self.tools[name]["calls"] += 1
+                self.tools[name]["wall_s"] += time.perf_counter() - t0
+
+    # ───── Output ─────
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "report_id": self.report_id,
+                "started_at": self.started_at.isoformat(),
+                # Since reset(); not the sum of stages, which may overlap
+                "wall_s": round(time.perf_counter() - self._wall0, 6),
+                "cpu_s": round(time.process_time() - self._cpu0, 6),
+                "peak_rss_bytes": _peak_rss_bytes(),
+                "counters": dict(self.totals),
+                "stages": [dict(s) for s in self.stages],
+                "critical_path": [dict(s) for s in self.critical_path],
+                "tools": {
+                    name: {"calls": t["calls"], "wall_s": round(t["wall_s"], 6), "counters": dict(t["counters"])}
+                    for name, t in sorted(self.tools.items())
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """The profile as Prometheus text exposition format (gauges labelled by report, stage, tool)."""
+        profile = self.to_dict()
+        report = {"report_id": profile["report_id"] or ""}
+        metrics: dict[str, tuple[str, list[tuple[dict, float]]]] = {}
+
+        def add(metric: str, help_text: str, labels: dict, value) -> None:
+            if value is not None:
+                metrics.setdefault(metric, (help_text, []))[1].append(({**report, **labels}, value))
+
+        for s in profile["stages"]:
+            stage = {"stage": s["stage"]}
+            add("pipeline_stage_wall_seconds", "Wall-clock time of a pipeline stage", stage, s["wall_s"])
+            add("pipeline_stage_cpu_seconds", "Process CPU time during a pipeline stage", stage, s["cpu_s"])
+            add("pipeline_stage_peak_rss_bytes", "Process peak RSS at the end of a stage", stage, s.get("peak_rss_bytes"))
+            add("pipeline_stage_traced_peak_bytes", "Peak traced Python memory during a stage", stage,
+                s.get("traced_peak_bytes"))
+            for counter in COUNTERS:
+                add(f"pipeline_stage_{counter}", f"{counter} during a pipeline stage", stage, s["counters"].get(counter, 0))
+        for c in profile["critical_path"]:
+            add("pipeline_critical_path_wall_seconds", "Wall-clock time of a stage on the run's critical path",
+                {"stage": c["step"]}, c["wall_s"])
+        add("pipeline_run_wall_seconds", "Wall-clock time of the run", {}, profile["wall_s"])
+        for name, t in profile["tools"].items():
+            tool = {"tool": name}
+            add("pipeline_tool_calls", "Investigation tool invocations", tool, t["calls"])
+            add("pipeline_tool_wall_seconds", "Summed wall-clock time of a tool's calls", tool, t["wall_s"])
+            for counter in COUNTERS:
+                add(f"pipeline_tool_{counter}", f"{counter} caused by a tool", tool, t["counters"].get(counter, 0))
+
+        lines = []
+        for metric, (help_text, samples) in metrics.items():
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+                lines.append(f"{metric}{{{label_str}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path: Path, prometheus_path: Path | None = None) -> None:
+        """Write the JSON profile, and the Prometheus text file if a path is given (both atomically)."""
+        _atomic_write(Path(json_path), json.dumps(self.to_dict(), indent=2))
+        if prometheus_path:
+            _atomic_write(Path(prometheus_path), self.to_prometheus())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    # A unique temporary file per writer: concurrent runs (batch.py) may target the same path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False,
+    ) as tmp:
+        tmp.write(text)
+    try:
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+
+profiler = Profiler()
@@ -0,0 +1,251 @@
+"""
+Streaming writer for the static report export.
+
+ReportWriter emits the report JSON incrementally (header, then one narrative
+at a time), compact and UTF-8, and feeds the same bytes to gzip / brotli
+compressors so `<file>.gz` / `<file>.br` sidecars are produced in the same
+pass. Web servers (or a Next.js rewrite) can serve the sidecars directly with
+Content-Encoding instead of compressing on every request.
+
+Action packs (several KB of markdown per idea) are not embedded: each one is
+written to `<report_id>/action-packs/<idea_id>.json` and the idea in the
+report only carries its ID and path. `index.json` lists every exported report
+so the reports page needs a single small fetch.
+
+All files are written to a temporary name and renamed into place, so a failed
+export never leaves a truncated report behind; a report's action packs are
+renamed into place with it, on close(), and removed if it is aborted. Updates to index.json hold an
+exclusive file lock, so concurrent exports (see batch.py) do not drop entries.
+"""
+
+import gzip
+import importlib.util
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: index updates are not serialized across processes
+    fcntl = None
+
+COMPRESSIONS = {"gzip": ".gz", "br": ".br"}
+HAS_BROTLI = importlib.util.find_spec("brotli") is not None
+
+INDEX_NAME = "index.json"
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class _BrotliFile:
+    """Minimal write-only file object around a streaming brotli compressor."""
+
+    def __init__(self, raw: BinaryIO):
+        import brotli
+
+        self.raw = raw
+        self.compressor = brotli.Compressor(quality=9)
+
+    def write(self, data: bytes) -> None:
+        self.raw.write(self.compressor.process(data))
+
+    def close(self) -> None:
+        self.raw.write(self.compressor.finish())
+
+
+class CompressedFile:
+    """
+    Write-only binary file plus compressed sidecars, committed atomically on
+    close(); abort() removes everything written so far. close() is finish()
+    (flush to the temporary files) followed by commit() (rename into place), so
+    several files can be finished first and committed together.
+    """
+
+    def __init__(self, path: Path, compression: list[str] | tuple[str, ...] = ()):
+        for name in compression:
+            if name not in COMPRESSIONS:
+                raise ValueError(f"Unknown compression {name!r} (expected {', '.join(COMPRESSIONS)} or none)")
+            if name == "br" and not HAS_BROTLI:
+                raise RuntimeError("Brotli sidecars require brotli (pip install brotli)")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.bytes_written = 0
+
+        self._targets = [self.path] + [self.path.with_name(self.path.name + COMPRESSIONS[c]) for c in compression]
+        self._raw = [open(_tmp(p), "wb") for p in self._targets]
+        self._streams: list = [self._raw[0]]
+        for name, raw in zip(compression, self._raw[1:]):
+            if name == "gzip":
+                # mtime=0 keeps the sidecar byte-identical for identical content (stable ETags)
+                self._streams.append(gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0))
+            else:
+                self._streams.append(_BrotliFile(raw))
+
+    def write(self, data: bytes) -> None:
+        for stream in self._streams:
+            stream.write(data)
+        self.bytes_written += len(data)
+
+    def finish(self) -> None:
+        for stream in self._streams[1:]:
+            stream.close()
+        for raw in self._raw:
+            raw.close()
+
+    def commit(self) -> None:
+        for target in self._targets:
+            os.replace(_tmp(target), target)
+
+    def close(self) -> None:
+        self.finish()
+        self.commit()
+
+    def abort(self) -> None:
+        for raw in self._raw:
+            raw.close()
+        for target in self._targets:
+            _tmp(target).unlink(missing_ok=True)
+
+    def __enter__(self) -> "CompressedFile":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def _tmp(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def write_json(path: Path, obj: Any, compression: list[str] | tuple[str, ...] = ()) -> int:
+    """Write one compact JSON document (and sidecars). Returns its size in bytes."""
+    with CompressedFile(path, compression) as f:
+        f.write(dumps(obj))
+    return f.bytes_written
+
+
+class ReportWriter:
+    """
+    Incremental writer for one report:
+
+        with ReportWriter(out_dir, report_id, header, compression) as writer:
+            for narrative in narratives:
+                writer.write_narrative(narrative)
+
+    `header` holds the top-level fields; narratives are appended to its
+    "narratives" array as they are written.
+    """
+
+    def __init__(
+        self,
+        out_dir: Path,
+        report_id: str,
+        header: dict,
+        compression: list[str] | tuple[str, ...] = (),
+        action_packs: bool = True,
+    ):
+        self.out_dir = Path(out_dir)
+        self.report_id = report_id
+        self.compression = list(compression)
+        self.action_packs = action_packs
+        self.path = self.out_dir / f"{report_id}.json"
+        self.narratives = 0
+        self.ideas = 0
+        self.action_pack_bytes = 0
+        self._packs: list[CompressedFile] = []  # finished, committed on close()
+
+        self._file = CompressedFile(self.path, self.compression)
+        head = dumps({**header, "narratives": []})
+        self._file.write(head[:-2])  # everything up to the array's closing "]}"
+
+    def write_narrative(self, narrative: dict) -> None:
+        """
+        Append a narrative. Ideas with an "action_pack" have it written to its
+        own file (the idea needs an "id"), replaced by an {"id", "path", "files"} reference.
+        """
+        ideas = []
+        for idea in narrative.get("ideas", []):
+            idea = dict(idea)
+            pack = idea.pop("action_pack", None)
+            if pack and self.action_packs:
+                idea["action_pack"] = self._write_action_pack(idea["id"], pack)
+            ideas.append(idea)
+        self.ideas += len(ideas)
+
+        self._file.write((b"," if self.narratives else b"") + dumps({**narrative, "ideas": ideas}))
+        self.narratives += 1
+
+    def _write_action_pack(self, idea_id: str, pack: dict) -> dict:
+        rel = Path(self.report_id) / "action-packs" / f"{idea_id}.json"
+        f = CompressedFile(self.out_dir / rel, self.compression)
+        self._packs.append(f)
+        f.write(dumps(pack))
+        f.finish()
+        self.action_pack_bytes += f.bytes_written
+        return {"id": idea_id, "path": rel.as_posix(), "files": sorted(pack)}
+
+    def close(self) -> None:
+        self._file.write(b"]}")
+        self._file.finish()
+        # Packs first: a report in place never references a missing pack
+        for pack in self._packs:
+            pack.commit()
+        self._file.commit()
+
+    def abort(self) -> None:
+        self._file.abort()
+        for pack in self._packs:
+            pack.abort()
+        if self._packs:
+            pack_dir = self.out_dir / self.report_id / "action-packs"
+            for d in (pack_dir, pack_dir.parent):
+                try:
+                    d.rmdir()  # only if nothing else (e.g. an earlier export) is there
+                except OSError:
+                    break
+
+    @property
+    def bytes_written(self) -> int:
+        return self._file.bytes_written
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Exclusive lock (across processes) on a hidden `.<name>.lock` file next to `path`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(f".{path.name}.lock"), "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)  # released when the file is closed
+        yield
+
+
+def update_index(out_dir: Path, entry: dict, compression: list[str] | tuple[str, ...] = ()) -> None:
+    """Insert or replace `entry` (matched on "id") in index.json, newest period first."""
+    path = Path(out_dir) / INDEX_NAME
+    with _locked(path):
+        try:
+            reports = json.loads(path.read_bytes())["reports"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            reports = []
+        reports = [r for r in reports if r.get("id") != entry["id"]] + [entry]
+        reports.sort(key=lambda r: (r.get("period_end", ""), r.get("generated_at", "")), reverse=True)
+        write_json(path, {"reports": reports}, compression)
@@ -9,15 +9,20 @@ Orchestrates: signal ingestion → scoring → investigation → clustering
 Usage:
     python3 run_fortnight.py                  # default: last 14 days
     python3 run_fortnight.py --start 2025-01-01 --end 2025-01-15
+    python3 run_fortnight.py --resume <report_id> [--from-step ideas]
+    python3 run_fortnight.py --incremental    # carry narratives over from the last report
+    SIGNALS_PATH=signals.ndjson python3 run_fortnight.py --stream
 """
 
 import argparse
 import hashlib
+import heapq
 import json
 import logging
 import os
 import sys
 import traceback
+from collections.abc import Iterable, Mapping, Sequence
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
@@ -25,22 +30,34 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from config import (
-    DEMO_MODE, HAS_LLM, ANTHROPIC_API_KEY,
-    TOP_K, MAX_NARRATIVES, IDEAS_PER_NARRATIVE,
+    DEMO_MODE, HAS_LLM,
+    TOP_K, MAX_NARRATIVES, IDEAS_PER_NARRATIVE, INVESTIGATION_WORKERS, STAGE_WORKERS,
+    INVESTIGATION_ASYNC, INVESTIGATION_MAX_IN_FLIGHT,
+    INCREMENTAL_NARRATIVES, NARRATIVE_ASSIGN_THRESHOLD, NARRATIVE_ASSIGN_FLOOR, NARRATIVE_STABLE_JACCARD,
+    STREAM_INGEST, SIGNALS_PATH, SCORE_BATCH_SIZE,
+    PROFILE_ENABLED, PROFILE_PROMETHEUS_PATH, EXPORT_COMPRESSION, EXPORT_ACTION_PACKS,
+    TOOL_CACHE_ENABLED, ANN_BACKEND, ANN_INDEX_DIR, PGVECTOR_ENABLED,
     FIXTURES_DIR, REPORTS_OUTPUT_DIR, ROOT_DIR,
     default_period, load_fixture,
 )
 from scoring import (
-    compute_onchain_features, compute_dev_features, compute_social_features,
-    compute_momentum, compute_novelty, compute_quality_penalty,
-    compute_total_score, normalize_scores,
+    FEATURE_COLUMNS, signals_to_columns, score_columns, normalize_scores_array,
 )
-from clustering import cluster_candidates, compute_saturation
+from clustering import cluster_candidates, centroid, centroid_radius, assign_to_centroids, CorpusIndex
 from tools import (
     repo_inspector, idl_differ, dependency_tracker,
-    social_pain_finder, competitor_search, ToolResult,
+    social_pain_finder, competitor_search, ToolResult, ToolCache, run_tool_calls,
+    run_tool_calls_async, HAS_AIOHTTP,
 )
+import ann
 import db
+import llm
+from embedding_store import load_embedding_fixture
+from ingest import iter_signals, batched
+from checkpoint import Checkpoints, STEP_NAMES, parse_step
+from profiling import profiler
+from scheduler import Step, StepGraph
+from report_writer import ReportWriter, update_index
 
 logging.basicConfig(
     level=logging.INFO,
@@ -55,120 +72,156 @@ log = logging.getLogger("pipeline")
 # ═══════════════════════════════════════════════════════════
 
 def _llm_call(system: str, user: str, max_tokens: int = 2048) -> str:
-    """Call Anthropic Claude API. Returns raw text response."""
+    """Call Anthropic Claude API (shared client, cached by prompt). Returns raw text response."""
     if not HAS_LLM:
         return ""
     try:
-        import anthropic
-        client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
-        resp = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=max_tokens,
-            system=system,
-            messages=[{"role": "user", "content": user}],
-        )
-        return resp.content[0].text
+        return llm.complete(system, user, max_tokens)
     except Exception as e:
         log.warning(f"LLM call failed: {e}")
         return ""
 
 
-def _llm_json(system: str, user: str, max_tokens: int = 4096) -> dict | list | None:
-    """Call LLM expecting JSON response. Returns parsed JSON or None."""
-    raw = _llm_call(system, user, max_tokens)
-    if not raw:
-        return None
-    # Strip markdown code fences if present
+def _parse_llm_json(raw: str) -> dict | list:
+    """Parse a JSON response, stripping markdown code fences. Raises ValueError."""
     raw = raw.strip()
     if raw.startswith("```"):
         lines = raw.split("\n")
         lines = [l for l in lines if not l.strip().startswith("```")]
         raw = "\n".join(lines)
+    return json.loads(raw)
+
+
+def _llm_json(system: str, user: str, max_tokens: int = 4096) -> dict | list | None:
+    """Call LLM expecting JSON response. Returns parsed JSON or None (only parsed responses are cached)."""
+    if not HAS_LLM:
+        return None
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return llm.complete(system, user, max_tokens, parse=_parse_llm_json)
+    except ValueError:
         log.warning("LLM returned non-JSON response")
         return None
+    except Exception as e:
+        log.warning(f"LLM call failed: {e}")
+        return None
 
 
 # ═══════════════════════════════════════════════════════════
 # Step 1: Signal Ingestion
 # ═══════════════════════════════════════════════════════════
 
-def ingest_signals() -> list[dict]:
+def signals_path() -> Path:
+    """Signal input file: SIGNALS_PATH, else the demo fixture."""
+    return Path(SIGNALS_PATH or FIXTURES_DIR / "demo_signals.json")
+
+
+def ingest_signals(path: Path | None = None) -> list[dict]:
     """Load signals from fixtures (demo) or live APIs."""
     log.info("Step 1: Ingesting signals...")
+    path = Path(path or signals_path())
 
-    raw = load_fixture("demo_signals.json")
-
-    # The fixture has {entities: [...], signals: {onchain: [...], dev: [...], social: [...]}}
-    # Merge into a flat list: [{key, label, kind, first_seen, onchain, dev, social}, ...]
-    if isinstance(raw, dict) and "entities" in raw:
-        entities = {e["key"]: e for e in raw["entities"]}
-        sig_onchain = {s["entity_key"]: s for s in raw.get("signals", {}).get("onchain", [])}
-        sig_dev = {s["entity_key"]: s for s in raw.get("signals", {}).get("dev", [])}
-        sig_social = {s["entity_key"]: s for s in raw.get("signals", {}).get("social", [])}
-
-        signals = []
-        for key, ent in entities.items():
-            merged = {**ent}
-            oc = sig_onchain.get(key, {})
-            merged["onchain"] = {k: v for k, v in oc.items() if k != "entity_key"}
-            dv = sig_dev.get(key, {})
-            merged["dev"] = {k: v for k, v in dv.items() if k != "entity_key"}
-            sc = sig_social.get(key, {})
-            merged["social"] = {k: v for k, v in sc.items() if k != "entity_key"}
-            signals.append(merged)
-        log.info(f"  Loaded {len(signals)} demo signals (merged from fixture)")
-        return signals
-    elif isinstance(raw, list):
-        log.info(f"  Loaded {len(raw)} demo signals")
-        return raw
-    else:
-        log.error("  Unexpected fixture format")
+    # The fixture has {entities: [...], signals: {onchain: [...], dev: [...], social: [...]}};
+    # iter_signals merges it into a flat list: [{key, label, kind, first_seen, onchain, dev, social}, ...]
+    try:
+        signals = list(iter_signals(path))
+    except ValueError as e:
+        log.error(f"  Unexpected fixture format: {e}")
         return []
+    log.info(f"  Loaded {len(signals)} signals from {path.name}")
+    return signals
 
 
 # ═══════════════════════════════════════════════════════════
 # Step 2: Compute Features & Scores
 # ═══════════════════════════════════════════════════════════
 
-def score_signals(signals: list[dict]) -> list[dict]:
-    """Compute momentum, novelty, quality for each signal."""
-    log.info("Step 2: Computing scores...")
+def _scored_entries(signals: list[dict], now: datetime | None = None) -> list[dict]:
+    """Score a batch of signals in one vectorized pass and unpivot to per-signal dicts."""
+    result = score_columns(signals_to_columns(signals), now)
 
-    scored = []
-    for sig in signals:
-        onchain = compute_onchain_features(sig.get("onchain", {}))
-        dev_f = compute_dev_features(sig.get("dev", {}))
-        social_f = compute_social_features(sig.get("social", {}))
+    feature_values = {
+        source: {f: result[f].tolist() for f in feature_cols}
+        for source, feature_cols in FEATURE_COLUMNS.items()
+    }
+    has_source = {source: result[f"has_{source}"].tolist() for source in FEATURE_COLUMNS}
+    momentum = result["momentum"].tolist()
+    novelty = result["novelty"].tolist()
+    quality = result["quality"].tolist()
+    total = result["total_score"].tolist()
 
-        features = {**onchain, **dev_f, **social_f}
-        momentum = compute_momentum(features)
-        novelty = compute_novelty(sig.get("first_seen", datetime.now(timezone.utc).isoformat()))
-        quality = compute_quality_penalty(features, sig.get("social", {}).get("snippets", []))
-        total = compute_total_score(momentum, novelty, quality)
+    scored = []
+    for i, sig in enumerate(signals):
+        features = {}
+        for source, values in feature_values.items():
+            if has_source[source][i]:
+                features.update({f: v[i] for f, v in values.items()})
 
         scored.append({
             "signal": sig,
             "features": features,
-            "momentum": momentum,
-            "novelty": novelty,
-            "quality": quality,
-            "total_score": total,
+            "momentum": momentum[i],
+            "novelty": novelty[i],
+            "quality": quality[i],
+            "total_score": total[i],
         })
+    return scored
+
+
+def score_signals(signals: list[dict]) -> list[dict]:
+    """Compute momentum, novelty, quality for each signal."""
+    log.info("Step 2: Computing scores...")
 
-    # Normalize scores to [0, 1]
-    totals = [s["total_score"] for s in scored]
-    normed = normalize_scores(totals)
-    for i, s in enumerate(scored):
-        s["normalized_score"] = normed[i]
+    scored = _scored_entries(signals)
+    normed = normalize_scores_array([s["total_score"] for s in scored]).tolist()
+    for entry, value in zip(scored, normed):
+        entry["normalized_score"] = value
 
     scored.sort(key=lambda x: x["total_score"], reverse=True)
     log.info(f"  Scored {len(scored)} signals. Top: {scored[0]['signal']['label']} ({scored[0]['total_score']:.3f})")
     return scored
 
 
+def score_signals_stream(
+    signals: Iterable[dict], k: int = TOP_K, batch_size: int = SCORE_BATCH_SIZE,
+) -> list[dict]:
+    """
+    Streaming `score_signals`: score `signals` in batches and keep only the top
+    `k` in a bounded heap, so memory is O(k + batch_size) rather than O(N).
+
+    Returns the same top `k` entries, in the same order, as
+    `score_signals(list(signals))[:k]`; normalized_score uses the min/max of
+    every signal seen.
+    """
+    log.info(f"Step 2: Computing scores (streaming, top {k})...")
+    now = datetime.now(timezone.utc)  # one novelty reference for every batch
+    heap: list[tuple[float, int, dict]] = []  # (total, -seq, entry): ties keep input order
+    low, high = float("inf"), float("-inf")
+    seen = 0
+
+    for batch in batched(signals, batch_size):
+        for entry in _scored_entries(list(batch), now):
+            total = entry["total_score"]
+            low, high = min(low, total), max(high, total)
+            item = (total, -seen, entry)
+            seen += 1
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+
+    top = [entry for _, _, entry in sorted(heap, key=lambda x: x[:2], reverse=True)]
+    normed = normalize_scores_array([e["total_score"] for e in top], bounds=(low, high)).tolist()
+    for entry, value in zip(top, normed):
+        entry["normalized_score"] = value
+
+    if top:
+        log.info(f"  Scored {seen} signals, kept top {len(top)}. "
+                 f"Top: {top[0]['signal']['label']} ({top[0]['total_score']:.3f})")
+    else:
+        log.warning("  No signals to score")
+    return top
+
+
 # ═══════════════════════════════════════════════════════════
 # Step 3: Select Top K Candidates
 # ═══════════════════════════════════════════════════════════
@@ -185,78 +238,119 @@ def select_top_k(scored: list[dict], k: int = TOP_K) -> list[dict]:
 # Step 4: Run Investigation Tools
 # ═══════════════════════════════════════════════════════════
 
-def investigate_candidates(candidates: list[dict]) -> list[dict]:
-    """Run investigation tools on each candidate."""
-    log.info("Step 4: Running investigations...")
+def investigate_candidates(
+    candidates: list[dict],
+    max_workers: int = INVESTIGATION_WORKERS,
+    period: tuple[datetime, datetime] | None = None,
+    use_async: bool = INVESTIGATION_ASYNC,
+) -> list[dict]:
+    """Run investigation tools on each candidate, fanned out as asyncio tasks or across a thread pool."""
+    if use_async:
+        log.info(f"Step 4: Running investigations (asyncio, up to {INVESTIGATION_MAX_IN_FLIGHT} in flight)...")
+        if not HAS_AIOHTTP and not DEMO_MODE:
+            log.warning("  aiohttp is not installed (see requirements.txt): GitHub requests fall back to threads")
+    else:
+        log.info(f"Step 4: Running investigations ({max_workers} workers)...")
 
-    for i, cand in enumerate(candidates):
+    tools = (repo_inspector, idl_differ, dependency_tracker, social_pain_finder)
+    calls = []
+    for cand in candidates:
         sig = cand["signal"]
         key = sig["key"]
         label = sig["label"]
         snippets = sig.get("social", {}).get("snippets", [])
+        for tool in tools:
+            kwargs = {"snippets": snippets} if tool is social_pain_finder else {}
+            calls.append((tool, (key, label), kwargs))
+
+    # Cached results are scoped to the report period and mode, so reruns of the same
+    # period (e.g. after a crash in a later step) skip the tools entirely
+    cache = ToolCache() if TOOL_CACHE_ENABLED else None
+    scope = json.dumps({
+        "period": [p.isoformat() for p in period] if period else None,
+        "demo": DEMO_MODE,
+    })
+    try:
+        if use_async:
+            import asyncio
 
-        log.info(f"  [{i+1}/{len(candidates)}] Investigating: {label}")
-
-        results: list[ToolResult] = []
-
-        # Tool 1: Repo inspector
-        r1 = repo_inspector(key, label)
-        results.append(r1)
-        log.info(f"    repo_inspector: {len(r1.output_summary)} chars")
-
-        # Tool 2: IDL differ
-        r2 = idl_differ(key, label)
-        results.append(r2)
-        log.info(f"    idl_differ: {len(r2.output_summary)} chars")
-
-        # Tool 3: Dependency tracker
-        r3 = dependency_tracker(key, label)
-        results.append(r3)
-        log.info(f"    dependency_tracker: {len(r3.output_summary)} chars")
-
-        # Tool 4: Social pain finder
-        r4 = social_pain_finder(key, label, snippets=snippets)
-        results.append(r4)
-        log.info(f"    social_pain_finder: {len(r4.output_summary)} chars")
+            results = asyncio.run(run_tool_calls_async(calls, cache=cache, scope=scope))
+        else:
+            results = run_tool_calls(calls, max_workers=max_workers, cache=cache, scope=scope)
+    finally:
+        if cache is not None:
+            cache.evict()
+            cache.close()
+
+    # Results come back in call order: len(tools) consecutive results per candidate.
+    # Copies, not in-place updates: clustering reads the same candidates concurrently
+    investigated = []
+    for i, cand in enumerate(candidates):
+        cand_results: list[ToolResult] = results[i * len(tools):(i + 1) * len(tools)]
+        investigated.append({**cand, "investigation_results": cand_results})
 
-        cand["investigation_results"] = results
+        log.info(f"  [{i+1}/{len(candidates)}] Investigated: {cand['signal']['label']}")
+        for r in cand_results:
+            log.info(f"    {r.tool}: {len(r.output_summary)} chars")
 
-    return candidates
+    return investigated
 
 
 # ═══════════════════════════════════════════════════════════
 # Step 5: Load Embeddings & Cluster
 # ═══════════════════════════════════════════════════════════
 
-def load_embeddings() -> dict[str, list[float]]:
-    """Load precomputed embeddings for demo mode."""
+def load_embeddings() -> Mapping[str, Sequence[float]]:
+    """Load precomputed embeddings for demo mode (memory-mapped when converted)."""
     try:
-        return load_fixture("demo_embeddings.json")
+        return load_embedding_fixture("demo_embeddings")
     except FileNotFoundError:
         log.warning("No demo embeddings found")
         return {}
 
 
-def load_corpus() -> tuple[dict[str, list[float]], dict[str, dict]]:
-    """Load project corpus and embeddings for saturation checks."""
+def load_corpus() -> CorpusIndex:
+    """Load project corpus and embeddings for saturation checks, indexed once per run."""
     try:
         projects = load_fixture("projects.json")
-        corpus_emb = load_fixture("projects_embeddings.json")
     except FileNotFoundError:
-        return {}, {}
+        projects = []
 
     meta = {}
     for p in projects:
         meta[p["name"]] = {"url": p.get("url", ""), "description": p.get("description", "")}
 
-    return corpus_emb, meta
+    if ANN_BACKEND == "pgvector":
+        index = ann.load_pgvector_index(meta)
+        if index is not None:
+            return index
+        log.warning("Falling back to exact search over the fixture corpus")
+    elif ANN_BACKEND != "exact":
+        index = ann.load_index(meta=meta)
+        if index is not None:
+            return index
+        log.warning(f"No ANN index at {ANN_INDEX_DIR} (run `python ann.py build`); using exact search")
+
+    try:
+        corpus_emb = load_embedding_fixture("projects_embeddings")
+    except FileNotFoundError:
+        return CorpusIndex({})
+
+    return CorpusIndex(corpus_emb, meta)
 
 
 def cluster_into_narratives(
     candidates: list[dict],
-    embeddings: dict[str, list[float]],
+    embeddings: Mapping[str, Sequence[float]],
+    previous: list[dict] | None = None,
 ) -> list[dict]:
-    """Cluster candidates into narrative groups."""
+    """
+    Cluster candidates into narrative groups.
+
+    With `previous` narratives (see db.load_previous_narratives), candidates close
+    to a previous narrative's centroid join it first, keeping its lineage_id, and
+    only the leftovers are clustered into new narratives.
+    """
     log.info("Step 5: Clustering candidates into narratives...")
 
     # Build embedding matrix
@@ -267,29 +361,87 @@ def cluster_into_narratives(
         if key in embeddings:
             emb_list.append(embeddings[key])
         else:
-            # Use a zero vector as fallback
+            # Zero vector fallback: clustered as before, but never assigned to a
+            # previous narrative nor counted in a centroid or radius
             dim = len(next(iter(embeddings.values()))) if embeddings else 384
             emb_list.append([0.0] * dim)
         labels.append(cand["signal"]["label"])
 
-    clusters = cluster_candidates(emb_list, labels, min_cluster_size=2)
-    log.info(f"  Found {len(clusters)} clusters")
+    def tracking(indices: list[int]) -> dict:
+        # Persisted with each narrative so the next incremental run can match against it;
+        vectors = [emb_list[i] for i in indices]
+        center = centroid(vectors)
+        return {
+            "member_keys": [candidates[i]["signal"]["key"] for i in indices],
+            "centroid": center.tolist(),
+            "radius": centroid_radius(vectors, center),
+        }
+
+    narrative_groups = []
+    leftover = list(range(len(candidates)))
+
+    if previous and candidates:
+        # A narrative accepts candidates as close as its previous members were, but
+        # never below the floor: one outlying member must not open it to unrelated ones
+        thresholds = [
+            max(NARRATIVE_ASSIGN_FLOOR, min(NARRATIVE_ASSIGN_THRESHOLD, p.get("radius", 1.0)))
+            for p in previous
+        ]
+        assigned = assign_to_centroids(emb_list, [p["centroid"] for p in previous], thresholds)
+        for p_idx, prev in enumerate(previous):
+            member_indices = [i for i in leftover if assigned[i] == p_idx]
+            if member_indices:
+                narrative_groups.append({
+                    "cluster_id": len(narrative_groups),
+                    "member_labels": [labels[i] for i in member_indices],
+                    "members": [candidates[i] for i in member_indices],
+                    "lineage_id": prev["lineage_id"],
+                    "previous": prev,
+                    **tracking(member_indices),
+                })
+        leftover = [i for i in leftover if assigned[i] == -1]
+        log.info(
+            f"  Carried {len(narrative_groups)} of {len(previous)} previous narratives "
+            f"({len(candidates) - len(leftover)} candidates); {len(leftover)} left to cluster"
+        )
+
+    if leftover:
+        clusters = cluster_candidates(
+            [emb_list[i] for i in leftover], [labels[i] for i in leftover], min_cluster_size=2,
+        )
+        log.info(f"  Found {len(clusters)} clusters")
+        offset = len(narrative_groups)
+        for cl in clusters:
+            member_indices = [leftover[i] for i in cl["member_indices"]]
+            narrative_groups.append({
+                "cluster_id": offset + cl["cluster_id"],
+                "member_labels": cl["member_labels"],
+                "members": [candidates[i] for i in member_indices],
+                **tracking(member_indices),
+            })
 
     # Limit to MAX_NARRATIVES
-    clusters = clusters[:MAX_NARRATIVES]
+    return narrative_groups[:MAX_NARRATIVES]
 
-    narrative_groups = []
-    for cl in clusters:
-        members = [candidates[i] for i in cl["member_indices"]]
-        narrative_groups.append({
-            "cluster_id": cl["cluster_id"],
-            "member_labels": cl["member_labels"],
-            "members": members,
-        })
 
+def attach_investigations(narrative_groups: list[dict], investigated: list[dict]) -> list[dict]:
+    """Swap narrative members for their investigated copies (clustering does not wait for investigations)."""
+    by_key = {cand["signal"]["key"]: cand for cand in investigated}
+    for group in narrative_groups:
+        group["members"] = [by_key.get(m["signal"]["key"], m) for m in group["members"]]
     return narrative_groups
 
 
+def _membership_stable(group: dict) -> bool:
+    """True if a carried-over narrative kept enough of its members to reuse its text and ideas."""
+    prev = group.get("previous")
+    if not prev:
+        return False
+    current, before = set(group["member_keys"]), set(prev["member_keys"])
+    union = current | before
+    return bool(union) and len(current & before) / len(union) >= NARRATIVE_STABLE_JACCARD
+
+
 # ═══════════════════════════════════════════════════════════
 # Step 6: Generate Narrative Summaries
 # ═══════════════════════════════════════════════════════════
@@ -328,47 +480,60 @@ DEMO_NARRATIVES = [
 
 
 def generate_narrative_summaries(narrative_groups: list[dict]) -> list[dict]:
-    """Generate title + summary for each narrative cluster."""
+    """Generate title + summary for each narrative cluster, clusters in parallel."""
     log.info("Step 6: Generating narrative summaries...")
 
-    for i, group in enumerate(narrative_groups):
-        # Build evidence text from investigation results
-        evidence_text = ""
-        for member in group["members"]:
-            evidence_text += f"\n--- {member['signal']['label']} ---\n"
-            for result in member.get("investigation_results", []):
-                evidence_text += f"[{result.tool}] {result.output_summary}\n"
+    stable = sum(1 for group in narrative_groups if _membership_stable(group))
+    if stable:
+        log.info(f"  Reusing summaries of {stable} unchanged narratives")
+    llm.map_bounded(_summarize_group, list(enumerate(narrative_groups)))
+    return narrative_groups
 
-        if HAS_LLM:
-            system = (
-                "You are a crypto/Solana ecosystem analyst. Generate a narrative title and summary "
-                "for a cluster of related signals. Return ONLY valid JSON with keys: "
-                '"title" (string, 5-10 words), "summary" (string, 2-4 sentences, technical and specific).'
-            )
-            user = (
-                f"Signals in this cluster:\n"
-                f"Members: {', '.join(group['member_labels'])}\n\n"
-                f"Evidence:\n{evidence_text[:3000]}"
-            )
-            result = _llm_json(system, user)
-            if result and "title" in result:
-                group["title"] = result["title"]
-                group["summary"] = result["summary"]
-                continue
-
-        # Demo fallback
-        if i < len(DEMO_NARRATIVES):
-            group["title"] = DEMO_NARRATIVES[i]["title"]
-            group["summary"] = DEMO_NARRATIVES[i]["summary"]
-        else:
-            group["title"] = f"Emerging Narrative: {', '.join(group['member_labels'][:2])}"
-            group["summary"] = (
-                f"A cluster of {len(group['members'])} related signals showing "
-                f"correlated momentum across {', '.join(group['member_labels'])}. "
-                "Further investigation recommended to validate the narrative thesis."
-            )
 
-    return narrative_groups
+def _summarize_group(indexed: tuple[int, dict]) -> None:
+    """Fill in title + summary for the i-th narrative group (LLM or demo fallback)."""
+    i, group = indexed
+
+    if _membership_stable(group):
+        group["title"] = group["previous"]["title"]
+        group["summary"] = group["previous"]["summary"]
+        return
+
+    # Build evidence text from investigation results
+    evidence_text = ""
+    for member in group["members"]:
+        evidence_text += f"\n--- {member['signal']['label']} ---\n"
+        for result in member.get("investigation_results", []):
+            evidence_text += f"[{result.tool}] {result.output_summary}\n"
+
+    if HAS_LLM:
+        system = (
+            "You are a crypto/Solana ecosystem analyst. Generate a narrative title and summary "
+            "for a cluster of related signals. Return ONLY valid JSON with keys: "
+            '"title" (string, 5-10 words), "summary" (string, 2-4 sentences, technical and specific).'
+        )
+        user = (
+            f"Signals in this cluster:\n"
+            f"Members: {', '.join(group['member_labels'])}\n\n"
+            f"Evidence:\n{evidence_text[:3000]}"
+        )
+        result = _llm_json(system, user)
+        if result and "title" in result:
+            group["title"] = result["title"]
+            group["summary"] = result["summary"]
+            return
+
+    # Demo fallback
+    if i < len(DEMO_NARRATIVES):
+        group["title"] = DEMO_NARRATIVES[i]["title"]
+        group["summary"] = DEMO_NARRATIVES[i]["summary"]
+    else:
+        group["title"] = f"Emerging Narrative: {', '.join(group['member_labels'][:2])}"
+        group["summary"] = (
+            f"A cluster of {len(group['members'])} related signals showing "
+            f"correlated momentum across {', '.join(group['member_labels'])}. "
+            "Further investigation recommended to validate the narrative thesis."
+        )
 
 
 # ═══════════════════════════════════════════════════════════
@@ -597,49 +762,38 @@ Current solutions in the Solana ecosystem are limited by state costs, fragmented
 
 def generate_ideas_and_packs(
     narrative_groups: list[dict],
-    corpus_embeddings: dict[str, list[float]],
-    corpus_meta: dict[str, dict],
-    entity_embeddings: dict[str, list[float]],
+    corpus: CorpusIndex,
+    entity_embeddings: Mapping[str, Sequence[float]],
 ) -> list[dict]:
     """Generate build ideas and action packs for each narrative."""
     log.info("Step 7: Generating build ideas and action packs...")
 
+    # Ideas for every narrative in parallel, then action packs for every idea in parallel
+    llm.map_bounded(_generate_group_ideas, narrative_groups)
+    pack_jobs = [
+        (idea, group.get("title", "Unknown Narrative"))
+        for group in narrative_groups
+        for idea in group["ideas"]
+        if "action_pack" not in idea  # reused ideas keep their pack
+    ]
+    packs = llm.map_bounded(lambda job: _generate_action_pack(*job), pack_jobs)
+    for (idea, _), pack in zip(pack_jobs, packs):
+        idea["action_pack"] = pack
+
+    # Saturation check for every idea of the report in one batched corpus query
+    idea_embs = []
     for group in narrative_groups:
-        title = group.get("title", "Unknown Narrative")
+        # Use first member's embedding as proxy for idea embedding
+        first_key = group["members"][0]["signal"]["key"] if group["members"] else None
+        idea_emb = entity_embeddings.get(first_key, []) if first_key else []
+        idea_embs.extend([idea_emb] * len(group["ideas"]))
+    sats = iter(corpus.saturation_batch(idea_embs))
 
-        if HAS_LLM:
-            evidence_text = ""
-            for member in group["members"]:
-                for result in member.get("investigation_results", []):
-                    evidence_text += f"[{result.tool}] {result.output_summary}\n"
-
-            system = (
-                f"You are a Solana ecosystem product strategist. Generate {IDEAS_PER_NARRATIVE} build ideas "
-                "for a narrative. Return ONLY valid JSON: an array of objects each with keys: "
-                '"title", "pitch", "target_user", "mvp_scope", "why_now", "validation".'
-            )
-            user = (
-                f"Narrative: {title}\n"
-                f"Summary: {group.get('summary', '')}\n\n"
-                f"Evidence:\n{evidence_text[:3000]}"
-            )
-            ideas_data = _llm_json(system, user)
-            if isinstance(ideas_data, list):
-                group["ideas"] = ideas_data[:IDEAS_PER_NARRATIVE]
-            else:
-                group["ideas"] = DEMO_IDEAS.get(title, _default_ideas(group))[:IDEAS_PER_NARRATIVE]
-        else:
-            group["ideas"] = DEMO_IDEAS.get(title, _default_ideas(group))[:IDEAS_PER_NARRATIVE]
+    for group in narrative_groups:
+        title = group.get("title", "Unknown Narrative")
 
-        # Generate action packs + saturation for each idea
         for idea in group["ideas"]:
-            idea["action_pack"] = _generate_action_pack(idea, title)
-
-            # Saturation check
-            # Use first member's embedding as proxy for idea embedding
-            first_key = group["members"][0]["signal"]["key"] if group["members"] else None
-            idea_emb = entity_embeddings.get(first_key, []) if first_key else []
-            sat = compute_saturation(idea_emb, corpus_embeddings, corpus_meta)
+            sat = next(sats)
             idea["saturation"] = sat
 
             if sat["level"] == "high":
@@ -653,9 +807,49 @@ def generate_ideas_and_packs(
 
         log.info(f"  {title}: {len(group['ideas'])} ideas generated")
 
+    llm.evict_cache()
     return narrative_groups
 
 
+def _generate_group_ideas(group: dict) -> None:
+    """Fill in group["ideas"] from the LLM, falling back to demo/default ideas."""
+    title = group.get("title", "Unknown Narrative")
+
+    if _membership_stable(group) and group["previous"]["ideas"]:
+        group["ideas"] = [dict(idea) for idea in group["previous"]["ideas"]]
+        return
+
+    if HAS_LLM:
+        evidence_text = ""
+        for member in group["members"]:
+            for result in member.get("investigation_results", []):
+                evidence_text += f"[{result.tool}] {result.output_summary}\n"
+
+        system = (
+            f"You are a Solana ecosystem product strategist. Generate {IDEAS_PER_NARRATIVE} build ideas "
+            "for a narrative. Return ONLY valid JSON: an array of objects each with keys: "
+            '"title", "pitch", "target_user", "mvp_scope", "why_now", "validation".'
+        )
+        user = (
+            f"Narrative: {title}\n"
+            f"Summary: {group.get('summary', '')}\n\n"
+            f"Evidence:\n{evidence_text[:3000]}"
+        )
+        ideas_data = _llm_json(system, user)
+        if isinstance(ideas_data, list):
+            group["ideas"] = ideas_data[:IDEAS_PER_NARRATIVE]
+        else:
+            group["ideas"] = _fallback_ideas(group)
+    else:
+        group["ideas"] = _fallback_ideas(group)
+
+
+def _fallback_ideas(group: dict) -> list[dict]:
+    """Demo ideas for the narrative's title, else generic ones (copied; callers mutate them)."""
+    ideas = DEMO_IDEAS.get(group.get("title", "Unknown Narrative")) or _default_ideas(group)
+    return [dict(idea) for idea in ideas[:IDEAS_PER_NARRATIVE]]
+
+
 def _default_ideas(group: dict) -> list[dict]:
     """Generate generic ideas when no demo data matches."""
     labels = group.get("member_labels", ["Unknown"])
@@ -680,116 +874,182 @@ def _default_ideas(group: dict) -> list[dict]:
 
 
 # ═══════════════════════════════════════════════════════════
-# Step 8: Persist Everything to Database
+# Steps 8-9: Persist Everything to Database
 # ═══════════════════════════════════════════════════════════
 
 def persist_report(
     report_id: str,
     narrative_groups: list[dict],
     candidates: list[dict],
-    entity_embeddings: dict[str, list[float]],
+    entity_embeddings: Mapping[str, Sequence[float]],
 ) -> None:
-    """Save all data to the database."""
-    log.info("Step 8: Persisting to database...")
+    """Save all data to the database in a single transaction, one bulk write per table."""
+    # One pooled connection, one commit; a failure rolls back the partial report
+    with db.session():
+        entity_ids = persist_entities(candidates, entity_embeddings)
+        persist_narratives(report_id, narrative_groups)
+        persist_candidates(report_id, candidates, entity_ids)
+
 
-    # Save entities and candidates
+def persist_entities(
+    candidates: list[dict],
+    entity_embeddings: Mapping[str, Sequence[float]],
+) -> dict[str, str]:
+    """
+    Upsert the candidates' entities and return their key → id map. Entities are
+    shared across reports and upserted by key, so running this again is harmless.
+    """
+    log.info("Step 8: Persisting entities...")
+
+    entity_rows = []
     for cand in candidates:
         sig = cand["signal"]
-        emb = entity_embeddings.get(sig["key"], [])
-        entity_id = db.upsert_entity(
-            kind=sig.get("kind", "protocol"),
-            key=sig["key"],
-            label=sig["label"],
-            first_seen=datetime.fromisoformat(
+        entity_rows.append({
+            "kind": sig.get("kind", "protocol"),
+            "key": sig["key"],
+            "label": sig["label"],
+            "first_seen": datetime.fromisoformat(
                 sig.get("first_seen", datetime.now(timezone.utc).isoformat()).replace("Z", "+00:00")
             ),
-            metrics_json={
+            "metrics_json": {
                 "onchain": sig.get("onchain", {}),
                 "dev": sig.get("dev", {}),
                 "social": {k: v for k, v in sig.get("social", {}).items() if k != "snippets"},
             },
-            embedding=emb,
-        )
-        db.create_candidate(
-            report_id=report_id,
-            entity_id=entity_id,
-            momentum=cand["momentum"],
-            novelty=cand["novelty"],
-            quality=cand["quality"],
-            total_score=cand["total_score"],
-            features_json=cand["features"],
-        )
+            "embedding": entity_embeddings.get(sig["key"], []),
+        })
+    entity_ids = db.upsert_entities(entity_rows)
 
-    # Save narratives, evidence, investigation steps, ideas
-    for group in narrative_groups:
-        # Compute narrative-level scores
-        momentums = [m["momentum"] for m in group["members"]]
-        novelties = [m["novelty"] for m in group["members"]]
-        avg_momentum = sum(momentums) / len(momentums) if momentums else 0
-        avg_novelty = sum(novelties) / len(novelties) if novelties else 0
-
-        # Saturation: average of idea saturations
-        idea_sats = [idea.get("saturation", {}).get("score", 0) for idea in group.get("ideas", [])]
-        avg_saturation = sum(idea_sats) / len(idea_sats) if idea_sats else 0
-
-        narrative_id = db.create_narrative(
-            report_id=report_id,
-            title=group.get("title", "Untitled Narrative"),
-            summary=group.get("summary", ""),
-            momentum=round(avg_momentum, 3),
-            novelty=round(avg_novelty, 3),
-            saturation=round(avg_saturation, 3),
-            scores_json={
-                "member_count": len(group["members"]),
-                "member_labels": group.get("member_labels", []),
-            },
-        )
+    log.info(f"  Saved {len(entity_ids)} entities to DB")
+    return entity_ids
 
-        # Investigation steps & evidence from all members
-        step_index = 0
-        for member in group["members"]:
-            for result in member.get("investigation_results", []):
-                db.create_investigation_step(
-                    narrative_id=narrative_id,
-                    step_index=step_index,
-                    tool=result.tool,
-                    input_json=result.input_json,
-                    output_summary=result.output_summary,
-                    links=result.evidence_links,
-                )
-                step_index += 1
-
-                # Evidence items from tool results
-                for ev in result.evidence_items:
-                    db.create_evidence(
-                        narrative_id=narrative_id,
-                        ev_type=ev.get("type", "other"),
-                        title=ev.get("title", ""),
-                        url=ev.get("url", ""),
-                        snippet=ev.get("snippet", ""),
-                        metrics_json=ev.get("metrics_json", {}),
-                    )
-
-        # Ideas
-        for idea in group.get("ideas", []):
-            db.create_idea(
-                narrative_id=narrative_id,
-                title=idea.get("title", ""),
-                pitch=idea.get("pitch", ""),
-                target_user=idea.get("target_user", ""),
-                mvp_scope=idea.get("mvp_scope", ""),
-                why_now=idea.get("why_now", ""),
-                validation=idea.get("validation", ""),
-                saturation_json=idea.get("saturation", {}),
-                pivot=idea.get("pivot", ""),
-                action_pack_files_json=idea.get("action_pack", {}),
-            )
-
-    log.info(f"  Saved {len(narrative_groups)} narratives to DB")
+
+def persist_candidates(report_id: str, candidates: list[dict], entity_ids: dict[str, str]) -> None:
+    """
+    Save the candidates (entities from persist_entities), replacing any the
+    report already has from an earlier, resumed run.
+    """
+    candidate_rows = [
+        {
+            "report_id": report_id,
+            "entity_id": entity_ids[cand["signal"]["key"]],
+            "momentum": cand["momentum"],
+            "novelty": cand["novelty"],
+            "quality": cand["quality"],
+            "total_score": cand["total_score"],
+            "features_json": cand["features"],
+        }
+        for cand in candidates
+    ]
+    with db.session():
+        db.delete_report_candidates(report_id)
+        db.create_candidates(candidate_rows)
+
+    log.info(f"  Saved {len(candidate_rows)} candidates to DB")
+
+
+def persist_narratives(report_id: str, narrative_groups: list[dict]) -> None:
+    """
+    Save narratives with their investigation steps, evidence and ideas, in one
+    transaction, replacing any the report already has (e.g. on --from-step).
+    """
+    log.info("Step 9: Persisting narratives...")
+
+    with db.session():
+        db.delete_report_narratives(report_id)
+        # Save narratives first so their IDs can key the child rows
+        narrative_rows = []
+        for group in narrative_groups:
+            # Compute narrative-level scores
+            momentums = [m["momentum"] for m in group["members"]]
+            novelties = [m["novelty"] for m in group["members"]]
+            avg_momentum = sum(momentums) / len(momentums) if momentums else 0
+            avg_novelty = sum(novelties) / len(novelties) if novelties else 0
+
+            # Saturation: average of idea saturations
+            idea_sats = [idea.get("saturation", {}).get("score", 0) for idea in group.get("ideas", [])]
+            avg_saturation = sum(idea_sats) / len(idea_sats) if idea_sats else 0
+
+            # A new narrative starts its own lineage; carried-over ones keep theirs
+            narrative_id = db.new_id()
+            group["lineage_id"] = group.get("lineage_id") or narrative_id
+
+            narrative_rows.append({
+                "id": narrative_id,
+                "report_id": report_id,
+                "title": group.get("title", "Untitled Narrative"),
+                "summary": group.get("summary", ""),
+                "momentum": round(avg_momentum, 3),
+                "novelty": round(avg_novelty, 3),
+                "saturation": round(avg_saturation, 3),
+                "scores_json": {
+                    "member_count": len(group["members"]),
+                    "member_labels": group.get("member_labels", []),
+                    "lineage_id": group["lineage_id"],
+                    "previous_narrative_id": group.get("previous", {}).get("id"),
+                    "member_keys": group.get("member_keys", []),
+                    "centroid": [round(x, 6) for x in group.get("centroid", [])],
+                    "radius": round(group.get("radius", 1.0), 6),
+                },
+            })
+        narrative_ids = db.create_narratives(narrative_rows)
+
+        # Investigation steps, evidence and ideas, collected across all narratives
+        step_rows, evidence_rows, idea_rows = [], [], []
+        for narrative_id, group in zip(narrative_ids, narrative_groups):
+            step_index = 0
+            for member in group["members"]:
+                for result in member.get("investigation_results", []):
+                    step_rows.append({
+                        "narrative_id": narrative_id,
+                        "step_index": step_index,
+                        "tool": result.tool,
+                        "input_json": result.input_json,
+                        "output_summary": result.output_summary,
+                        "links": result.evidence_links,
+                    })
+                    step_index += 1
+
+                    # Evidence items from tool results
+                    for ev in result.evidence_items:
+                        evidence_rows.append({
+                            "narrative_id": narrative_id,
+                            "ev_type": ev.get("type", "other"),
+                            "title": ev.get("title", ""),
+                            "url": ev.get("url", ""),
+                            "snippet": ev.get("snippet", ""),
+                            "metrics_json": ev.get("metrics_json", {}),
+                        })
+
+            for idea in group.get("ideas", []):
+                # Assigned here so the export can name action-pack files after the DB row
+                idea["id"] = idea.get("id") or db.new_id()
+                idea_rows.append({
+                    "id": idea["id"],
+                    "narrative_id": narrative_id,
+                    "title": idea.get("title", ""),
+                    "pitch": idea.get("pitch", ""),
+                    "target_user": idea.get("target_user", ""),
+                    "mvp_scope": idea.get("mvp_scope", ""),
+                    "why_now": idea.get("why_now", ""),
+                    "validation": idea.get("validation", ""),
+                    "saturation_json": idea.get("saturation", {}),
+                    "pivot": idea.get("pivot", ""),
+                    "action_pack_files_json": idea.get("action_pack", {}),
+                })
+
+        db.create_investigation_steps(step_rows)
+        db.create_evidence_items(evidence_rows)
+        db.create_ideas(idea_rows)
+
+    log.info(
+        f"  Saved {len(narrative_groups)} narratives to DB "
+        f"({len(step_rows)} steps, {len(evidence_rows)} evidence, {len(idea_rows)} ideas)"
+    )
 
 
 # ═══════════════════════════════════════════════════════════
-# Step 9: Export Report JSON
+# Step 10: Export Report JSON
 # ═══════════════════════════════════════════════════════════
 
 def export_report_json(
@@ -798,51 +1058,172 @@ def export_report_json(
     period_end: datetime,
     narrative_groups: list[dict],
 ) -> str:
-    """Export report as JSON file for static hosting."""
-    log.info("Step 9: Exporting report JSON...")
+    """
+    Export report as JSON file for static hosting.
 
-    REPORTS_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    Narratives are streamed to compact JSON (plus EXPORT_COMPRESSION sidecars);
+    action packs go to per-idea files and the report index is updated (see report_writer).
+    """
+    log.info("Step 10: Exporting report JSON...")
 
-    report_data = {
+    header = {
         "id": report_id,
         "period_start": period_start.isoformat(),
         "period_end": period_end.isoformat(),
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "demo_mode": DEMO_MODE,
-        "narratives": [],
     }
 
-    for group in narrative_groups:
-        narrative = {
-            "title": group.get("title", ""),
-            "summary": group.get("summary", ""),
-            "member_labels": group.get("member_labels", []),
-            "ideas": [
-                {
-                    "title": idea.get("title", ""),
-                    "pitch": idea.get("pitch", ""),
-                    "saturation": idea.get("saturation", {}),
-                }
-                for idea in group.get("ideas", [])
-            ],
-        }
-        report_data["narratives"].append(narrative)
-
-    output_path = REPORTS_OUTPUT_DIR / f"{report_id}.json"
-    with open(output_path, "w") as f:
-        json.dump(report_data, f, indent=2)
-
-    log.info(f"  Exported to {output_path}")
-    return str(output_path)
+    with ReportWriter(
+        REPORTS_OUTPUT_DIR, report_id, header, EXPORT_COMPRESSION, action_packs=EXPORT_ACTION_PACKS,
+    ) as writer:
+        for group in narrative_groups:
+            writer.write_narrative({
+                "lineage_id": group.get("lineage_id", ""),
+                "title": group.get("title", ""),
+                "summary": group.get("summary", ""),
+                "member_labels": group.get("member_labels", []),
+                "ideas": [
+                    {
+                        # Ideas that never went through persist_narratives (e.g. benchmarks) have none yet
+                        "id": idea.get("id") or db.new_id(),
+                        "title": idea.get("title", ""),
+                        "pitch": idea.get("pitch", ""),
+                        "saturation": idea.get("saturation", {}),
+                        "action_pack": idea.get("action_pack") or None,
+                    }
+                    for idea in group.get("ideas", [])
+                ],
+            })
+
+    update_index(REPORTS_OUTPUT_DIR, {
+        **header,
+        "narratives": writer.narratives,
+        "ideas": writer.ideas,
+        "path": writer.path.name,
+        "bytes": writer.bytes_written,
+    }, EXPORT_COMPRESSION)
+
+    log.info(
+        f"  Exported to {writer.path} ({writer.bytes_written / 1024:.1f} KB"
+        + (f", action packs {writer.action_pack_bytes / 1024:.1f} KB" if writer.action_pack_bytes else "")
+        + (f", sidecars: {', '.join(EXPORT_COMPRESSION)}" if EXPORT_COMPRESSION else "")
+        + ")"
+    )
+    return str(writer.path)
 
 
 # ═══════════════════════════════════════════════════════════
 # Main Pipeline
 # ═══════════════════════════════════════════════════════════
 
-def run_pipeline(period_start: datetime | None = None, period_end: datetime | None = None) -> str:
-    """Execute the full fortnightly report pipeline. Returns report ID."""
-    if period_start is None or period_end is None:
+def pipeline_graph(
+    report_id: str,
+    period_start: datetime,
+    period_end: datetime,
+    incremental: bool = False,
+    stream: bool = False,
+    signals: Path | None = None,
+    shard: str | None = None,
+    preloaded: dict | None = None,
+) -> StepGraph:
+    """
+    The pipeline as a dependency graph. The checkpointed steps are those of
+    checkpoint.STEP_NAMES; embeddings and the corpus are loaded (concurrently
+    with ingestion) whenever a step that needs them runs, unless `preloaded`
+    already holds them (see batch.py).
+    """
+    preloaded = preloaded or {}
+    if stream:
+        # Step 1 only records the source; step 2 reads it lazily and keeps the top K
+        def locate_signals(r: dict) -> Path:
+            path = Path(signals) if signals else signals_path()
+            log.info(f"Step 1: Streaming signals from {path.name}")
+            return path
+
+        ingest = Step("ingest", (), locate_signals)
+        score = Step("score", ("ingest",), lambda r: score_signals_stream(iter_signals(r["ingest"])))
+    else:
+        ingest = Step("ingest", (), lambda r: ingest_signals(signals))
+        score = Step("score", ("ingest",), lambda r: score_signals(r["ingest"]))
+
+    def persist(r: dict) -> list[dict]:
+        # Candidates and narratives commit together, so a failed or resumed run
+        # never leaves the report with one and not the other
+        with db.session():
+            persist_narratives(report_id, r["ideas"])
+            persist_candidates(report_id, r["select"], r["persist_entities"])
+        return r["ideas"]  # with lineage and idea IDs assigned
+
+    return StepGraph([
+        Step("embeddings", (), lambda r: preloaded["embeddings"] if "embeddings" in preloaded else load_embeddings(),
+             checkpoint=False),
+        Step("corpus", (), lambda r: preloaded["corpus"] if "corpus" in preloaded else load_corpus(),
+             checkpoint=False),
+        ingest,
+        score,
+        Step("select", ("score",), lambda r: select_top_k(r["score"])),
+        Step("investigate", ("select",), lambda r: investigate_candidates(
+            r["select"], period=(period_start, period_end),
+        )),
+        # Clustering only needs the candidates' embeddings, not their investigations
+        Step("cluster", ("select", "embeddings"), lambda r: cluster_into_narratives(
+            r["select"], r["embeddings"],
+            previous=db.load_previous_narratives(period_start, shard) if incremental else None,
+        )),
+        Step("summarize", ("cluster", "investigate"), lambda r: generate_narrative_summaries(
+            attach_investigations(r["cluster"], r["investigate"]),
+        )),
+        Step("ideas", ("summarize", "corpus", "embeddings"), lambda r: generate_ideas_and_packs(
+            r["summarize"], r["corpus"], r["embeddings"],
+        )),
+        Step("persist_entities", ("select", "embeddings"), lambda r: persist_entities(
+            r["select"], r["embeddings"],
+        )),
+        Step("persist", ("select", "ideas", "persist_entities"), persist),
+        Step("export", ("persist",), lambda r: export_report_json(
+            report_id, period_start, period_end, r["persist"],
+        )),
+    ])
+
+
+def run_pipeline(
+    period_start: datetime | None = None,
+    period_end: datetime | None = None,
+    resume: str | None = None,
+    from_step: int | None = None,
+    incremental: bool = INCREMENTAL_NARRATIVES,
+    stream: bool = STREAM_INGEST,
+    signals: Path | None = None,
+    shard: str | None = None,
+    preloaded: dict | None = None,
+) -> str:
+    """
+    Execute the full fortnightly report pipeline. Returns report ID.
+
+    Steps run as soon as their inputs are ready (see pipeline_graph), up to
+    STAGE_WORKERS at a time, and the run's critical path is logged.
+    With `resume`, continue an earlier report from its checkpoints instead of
+    creating a new one: steps without a checkpoint run, and `from_step` (with
+    every step depending on it) runs again.
+    With `incremental`, narratives of the previous report are carried forward
+    (see cluster_into_narratives) instead of clustering from scratch.
+    With `stream`, signals are scored as they are read and only the top K are kept
+    (see score_signals_stream).
+    `signals` overrides SIGNALS_PATH and `shard` names the entity subset it holds
+    (recorded on the report; incremental runs only follow reports of the same shard).
+    `preloaded` may hold "embeddings" and "corpus" to use instead of loading them.
+    """
+    if resume:
+        report_id = resume
+        checkpoints = Checkpoints(report_id)
+        meta = checkpoints.load_meta()
+        period_start, period_end = meta["period_start"], meta["period_end"]
+        incremental = meta["config"].get("incremental", False)
+        stream = meta["config"].get("stream_ingest", False)
+        signals = meta["config"].get("signals_path")
+        shard = meta["config"].get("shard")
+    elif period_start is None or period_end is None:
         period_start, period_end = default_period()
 
     log.info("=" * 60)
@@ -850,34 +1231,55 @@ def run_pipeline(period_start: datetime | None = None, period_end: datetime | No
     log.info(f"Period: {period_start.date()} → {period_end.date()}")
     log.info(f"Mode: {'DEMO' if DEMO_MODE else 'LIVE'}")
     log.info(f"LLM: {'available' if HAS_LLM else 'demo fallback'}")
+    log.info(f"Narratives: {'incremental' if incremental else 'from scratch'}")
+    log.info(f"Ingestion: {'streaming' if stream else 'in memory'}")
+    if shard:
+        log.info(f"Shard: {shard} ({signals or signals_path()})")
     log.info("=" * 60)
 
-    # Create report record
-    report_id = db.create_report(
-        period_start=period_start,
-        period_end=period_end,
-        config_json={"demo_mode": DEMO_MODE, "top_k": TOP_K, "max_narratives": MAX_NARRATIVES},
-    )
+    if PGVECTOR_ENABLED:
+        # entities.embedding_vec and its index live outside the Prisma schema
+        db.ensure_vector_schema()
+
+    if resume:
+        graph = pipeline_graph(report_id, period_start, period_end, incremental, stream, signals, shard, preloaded)
+        done = checkpoints.completed()
+        if from_step:
+            rerun = graph.descendants(STEP_NAMES[from_step - 1])
+            checkpoints.discard(rerun)  # stale outputs must not be picked up if this run fails too
+            done -= rerun
+        if done >= set(STEP_NAMES):
+            log.info(f"Report {report_id} already completed every step; nothing to resume")
+            return report_id
+        todo = [name for name in STEP_NAMES if name not in done]
+        log.info(f"Resuming report {report_id}: running {', '.join(todo)}")
+        db.update_report_status(report_id, "processing")
+    else:
+        # Create report record
+        config_json = {
+            "demo_mode": DEMO_MODE, "top_k": TOP_K, "max_narratives": MAX_NARRATIVES,
+            "incremental": incremental, "stream_ingest": stream,
+        }
+        if signals:
+            config_json["signals_path"] = str(signals)
+        if shard:
+            config_json["shard"] = shard
+        report_id = db.create_report(
+            period_start=period_start,
+            period_end=period_end,
+            config_json=config_json,
+            shard=shard,
+        )
+        checkpoints = Checkpoints(report_id)
+        checkpoints.discard(set(STEP_NAMES))  # left over if this period and shard ran before
+        checkpoints.save_meta(period_start, period_end, config_json)
+        graph = pipeline_graph(report_id, period_start, period_end, incremental, stream, signals, shard, preloaded)
+        done = set()
     log.info(f"Report ID: {report_id}")
+    profiler.reset(report_id)
 
     try:
-        # Pipeline steps
-        signals = ingest_signals()
-        scored = score_signals(signals)
-        candidates = select_top_k(scored)
-        candidates = investigate_candidates(candidates)
-
-        embeddings = load_embeddings()
-        corpus_emb, corpus_meta = load_corpus()
-
-        narrative_groups = cluster_into_narratives(candidates, embeddings)
-        narrative_groups = generate_narrative_summaries(narrative_groups)
-        narrative_groups = generate_ideas_and_packs(
-            narrative_groups, corpus_emb, corpus_meta, embeddings,
-        )
-
-        persist_report(report_id, narrative_groups, candidates, embeddings)
-        export_report_json(report_id, period_start, period_end, narrative_groups)
+        graph.run(done, checkpoints.load, checkpoints.save, stage=profiler.stage, max_workers=STAGE_WORKERS)
 
         db.update_report_status(report_id, "complete")
         log.info("=" * 60)
@@ -886,20 +1288,56 @@ def run_pipeline(period_start: datetime | None = None, period_end: datetime | No
 
     except Exception as e:
         log.error(f"Pipeline failed: {e}")
+        log.error(f"Resume with: python3 run_fortnight.py --resume {report_id}")
         traceback.print_exc()
         db.update_report_status(report_id, "failed")
         raise
+    finally:
+        profiler.critical_path = graph.critical
+        if PROFILE_ENABLED:
+            write_profile(report_id)
 
     return report_id
 
 
+def write_profile(report_id: str) -> None:
+    """Save the run profile next to the report JSON (and as Prometheus text if configured)."""
+    path = REPORTS_OUTPUT_DIR / f"{report_id}.profile.json"
+    prometheus_path = Path(PROFILE_PROMETHEUS_PATH.replace("{report_id}", report_id)) if PROFILE_PROMETHEUS_PATH else None
+    try:
+        profiler.write(path, prometheus_path)
+    except OSError as e:
+        log.warning(f"Could not write run profile: {e}")
+        return
+    log.info(f"Run profile: {path}")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run fortnightly narrative detection pipeline")
     parser.add_argument("--start", type=str, help="Period start (YYYY-MM-DD)")
     parser.add_argument("--end", type=str, help="Period end (YYYY-MM-DD)")
+    parser.add_argument("--resume", type=str, metavar="REPORT_ID",
+                        help="Continue a previous report from its stage checkpoints")
+    parser.add_argument("--from-step", type=str, metavar="STEP",
+                        help=f"With --resume, rerun this step and the steps depending on it "
+                             f"(1-{len(STEP_NAMES)} or {'/'.join(STEP_NAMES)})")
+    parser.add_argument("--incremental", action=argparse.BooleanOptionalAction, default=INCREMENTAL_NARRATIVES,
+                        help="Carry the previous report's narratives forward (default: INCREMENTAL_NARRATIVES)")
+    parser.add_argument("--stream", action=argparse.BooleanOptionalAction, default=STREAM_INGEST,
+                        help="Stream signals through scoring, keeping only the top K (default: STREAM_INGEST)")
     args = parser.parse_args()
 
+    if args.from_step and not args.resume:
+        parser.error("--from-step requires --resume")
+    if args.resume and (args.start or args.end):
+        parser.error("--resume takes the period from the checkpoint; drop --start/--end")
+    try:
+        from_step = parse_step(args.from_step) if args.from_step else None
+    except ValueError as e:
+        parser.error(str(e))
+
     start = datetime.fromisoformat(args.start).replace(tzinfo=timezone.utc) if args.start else None
     end = datetime.fromisoformat(args.end).replace(tzinfo=timezone.utc) if args.end else None
 
-    run_pipeline(start, end)
+    run_pipeline(start, end, resume=args.resume, from_step=from_step, incremental=args.incremental,
+                 stream=args.stream)
@@ -0,0 +1,183 @@
+"""
+Dependency-graph scheduler for the fortnight pipeline.
+
+Every Step names the steps whose outputs it consumes; a step starts as soon
+as all of them are available, so independent work overlaps (investigations
+run while candidates are clustered and the corpus loads, entities are
+persisted while ideas are generated). Steps run on a small thread pool: the
+expensive parts are network, database and LLM waits or numpy, which release
+the GIL.
+
+After a run the critical path (the chain of dependent steps that determined
+the wall time) is logged; shortening anything off that path does not make the
+run faster.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any, Callable, Iterable
+
+log = logging.getLogger("pipeline")
+
+
+class Step:
+    """
+    One pipeline stage. `fn` receives {input step name: output} and returns
+    this step's output. Steps with checkpoint=False (e.g. loading fixtures) are
+    never saved and run again whenever a step that needs them runs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        inputs: Iterable[str],
+        fn: Callable[[dict[str, Any]], Any],
+        checkpoint: bool = True,
+    ):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.fn = fn
+        self.checkpoint = checkpoint
+
+
+class StepGraph:
+    """A validated DAG of steps, kept in declaration order (which must be topological)."""
+
+    def __init__(self, steps: Iterable[Step]):
+        self.steps: dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate step {step.name!r}")
+            for name in step.inputs:
+                if name not in self.steps:
+                    raise ValueError(f"Step {step.name!r} depends on {name!r}, which is not declared before it")
+            self.steps[step.name] = step
+        # Filled by run(): {step: (start_s, end_s)} and the critical path
+        self.timings: dict[str, tuple[float, float]] = {}
+        self.critical: list[dict] = []
+
+    def descendants(self, name: str) -> set[str]:
+        """`name` and every step that (transitively) consumes its output."""
+        found = {name}
+        for step in self.steps.values():  # declaration order is topological
+            if found.intersection(step.inputs):
+                found.add(step.name)
+        return found
+
+    def plan(self, done: set[str]) -> list[str]:
+        """
+        Steps to execute given the checkpointed steps in `done`: every other
+        checkpointed step, plus the uncheckpointed steps those need.
+        """
+        needed = {name for name, step in self.steps.items() if step.checkpoint and name not in done}
+        for step in reversed(self.steps.values()):
+            if step.name in needed:
+                needed.update(i for i in step.inputs if not self.steps[i].checkpoint or i not in done)
+        return [name for name in self.steps if name in needed]
+
+    def run(
+        self,
+        done: set[str],
+        load: Callable[[str], Any],
+        save: Callable[[str, Any], None],
+        stage: Callable[[str], AbstractContextManager] = lambda name: nullcontext(),
+        max_workers: int = 4,
+    ) -> dict[str, Any]:
+        """
+        Execute plan(done): outputs of completed steps come from `load`, every
+        executed checkpointed step's output goes to `save`, and each step runs
+        inside `stage(name)`. Returns all outputs. On a failure no new steps
+        start; running ones finish (and are saved) before the error is re-raised.
+        """
+        order = self.plan(done)
+        to_run = set(order)
+        outputs: dict[str, Any] = {}
+        waiting = {name: {i for i in self.steps[name].inputs if i in to_run} for name in order}
+        timings: dict[str, tuple[float, float]] = {}
+        lock = threading.Lock()
+        t0 = time.perf_counter()
+
+        def execute(step: Step, inputs: dict[str, Any]) -> Any:
+            start = time.perf_counter()
+            try:
+                with stage(step.name):
+                    output = step.fn(inputs)
+                    if step.checkpoint:
+                        save(step.name, output)
+                return output
+            finally:
+                with lock:
+                    timings[step.name] = (start - t0, time.perf_counter() - t0)
+
+        def inputs_of(step: Step) -> dict[str, Any]:
+            for name in step.inputs:
+                if name not in outputs:
+                    outputs[name] = load(name)  # completed in an earlier (resumed) run
+            return {name: outputs[name] for name in step.inputs}
+
+        error: BaseException | None = None
+        running: dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="stage") as pool:
+            def submit_ready() -> None:
+                for name in order:
+                    if name in to_run and not waiting[name]:
+                        to_run.discard(name)
+                        step = self.steps[name]
+                        running[pool.submit(execute, step, inputs_of(step))] = name
+
+            submit_ready()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        if error is None:
+                            error = future.exception()
+                            log.error(f"  Step {name} failed; waiting for {len(running)} running step(s)")
+                        continue
+                    outputs[name] = future.result()
+                    for deps in waiting.values():
+                        deps.discard(name)
+                if error is None:
+                    submit_ready()
+
+        self.timings = timings
+        self.critical = self.log_critical_path(timings)
+        if error is not None:
+            raise error
+        return outputs
+
+    def critical_path(self, timings: dict[str, tuple[float, float]]) -> list[str]:
+        """
+        Steps that determined the wall time: from the step that finished last,
+        repeatedly follow the executed input that finished last (the one it was
+        waiting for). Inputs loaded from checkpoints do not appear.
+        """
+        if not timings:
+            return []
+        path = [max(timings, key=lambda n: timings[n][1])]
+        while True:
+            inputs = [i for i in self.steps[path[-1]].inputs if i in timings]
+            if not inputs:
+                return path[::-1]
+            path.append(max(inputs, key=lambda n: timings[n][1]))
+
+    def log_critical_path(self, timings: dict[str, tuple[float, float]]) -> list[dict]:
+        """Log the critical path and return it as [{step, start_s, end_s, wall_s}]."""
+        path = self.critical_path(timings)
+        if not path:
+            return []
+        wall = max(end for _, end in timings.values())
+        on_path = sum(timings[n][1] - timings[n][0] for n in path)
+        log.info(
+            f"Critical path: {on_path:.2f}s of {wall:.2f}s wall — "
+            + " → ".join(f"{n} {timings[n][1] - timings[n][0]:.2f}s" for n in path)
+        )
+        return [
+            {"step": n, "start_s": round(timings[n][0], 6), "end_s": round(timings[n][1], 6),
+             "wall_s": round(timings[n][1] - timings[n][0], 6)}
+            for n in path
+        ]
@@ -1,73 +1,258 @@
-"""Signal scoring: z-score computation, momentum, novelty, and quality scoring."""
+"""Signal scoring: z-score computation, momentum, novelty, and quality scoring.
+
+The batch path (`signals_to_columns` + `score_columns`) scores every signal in
+one vectorized pass over column arrays. The per-signal functions below are thin
+wrappers over the same array kernels, so both paths return identical values.
+"""
 
-import math
 from datetime import datetime, timezone
+import numpy as np
 from config import (
     SCORING_WEIGHTS, NOVELTY_BONUS_DAYS, NOVELTY_BONUS_MULTIPLIER,
     QUALITY_PENALTY,
 )
 
+# ───── Feature → (current column, baseline column), grouped by source ─────
+FEATURE_COLUMNS: dict[str, dict[str, tuple[str, str]]] = {
+    "onchain": {
+        "z_tx_count": ("tx_count", "tx_count_baseline"),
+        "z_unique_wallets": ("unique_wallets", "unique_wallets_baseline"),
+        "z_new_wallet_share": ("new_wallet_share", "new_wallet_share_baseline"),
+        "z_retention": ("retention_7d", "retention_7d_baseline"),
+    },
+    "dev": {
+        "z_commits": ("commits", "commits_baseline"),
+        "z_stars_delta": ("stars_delta", "stars_delta_baseline"),
+        "z_new_contributors": ("new_contributors", "new_contributors_baseline"),
+        "z_releases": ("releases", "releases_baseline"),
+    },
+    "social": {
+        "z_mentions_delta": ("mentions_count", "mentions_count_baseline"),
+        "z_unique_authors": ("unique_authors", "unique_authors_baseline"),
+        "z_engagement_delta": ("engagement_score", "engagement_score_baseline"),
+    },
+}
+
+_US_PER_DAY = 86_400_000_000
+
+
+# ═══════════════════════════════════════
+# Array kernels
+# ═══════════════════════════════════════
+
+def z_score_array(current, baseline, epsilon: float = 1e-6) -> np.ndarray:
+    """Vectorized `z_score` over aligned current/baseline arrays."""
+    current = np.asarray(current, dtype=np.float64)
+    baseline = np.asarray(baseline, dtype=np.float64)
+    tiny = baseline < epsilon
+    safe_baseline = np.where(tiny, 1.0, baseline)
+    return np.where(
+        tiny,
+        np.minimum(current / epsilon, 10.0),  # cap extreme values
+        (current - baseline) / safe_baseline,
+    )
+
+
+def source_features_array(source: str, columns: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Compute z-score arrays for every feature of one signal source."""
+    return {
+        feature: z_score_array(columns[cur], columns[base])
+        for feature, (cur, base) in FEATURE_COLUMNS[source].items()
+    }
+
+
+def momentum_array(
+    features: dict[str, np.ndarray],
+    present: dict[str, np.ndarray] | None = None,
+) -> np.ndarray:
+    """Vectorized `compute_momentum`. `present` masks rows lacking a feature."""
+    n = len(next(iter(features.values()))) if features else 0
+    score = np.zeros(n, dtype=np.float64)
+    # Accumulate in SCORING_WEIGHTS order so sums match the scalar loop bit for bit
+    for category, weights in SCORING_WEIGHTS.items():
+        for key, weight in weights.items():
+            if key not in features:
+                continue
+            # Clamp z-scores to [-5, 5] to prevent extreme outliers
+            term = np.clip(features[key], -5.0, 5.0) * weight
+            if present is not None and key in present:
+                term = np.where(present[key], term, 0.0)
+            score = score + term
+    return score
+
+
+def novelty_array(first_seen_us, now: datetime | None = None) -> np.ndarray:
+    """Vectorized `compute_novelty` over first-seen UTC epoch microseconds."""
+    now = now or datetime.now(timezone.utc)
+    now_us = _epoch_us(now)
+    # Floor division matches timedelta.days, including negative ages
+    age_days = np.floor_divide(now_us - np.asarray(first_seen_us, dtype=np.int64), _US_PER_DAY)
+    # Linear decay: full bonus at day 0, zero at NOVELTY_BONUS_DAYS
+    bonus = NOVELTY_BONUS_MULTIPLIER * (1.0 - age_days / NOVELTY_BONUS_DAYS)
+    return np.where(age_days <= NOVELTY_BONUS_DAYS, bonus, 0.0)
+
+
+def quality_penalty_array(
+    z_new_wallet_share,
+    z_retention,
+    hype_count,
+    snippet_count,
+) -> np.ndarray:
+    """Vectorized `compute_quality_penalty` from features and snippet class counts."""
+    nws = np.asarray(z_new_wallet_share, dtype=np.float64)
+    ret = np.asarray(z_retention, dtype=np.float64)
+    hype = np.asarray(hype_count, dtype=np.int64)
+    total = np.asarray(snippet_count, dtype=np.int64)
+    multiplier = QUALITY_PENALTY["penalty_multiplier"]
+
+    penalty = np.ones(len(nws), dtype=np.float64)
+    # High new wallet influx + poor retention = potential airdrop farming
+    penalty = np.where((nws > 2.0) & (ret < 0.0), penalty * multiplier, penalty)
+
+    hype_ratio = hype / np.where(total > 0, total, 1)
+    hyped = (total > 0) & (hype_ratio > QUALITY_PENALTY["single_author_hype_ratio"])
+    return np.where(hyped, penalty * multiplier, penalty)
+
+
+def total_score_array(momentum, novelty, quality_penalty) -> np.ndarray:
+    """Vectorized `compute_total_score`."""
+    base = np.asarray(momentum, dtype=np.float64) + np.asarray(novelty, dtype=np.float64)
+    return np.maximum(0.0, base * np.asarray(quality_penalty, dtype=np.float64))
+
+
+def normalize_scores_array(scores, bounds: tuple[float, float] | None = None) -> np.ndarray:
+    """
+    Vectorized `normalize_scores`. `bounds` = (min, max) of the full population
+    when `scores` is only part of it (e.g. the top K of a streamed run).
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if scores.size == 0:
+        return scores
+    min_s, max_s = bounds if bounds is not None else (scores.min(), scores.max())
+    rng = max_s - min_s
+    if rng < 1e-8:
+        return np.full(scores.shape, 0.5)
+    return (scores - min_s) / rng
+
+
+# ═══════════════════════════════════════
+# Batch scoring
+# ═══════════════════════════════════════
+
+def signals_to_columns(signals: list[dict]) -> dict[str, np.ndarray]:
+    """
+    Pivot merged signals ({key, first_seen, onchain, dev, social}) into column arrays.
+
+    A source only counts as present for a signal when all of its metric columns are
+    available; absent sources get zero-filled columns and a False `has_<source>` mask.
+    """
+    n = len(signals)
+    columns: dict[str, np.ndarray] = {}
+
+    for source, feature_cols in FEATURE_COLUMNS.items():
+        names = [name for pair in feature_cols.values() for name in pair]
+        data = np.zeros((len(names), n), dtype=np.float64)
+        has = np.zeros(n, dtype=bool)
+        for i, sig in enumerate(signals):
+            src = sig.get(source) or {}
+            if all(name in src for name in names):
+                has[i] = True
+                data[:, i] = [src[name] for name in names]
+        columns[f"has_{source}"] = has
+        for row, name in enumerate(names):
+            columns[name] = data[row]
+
+    now_iso = datetime.now(timezone.utc).isoformat()
+    columns["first_seen_us"] = np.array(
+        [_epoch_us(_parse_first_seen(sig.get("first_seen", now_iso))) for sig in signals],
+        dtype=np.int64,
+    )
+
+    snippets = [sig.get("social", {}).get("snippets") or [] for sig in signals]
+    columns["hype_count"] = np.array(
+        [sum(1 for s in snips if s.get("class") == "hype") for snips in snippets], dtype=np.int64,
+    )
+    columns["snippet_count"] = np.array([len(snips) for snips in snippets], dtype=np.int64)
+    return columns
+
+
+def score_columns(columns: dict[str, np.ndarray], now: datetime | None = None) -> dict[str, np.ndarray]:
+    """
+    Score column arrays produced by `signals_to_columns` in one vectorized pass.
+
+    Returns per-feature z-score arrays plus "momentum", "novelty", "quality" and
+    "total_score" arrays, all aligned with the input rows.
+    """
+    features: dict[str, np.ndarray] = {}
+    present: dict[str, np.ndarray] = {}
+    for source in FEATURE_COLUMNS:
+        has = columns[f"has_{source}"]
+        for feature, values in source_features_array(source, columns).items():
+            features[feature] = values
+            present[feature] = has
+
+    momentum = momentum_array(features, present)
+    novelty = novelty_array(columns["first_seen_us"], now)
+    quality = quality_penalty_array(
+        np.where(present["z_new_wallet_share"], features["z_new_wallet_share"], 0.0),
+        np.where(present["z_retention"], features["z_retention"], 0.0),
+        columns["hype_count"],
+        columns["snippet_count"],
+    )
+    total = total_score_array(momentum, novelty, quality)
+
+    return {
+        **features,
+        **{f"has_{source}": columns[f"has_{source}"] for source in FEATURE_COLUMNS},
+        "momentum": momentum,
+        "novelty": novelty,
+        "quality": quality,
+        "total_score": total,
+    }
+
+
+# ═══════════════════════════════════════
+# Scalar API (thin wrappers over the array kernels)
+# ═══════════════════════════════════════
 
 def z_score(current: float, baseline: float, epsilon: float = 1e-6) -> float:
     """Compute a simple z-like ratio score: (current - baseline) / max(baseline, epsilon)."""
-    if baseline < epsilon:
-        return min(current / epsilon, 10.0)  # cap extreme values
-    return (current - baseline) / baseline
+    return float(z_score_array([current], [baseline], epsilon)[0])
+
+
+def _source_features(source: str, signal: dict) -> dict:
+    columns = {
+        name: np.array([signal[name]], dtype=np.float64)
+        for pair in FEATURE_COLUMNS[source].values() for name in pair
+    }
+    return {k: float(v[0]) for k, v in source_features_array(source, columns).items()}
 
 
 def compute_onchain_features(signal: dict) -> dict:
     """Compute z-scores for onchain metrics."""
-    return {
-        "z_tx_count": z_score(signal["tx_count"], signal["tx_count_baseline"]),
-        "z_unique_wallets": z_score(signal["unique_wallets"], signal["unique_wallets_baseline"]),
-        "z_new_wallet_share": z_score(signal["new_wallet_share"], signal["new_wallet_share_baseline"]),
-        "z_retention": z_score(signal["retention_7d"], signal["retention_7d_baseline"]),
-    }
+    return _source_features("onchain", signal)
 
 
 def compute_dev_features(signal: dict) -> dict:
     """Compute z-scores for dev metrics."""
-    return {
-        "z_commits": z_score(signal["commits"], signal["commits_baseline"]),
-        "z_stars_delta": z_score(signal["stars_delta"], signal["stars_delta_baseline"]),
-        "z_new_contributors": z_score(signal["new_contributors"], signal["new_contributors_baseline"]),
-        "z_releases": z_score(signal["releases"], signal["releases_baseline"]),
-    }
+    return _source_features("dev", signal)
 
 
 def compute_social_features(signal: dict) -> dict:
     """Compute z-scores for social metrics."""
-    return {
-        "z_mentions_delta": z_score(signal["mentions_count"], signal["mentions_count_baseline"]),
-        "z_unique_authors": z_score(signal["unique_authors"], signal["unique_authors_baseline"]),
-        "z_engagement_delta": z_score(signal["engagement_score"], signal["engagement_score_baseline"]),
-    }
+    return _source_features("social", signal)
 
 
 def compute_momentum(features: dict) -> float:
     """Weighted sum of all z-score features using SCORING_WEIGHTS."""
-    score = 0.0
-    for category, weights in SCORING_WEIGHTS.items():
-        for key, weight in weights.items():
-            if key in features:
-                # Clamp z-scores to [-5, 5] to prevent extreme outliers
-                val = max(-5.0, min(5.0, features[key]))
-                score += val * weight
-    return score
+    if not features:
+        return 0.0
+    return float(momentum_array({k: np.array([v], dtype=np.float64) for k, v in features.items()})[0])
 
 
 def compute_novelty(first_seen: datetime | str) -> float:
     """Novelty bonus if entity was first seen within NOVELTY_BONUS_DAYS."""
-    if isinstance(first_seen, str):
-        first_seen = datetime.fromisoformat(first_seen.replace("Z", "+00:00"))
-    if first_seen.tzinfo is None:
-        first_seen = first_seen.replace(tzinfo=timezone.utc)
-
-    age_days = (datetime.now(timezone.utc) - first_seen).days
-    if age_days <= NOVELTY_BONUS_DAYS:
-        # Linear decay: full bonus at day 0, zero at NOVELTY_BONUS_DAYS
-        return NOVELTY_BONUS_MULTIPLIER * (1.0 - age_days / NOVELTY_BONUS_DAYS)
-    return 0.0
+    return float(novelty_array([_epoch_us(_parse_first_seen(first_seen))])[0])
 
 
 def compute_quality_penalty(features: dict, social_snippets: list[dict] | None = None) -> float:
@@ -75,38 +260,37 @@ def compute_quality_penalty(features: dict, social_snippets: list[dict] | None =
     Detect spam/noise patterns and return a penalty multiplier (0.0 to 1.0).
     1.0 = no penalty, lower = more penalty.
     """
-    penalty = 1.0
-
-    # Check for single-wallet spike (if new_wallet_share is very high and retention is low)
-    nws = features.get("z_new_wallet_share", 0)
-    ret = features.get("z_retention", 0)
-    if nws > 2.0 and ret < 0.0:
-        # High new wallet influx + poor retention = potential airdrop farming
-        penalty *= QUALITY_PENALTY["penalty_multiplier"]
-
-    # Check for single-author hype in social
-    if social_snippets:
-        hype_count = sum(1 for s in social_snippets if s.get("class") == "hype")
-        total = len(social_snippets)
-        if total > 0 and hype_count / total > QUALITY_PENALTY["single_author_hype_ratio"]:
-            penalty *= QUALITY_PENALTY["penalty_multiplier"]
-
-    return penalty
+    snippets = social_snippets or []
+    hype_count = sum(1 for s in snippets if s.get("class") == "hype")
+    return float(quality_penalty_array(
+        [features.get("z_new_wallet_share", 0)],
+        [features.get("z_retention", 0)],
+        [hype_count],
+        [len(snippets)],
+    )[0])
 
 
 def compute_total_score(momentum: float, novelty: float, quality_penalty: float) -> float:
     """Final composite score."""
-    base = momentum + novelty
-    return max(0.0, base * quality_penalty)
+    return float(total_score_array([momentum], [novelty], [quality_penalty])[0])
 
 
 def normalize_scores(scores: list[float]) -> list[float]:
     """Normalize a list of scores to [0, 1] range."""
-    if not scores:
-        return []
-    min_s = min(scores)
-    max_s = max(scores)
-    rng = max_s - min_s
-    if rng < 1e-8:
-        return [0.5] * len(scores)
-    return [(s - min_s) / rng for s in scores]
+    return normalize_scores_array(scores).tolist()
+
+
+# ───── Helpers ─────
+
+def _parse_first_seen(first_seen: datetime | str) -> datetime:
+    if isinstance(first_seen, str):
+        first_seen = datetime.fromisoformat(first_seen.replace("Z", "+00:00"))
+    if first_seen.tzinfo is None:
+        first_seen = first_seen.replace(tzinfo=timezone.utc)
+    return first_seen
+
+
+def _epoch_us(ts: datetime) -> int:
+    """Exact UTC epoch microseconds (avoids float rounding of timestamp())."""
+    delta = ts - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
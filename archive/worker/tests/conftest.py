@@ -0,0 +1,6 @@
+"""Worker modules import each other as top-level modules; put the worker dir on sys.path."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
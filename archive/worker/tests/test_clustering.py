@@ -0,0 +1,39 @@
+"""Backend selection for the exact and scalable clustering paths."""
+
+import numpy as np
+import pytest
+
+import clustering
+from clustering import cluster_candidates, cluster_scalable
+
+
+def _two_topics(n: int = 20) -> list[list[float]]:
+    rng = np.random.default_rng(0)
+    centres = np.eye(8)[:2]
+    return [(centres[i % 2] + rng.normal(0, 0.01, 8)).tolist() for i in range(n)]
+
+
+@pytest.mark.parametrize("mode", ["exact", "scalable"])
+def test_dbscan_backend_groups_topics(mode):
+    X = _two_topics()
+    names = [f"c{i}" for i in range(len(X))]
+    groups = cluster_candidates(X, names, mode=mode, backend="dbscan")
+    assert sorted(sorted(g["member_labels"]) for g in groups) == sorted([
+        sorted(names[0::2]), sorted(names[1::2]),
+    ])
+
+
+def test_scalable_returns_one_label_per_row():
+    labels = cluster_scalable(_two_topics(), backend="dbscan")
+    assert len(labels) == 20 and len(set(labels[labels >= 0])) == 2
+
+
+def test_rejects_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown clustering backend"):
+        cluster_scalable(_two_topics(), backend="kmeans")
+
+
+@pytest.mark.skipif(clustering.HAS_HDBSCAN, reason="hdbscan is installed")
+def test_hdbscan_backend_requires_hdbscan():
+    with pytest.raises(RuntimeError, match="requires hdbscan"):
+        cluster_candidates(_two_topics(), [str(i) for i in range(20)], mode="exact", backend="hdbscan")
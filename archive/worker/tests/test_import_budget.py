@@ -0,0 +1,37 @@
+"""Cold-start import budget for the worker entry points (see benchmarks/import_budget.py)."""
+
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "import_budget", Path(__file__).resolve().parents[1] / "benchmarks" / "import_budget.py",
+)
+import_budget = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(import_budget)
+
+# Wall-clock timing is noisy on shared CI machines: only checked when a budget is set
+BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "0"))
+REPEAT = 3 if BUDGET_MS else 1
+
+
+@pytest.fixture(scope="module", params=["run_fortnight", "batch"])
+def runs(request):
+    return request.param, [import_budget.measure(request.param) for _ in range(REPEAT)]
+
+
+def test_no_eager_stage_dependencies(runs):
+    module, results = runs
+    eager = sorted(set(import_budget.LAZY_PACKAGES) & set.union(*(packages for _, _, packages in results)))
+    assert not eager, f"import {module} loaded {', '.join(eager)} eagerly"
+
+
+@pytest.mark.skipif(not BUDGET_MS, reason="set IMPORT_BUDGET_MS to check import time")
+def test_within_budget(runs):
+    # Best of REPEAT: the first run may compile .pyc files
+    module, results = runs
+    total_ms, direct, _ = min(results, key=lambda r: r[0])
+    slowest = ", ".join(f"{name} {ms:.0f} ms" for name, ms in sorted(direct.items(), key=lambda kv: -kv[1])[:5])
+    assert total_ms <= BUDGET_MS, f"import {module}: {total_ms:.1f} ms > {BUDGET_MS:.0f} ms ({slowest})"
@@ -0,0 +1,94 @@
+"""Signal ingestion: per-source dumps and incremental JSON array decoding."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+import ingest
+
+# The repository's fixtures (config.FIXTURES_DIR is relative to the deployed worker)
+DEMO_SIGNALS = Path(__file__).resolve().parents[3] / "fixtures" / "demo_signals.json"
+
+FORMATS = [
+    pytest.param("parquet", marks=pytest.mark.skipif(not ingest.HAS_PYARROW, reason="needs pyarrow")),
+    "ndjson",
+]
+
+
+def _demo_signals() -> list[dict]:
+    return list(ingest.iter_signals(DEMO_SIGNALS))
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_source_dir_round_trip(tmp_path, fmt):
+    signals = _demo_signals()
+    ingest.write_source_dir(signals, tmp_path, fmt)
+    assert list(ingest.iter_signals(tmp_path)) == signals
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_source_dir_with_empty_source(tmp_path, fmt):
+    signals = _demo_signals()
+    for sig in signals:
+        sig["social"] = {}
+    counts = ingest.write_source_dir(signals, tmp_path, fmt)
+    assert counts["social"] == 0
+    assert list(ingest.iter_signals(tmp_path)) == signals
+
+
+# ───── Incremental JSON array decoding ─────
+
+ARRAYS = [
+    "[]",
+    " [ ] ",
+    "[1, 22, 333, -4.5e-3, true, false, null]",
+    '["a", "]", ",", "\\"quoted\\" [x]", "\\u00e9\\ud83d\\ude00", ""]',
+    '[{"key": "a", "nested": {"list": [1, [2, [3]]], "s": "}{"}}, {"key": "b"}]',
+    '[\n  {"key": "x", "n": 12345678901234567890},\n\n  [], {}, "tail"\n]\n',
+    "[12345, 678]",
+]
+
+
+class _Chunks:
+    """File-like text reader handing out at most `size` characters per read."""
+
+    def __init__(self, text: str, size: int):
+        self.text, self.size, self.pos = text, size, 0
+
+    def read(self, n: int) -> str:
+        n = min(n, self.size)
+        out = self.text[self.pos:self.pos + n]
+        self.pos += len(out)
+        return out
+
+
+@pytest.mark.parametrize("text", ARRAYS)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 16])
+def test_iter_array_items_matches_json_load(text, chunk_size):
+    body = text.lstrip()[1:]
+    items = list(ingest._iter_array_items(_Chunks(body, chunk_size), "", chunk_size))
+    assert items == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+def test_iter_array_items_numbers_across_chunks(chunk_size):
+    text = "[-4.5e-3, 12345, 1.0E+2]"
+    items = list(ingest._iter_array_items(io.StringIO(text[1:]), "", chunk_size))
+    assert items == [-4.5e-3, 12345, 100.0]
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+def test_iter_json_streams_array_file(tmp_path, chunk_size):
+    signals = _demo_signals()
+    path = tmp_path / "signals.json"
+    path.write_text(json.dumps(signals, indent=2, ensure_ascii=False), encoding="utf-8")
+    with open(path, encoding="utf-8") as f:
+        expected = json.load(f)
+    assert list(ingest.iter_json(path, chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize("text", ["[1, 2", '[{"a": 1}', '["abc', "[tru"])
+def test_iter_array_items_rejects_truncated_input(text):
+    with pytest.raises(ValueError):
+        list(ingest._iter_array_items(_Chunks(text[1:], 1), "", 1))
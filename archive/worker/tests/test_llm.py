@@ -0,0 +1,76 @@
+"""LLM response cache: only complete, parseable responses are stored."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import llm
+from tools.cache import DiskCache
+
+
+class StubClient:
+    """Stands in for anthropic.Anthropic: returns queued (text, stop_reason) replies in order."""
+
+    def __init__(self, *replies: tuple[str, str]):
+        self.replies = list(replies)
+        self.calls = 0
+        self.messages = self
+
+    def create(self, **kwargs):
+        text, stop_reason = self.replies[self.calls]
+        self.calls += 1
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], stop_reason=stop_reason, usage=None)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = DiskCache(tmp_path / "llm.sqlite3", 3600, 1 << 20)
+    monkeypatch.setattr(llm, "get_cache", lambda: cache)
+    yield cache
+    llm.set_client(None)
+
+
+def _use(client: StubClient) -> StubClient:
+    llm.set_client(client)
+    return client
+
+
+def test_parsed_response_is_cached(cache):
+    client = _use(StubClient(('{"a": 1}', "end_turn")))
+    assert llm.complete("s", "u", parse=json.loads) == {"a": 1}
+    assert llm.complete("s", "u", parse=json.loads) == {"a": 1}
+    assert client.calls == 1
+
+
+def test_unparseable_response_is_not_cached(cache):
+    client = _use(StubClient(("Sure! Here is the JSON:", "end_turn"), ('{"a": 1}', "end_turn")))
+    with pytest.raises(ValueError):
+        llm.complete("s", "u", parse=json.loads)
+    assert llm.complete("s", "u", parse=json.loads) == {"a": 1}
+    assert client.calls == 2
+
+
+def test_truncated_response_is_not_cached(cache):
+    client = _use(StubClient(('{"a": 1, "b": [', "max_tokens"), ('{"a": 1, "b": []}', "end_turn")))
+    assert llm.complete("s", "u") == '{"a": 1, "b": ['
+    assert llm.complete("s", "u") == '{"a": 1, "b": []}'
+    assert llm.complete("s", "u") == '{"a": 1, "b": []}'
+    assert client.calls == 2
+
+
+def test_bad_cache_entry_is_refetched(cache):
+    cache.put(llm.prompt_key(llm.LLM_MODEL, "s", "u", 2048), "llm", {"text": "not json"})
+    client = _use(StubClient(('[1, 2]', "end_turn")))
+    assert llm.complete("s", "u", parse=json.loads) == [1, 2]
+    assert client.calls == 1
+
+
+def test_llm_json_falls_back_without_caching(cache, monkeypatch):
+    import run_fortnight
+    monkeypatch.setattr(run_fortnight, "HAS_LLM", True)
+    client = _use(StubClient(("no json here", "end_turn"), ('```json\n{"title": "t"}\n```', "end_turn")))
+    assert run_fortnight._llm_json("s", "u") is None
+    assert run_fortnight._llm_json("s", "u") == {"title": "t"}
+    assert run_fortnight._llm_json("s", "u") == {"title": "t"}
+    assert client.calls == 2
@@ -0,0 +1,104 @@
+"""pgvector statements, checked against a scripted connection (no Postgres needed)."""
+
+import psycopg2.extras
+import pytest
+
+import ann
+import db
+
+
+class ScriptedPool:
+    """Records every statement; answers queries from `answers` (first matching SQL prefix wins)."""
+
+    def __init__(self, answers: dict[str, list] | None = None):
+        self.answers = answers or {}
+        self.sql: list[tuple[str, tuple | None]] = []
+
+    def getconn(self):
+        pool = self
+
+        class Cursor:
+            rows: list = []
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params=None):
+                sql = " ".join(sql.split())
+                pool.sql.append((sql, params))
+                self.rows = next((rows for prefix, rows in pool.answers.items() if sql.startswith(prefix)), [])
+
+            def fetchone(self):
+                return self.rows[0]
+
+            def fetchall(self):
+                return self.rows
+
+        class Conn:
+            closed = 0
+
+            def cursor(self):
+                return Cursor()
+
+            def commit(self):
+                pass
+
+            def rollback(self):
+                pass
+        return Conn()
+
+    def putconn(self, conn, close=False):
+        pass
+
+    def statements(self, prefix: str) -> list[str]:
+        return [sql for sql, _ in self.sql if sql.startswith(prefix)]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    def use(answers=None):
+        scripted = ScriptedPool(answers)
+        monkeypatch.setattr(db, "_get_pool", lambda: scripted)
+        return scripted
+    return use
+
+
+def test_ivfflat_index_not_built_on_empty_table(pool):
+    p = pool({"SELECT EXISTS": [(False,)]})
+    db.ensure_vector_schema("ivfflat")
+    assert p.statements("CREATE INDEX") == []
+
+
+def test_hnsw_index_built_up_front(pool):
+    p = pool({"SELECT to_regclass": [(False,)]})
+    db.ensure_vector_schema("hnsw")
+    assert len(p.statements("CREATE INDEX IF NOT EXISTS")) == 2
+    assert all("USING hnsw" in sql for sql in p.statements("CREATE INDEX"))
+
+
+def test_sync_rebuilds_ivfflat_after_loading(pool, monkeypatch):
+    p = pool({"SELECT EXISTS": [(True,)], "SELECT to_regclass": [(True,)]})
+    monkeypatch.setattr(psycopg2.extras, "execute_values", lambda cur, sql, values, **kw: cur.execute(sql))
+    ann.sync_pgvector({"a": [1.0, 0.0], "b": [0.0, 1.0]}, [], "ivfflat")
+    order = [sql.split()[0] for sql, _ in p.sql if sql.startswith(("INSERT INTO corpus_projects", "REINDEX"))]
+    assert order == ["INSERT", "REINDEX"]
+    assert p.statements("REINDEX") == ["REINDEX INDEX corpus_projects_embedding_ivfflat_idx"]
+
+
+def test_nearest_projects_skips_empty_and_null(pool):
+    p = pool({"SELECT q.i": [(1, "p1", "u1", 0.9), (1, "p2", "u2", None), (2, "p3", "u3", 0.5)]})
+    found = db.nearest_projects_batch([[], None, [0.0, 0.0], [1.0, 0.0], [0.0, 2.0]], k=2)
+    assert found == [[], [], [], [{"name": "p1", "url": "u1", "similarity": 0.9}],
+                     [{"name": "p3", "url": "u3", "similarity": 0.5}]]
+    (_, params), = [(sql, params) for sql, params in p.sql if sql.startswith("SELECT q.i")]
+    assert params[0] == ["[1.0,0.0]", "[0.0,2.0]"]
+
+
+def test_nearest_projects_without_direction_sends_nothing(pool):
+    p = pool()
+    assert db.nearest_projects([]) == []
+    assert db.nearest_projects([0.0, 0.0]) == []
+    assert p.sql == []
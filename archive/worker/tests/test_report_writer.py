@@ -0,0 +1,67 @@
+"""Report export: action packs are committed and aborted together with their report."""
+
+import gzip
+import json
+
+import pytest
+
+from report_writer import ReportWriter
+
+HEADER = {"id": "r1", "period_start": "2025-06-01", "period_end": "2025-06-15"}
+
+
+def _narrative(i: int) -> dict:
+    return {
+        "title": f"Narrative {i}",
+        "ideas": [
+            {"id": f"idea-{i}-{j}", "title": f"Idea {j}", "action_pack": {"spec.md": "# spec " * 50, "deps.json": "{}"}}
+            for j in range(2)
+        ],
+    }
+
+
+def _files(root) -> list[str]:
+    return sorted(p.relative_to(root).as_posix() for p in root.rglob("*") if p.is_file())
+
+
+def test_export_writes_report_and_packs(tmp_path):
+    with ReportWriter(tmp_path, "r1", HEADER, compression=["gzip"]) as writer:
+        for i in range(2):
+            writer.write_narrative(_narrative(i))
+
+    report = json.loads((tmp_path / "r1.json").read_bytes())
+    assert json.loads(gzip.decompress((tmp_path / "r1.json.gz").read_bytes())) == report
+    refs = [idea["action_pack"] for n in report["narratives"] for idea in n["ideas"]]
+    assert len(refs) == 4 and writer.ideas == 4
+    for ref in refs:
+        pack = json.loads((tmp_path / ref["path"]).read_bytes())
+        assert sorted(pack) == ref["files"] == ["deps.json", "spec.md"]
+    assert not [name for name in _files(tmp_path) if name.endswith(".tmp")]
+
+
+def test_aborted_export_leaves_no_files(tmp_path):
+    with pytest.raises(RuntimeError):
+        with ReportWriter(tmp_path, "r1", HEADER, compression=["gzip"]) as writer:
+            writer.write_narrative(_narrative(0))
+            writer.write_narrative(_narrative(1))
+            raise RuntimeError("export failed")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_packs_appear_only_when_report_closes(tmp_path):
+    writer = ReportWriter(tmp_path, "r1", HEADER)
+    writer.write_narrative(_narrative(0))
+    assert [name for name in _files(tmp_path) if not name.startswith(".") and "/." not in name] == []
+    writer.close()
+    assert _files(tmp_path) == ["r1.json", "r1/action-packs/idea-0-0.json", "r1/action-packs/idea-0-1.json"]
+
+
+def test_abort_keeps_an_earlier_export(tmp_path):
+    with ReportWriter(tmp_path, "r1", HEADER) as writer:
+        writer.write_narrative(_narrative(0))
+    before = {name: (tmp_path / name).read_bytes() for name in _files(tmp_path)}
+    with pytest.raises(RuntimeError):
+        with ReportWriter(tmp_path, "r1", HEADER) as writer:
+            writer.write_narrative(_narrative(5))
+            raise RuntimeError("export failed")
+    assert {name: (tmp_path / name).read_bytes() for name in _files(tmp_path)} == before
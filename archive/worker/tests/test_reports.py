@@ -0,0 +1,123 @@
+"""Report rows against the `reports` unique key declared in the Prisma schema."""
+
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+import psycopg2.errors
+import pytest
+
+import batch
+import db
+
+SCHEMA = Path(__file__).resolve().parents[3] / "apps" / "web" / "prisma" / "schema.prisma"
+
+
+def _report_unique_key() -> tuple[str, ...]:
+    """Column names of the Report model's @@unique, as Postgres sees them."""
+    model = re.search(r"model Report \{(.*?)\n\}", SCHEMA.read_text(), re.S).group(1)
+    columns = {}
+    for field, rest in re.findall(r"^\s+(\w+)\s+\S+(.*)$", model, re.M):
+        mapped = re.search(r'@map\("(\w+)"\)', rest)
+        columns[field] = mapped.group(1) if mapped else field
+    fields = re.search(r"@@unique\(\[([^\]]*)\]\)", model).group(1)
+    return tuple(columns[f.strip()] for f in fields.split(","))
+
+
+class _ReportsTable:
+    """Just enough of Postgres to run INSERT INTO reports under the schema's unique key."""
+
+    def __init__(self):
+        self.key = _report_unique_key()
+        self.rows: dict[tuple, dict] = {}
+
+    def insert(self, sql: str, params: tuple) -> str | None:
+        columns = [c.strip() for c in sql[sql.index("(") + 1:sql.index(")")].split(",")]
+        row = dict(zip(columns, params))
+        row.setdefault("shard", "")  # column default
+        key = tuple(row[c] for c in self.key)
+        if key in self.rows:
+            target = re.search(r"ON CONFLICT \(([^)]*)\) DO UPDATE", sql)
+            if not target or tuple(c.strip() for c in target.group(1).split(",")) != self.key:
+                raise psycopg2.errors.UniqueViolation(f"duplicate key value violates unique constraint {self.key}")
+            self.rows[key].update({c: v for c, v in row.items() if c != "id"})
+        else:
+            self.rows[key] = row
+        return self.rows[key]["id"] if "RETURNING id" in sql else None
+
+
+class _Cursor:
+    def __init__(self, table: _ReportsTable):
+        self.table = table
+        self.result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        assert sql.startswith("INSERT INTO reports"), sql
+        self.result = self.table.insert(sql, params)
+
+    def fetchone(self):
+        return (self.result,)
+
+
+class _Pool:
+    def __init__(self, table: _ReportsTable):
+        self.table = table
+
+    def getconn(self):
+        table = self.table
+
+        class Conn:
+            closed = 0
+
+            def cursor(self):
+                return _Cursor(table)
+
+            def commit(self):
+                pass
+
+            def rollback(self):
+                pass
+        return Conn()
+
+    def putconn(self, conn, close=False):
+        pass
+
+
+@pytest.fixture
+def reports(monkeypatch):
+    table = _ReportsTable()
+    monkeypatch.setattr(db, "_get_pool", lambda: _Pool(table))
+    return table
+
+
+def _create(job: dict) -> str:
+    config_json = {"shard": job["shard"]} if job["shard"] else {}
+    return db.create_report(job["period_start"], job["period_end"], config_json, shard=job["shard"])
+
+
+def test_unique_key_includes_shard():
+    assert _report_unique_key() == ("period_start", "period_end", "shard")
+
+
+def test_shards_of_one_period_get_their_own_reports(reports):
+    period = (datetime(2025, 6, 1, tzinfo=timezone.utc), datetime(2025, 6, 15, tzinfo=timezone.utc))
+    chains = batch.plan_jobs([period], {"defi": Path("defi"), "depin": Path("depin"), None: None})
+    ids = [_create(job) for chain in chains for job in chain]
+    assert len(set(ids)) == 3
+    assert sorted(row["shard"] for row in reports.rows.values()) == ["", "defi", "depin"]
+
+
+def test_rerunning_a_period_reuses_its_report(reports):
+    start, end = datetime(2025, 6, 1, tzinfo=timezone.utc), datetime(2025, 6, 15, tzinfo=timezone.utc)
+    first = db.create_report(start, end, {"top_k": 20}, shard="defi")
+    reports.rows[(start, end, "defi")]["status"] = "failed"
+    again = db.create_report(start, end, {"top_k": 30}, shard="defi")
+    assert again == first
+    row = reports.rows[(start, end, "defi")]
+    assert row["status"] == "processing" and row["config_json"] == '{"top_k": 30}'
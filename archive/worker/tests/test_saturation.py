@@ -0,0 +1,37 @@
+"""Saturation checks on embeddings served as NumPy rows."""
+
+import numpy as np
+
+from clustering import CorpusIndex, compute_saturation
+from embedding_store import EmbeddingStore
+from tools import competitor_search
+
+
+def _store(n: int, dim: int = 16, seed: int = 0) -> EmbeddingStore:
+    rng = np.random.default_rng(seed)
+    return EmbeddingStore([f"p{i}" for i in range(n)], rng.normal(size=(n, dim)).astype(np.float32))
+
+
+def test_compute_saturation_with_store_row():
+    corpus = _store(20)
+    meta = {name: {"url": f"https://example.com/{name}"} for name in corpus}
+    idea = corpus["p3"]
+    assert isinstance(idea, np.ndarray)
+    for index in (corpus, CorpusIndex(corpus, meta)):
+        sat = compute_saturation(idea, index, meta)
+        assert sat["neighbors"][0]["name"] == "p3"
+        assert sat["neighbors"][0]["similarity"] == 1.0
+
+
+def test_competitor_search_with_store_row():
+    corpus = _store(20)
+    meta = {name: {"url": f"https://example.com/{name}"} for name in corpus}
+    result = competitor_search("idea", corpus["p7"], CorpusIndex(corpus, meta), meta)
+    assert "p7 (100% similar)" in result.output_summary
+
+
+def test_competitor_search_without_embeddings():
+    corpus = _store(5)
+    for idea, index in ((None, corpus), (np.zeros(0, dtype=np.float32), corpus), (corpus["p1"], None)):
+        result = competitor_search("idea", idea, index, {})
+        assert result.output_summary == "No corpus embeddings available for saturation check."
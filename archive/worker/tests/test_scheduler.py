@@ -0,0 +1,173 @@
+"""StepGraph planning, --from-step selection, concurrency and failure handling."""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+import run_fortnight
+from checkpoint import STEP_NAMES
+from scheduler import Step, StepGraph
+
+
+def _graph(calls: list[str] | None = None, fail: str | None = None) -> StepGraph:
+    """
+    load (not checkpointed) ─┬─> a ─> b ─> d
+                             └─> c ───────┘
+    """
+    def fn(name):
+        def run(inputs):
+            if calls is not None:
+                calls.append(name)
+            if name == fail:
+                raise RuntimeError(f"{name} failed")
+            return (name, sorted(inputs))
+        return run
+
+    return StepGraph([
+        Step("load", (), fn("load"), checkpoint=False),
+        Step("a", ("load",), fn("a")),
+        Step("b", ("a",), fn("b")),
+        Step("c", ("load",), fn("c")),
+        Step("d", ("b", "c"), fn("d")),
+    ])
+
+
+def _pipeline() -> StepGraph:
+    start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    end = datetime(2025, 6, 15, tzinfo=timezone.utc)
+    return run_fortnight.pipeline_graph("report", start, end, preloaded={})
+
+
+class Store:
+    """In-memory checkpoints."""
+
+    def __init__(self, saved: dict | None = None):
+        self.saved = dict(saved or {})
+        self.loaded: list[str] = []
+
+    def load(self, name):
+        self.loaded.append(name)
+        return self.saved[name]
+
+    def save(self, name, output):
+        self.saved[name] = output
+
+
+# ───── Validation ─────
+
+def test_rejects_undeclared_input():
+    with pytest.raises(ValueError, match="not declared before it"):
+        StepGraph([Step("b", ("a",), lambda r: None), Step("a", (), lambda r: None)])
+
+
+def test_rejects_duplicate_step():
+    with pytest.raises(ValueError, match="Duplicate"):
+        StepGraph([Step("a", (), lambda r: None), Step("a", (), lambda r: None)])
+
+
+# ───── plan() ─────
+
+def test_plan_fresh_run_runs_everything():
+    assert _graph().plan(set()) == ["load", "a", "b", "c", "d"]
+
+
+def test_plan_with_partial_checkpoints():
+    graph = _graph()
+    # a and c saved: b needs only a's checkpoint, so load is not needed
+    assert graph.plan({"a", "c"}) == ["b", "d"]
+    # c missing: it needs load again (never checkpointed)
+    assert graph.plan({"a", "b"}) == ["load", "c", "d"]
+    assert graph.plan({"a", "b", "c", "d"}) == []
+
+
+def test_pipeline_plan_after_crash_in_ideas():
+    done = set(STEP_NAMES[:STEP_NAMES.index("ideas")]) | {"persist_entities"}
+    assert _pipeline().plan(done) == ["embeddings", "corpus", "ideas", "persist", "export"]
+
+
+def test_resume_loads_checkpoints_and_saves_new_outputs():
+    calls: list[str] = []
+    store = Store({"a": "A", "c": "C"})
+    outputs = _graph(calls).run({"a", "c"}, store.load, store.save)
+    assert calls == ["b", "d"]
+    assert sorted(store.loaded) == ["a", "c"]
+    assert outputs["d"] == ("d", ["b", "c"])
+    assert store.saved["b"] == ("b", ["a"]) and "load" not in store.saved
+
+
+# ───── descendants() for --from-step ─────
+
+def test_descendants():
+    graph = _graph()
+    assert graph.descendants("a") == {"a", "b", "d"}
+    assert graph.descendants("c") == {"c", "d"}
+    assert graph.descendants("load") == {"load", "a", "b", "c", "d"}
+    assert graph.descendants("d") == {"d"}
+
+
+def test_pipeline_from_step():
+    graph = _pipeline()
+    assert graph.descendants("ideas") == {"ideas", "persist", "export"}
+    assert graph.descendants("persist_entities") == {"persist_entities", "persist", "export"}
+    assert graph.descendants("select") == set(STEP_NAMES) - {"ingest", "score"}
+    # --from-step 7 with everything checkpointed: ideas and what follows run again
+    done = set(STEP_NAMES) - graph.descendants(STEP_NAMES[6])
+    assert graph.plan(done) == ["embeddings", "corpus", "ideas", "persist", "export"]
+
+
+# ───── run(): concurrency and failures ─────
+
+def test_independent_steps_overlap():
+    both = threading.Barrier(2, timeout=5)
+
+    def meet(inputs):
+        both.wait()  # raises BrokenBarrierError unless the other step is running too
+        return True
+
+    graph = StepGraph([
+        Step("x", (), meet),
+        Step("y", (), meet),
+        Step("z", ("x", "y"), lambda r: r["x"] and r["y"]),
+    ])
+    store = Store()
+    assert graph.run(set(), store.load, store.save, max_workers=2)["z"] is True
+    assert [step["step"] for step in graph.critical][-1] == "z"
+
+
+def test_failure_stops_dependents_and_keeps_finished_work():
+    calls: list[str] = []
+    store = Store()
+    with pytest.raises(RuntimeError, match="a failed"):
+        _graph(calls, fail="a").run(set(), store.load, store.save, max_workers=1)
+    assert "b" not in calls and "d" not in calls
+    # c was already queued next to a, so it still completes and is saved
+    assert set(store.saved) == {"c"}
+    # A resumed run picks up from the steps that completed
+    calls.clear()
+    _graph(calls).run(set(store.saved), store.load, store.save)
+    assert calls == ["load", "a", "b", "d"]
+
+
+def test_failure_lets_running_steps_finish():
+    started = threading.Event()
+
+    def slow(inputs):
+        started.set()
+        time.sleep(0.2)  # still running when boom fails
+        return "slow"
+
+    def boom(inputs):
+        started.wait(5)
+        raise RuntimeError("boom")
+
+    graph = StepGraph([
+        Step("slow", (), slow),
+        Step("boom", (), boom),
+        Step("after", ("boom",), lambda r: "never"),
+    ])
+    store = Store()
+    with pytest.raises(RuntimeError, match="boom"):
+        graph.run(set(), store.load, store.save, max_workers=2)
+    assert store.saved == {"slow": "slow"}
@@ -0,0 +1,183 @@
+"""
+Scoring against the original per-signal formulas.
+
+The scalar compute_* functions now wrap the same array kernels as score_columns,
+so both are checked against an independent reference: the plain-Python scoring
+the vectorized path replaced, reproduced below. Results must match bit for bit.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from config import SCORING_WEIGHTS, NOVELTY_BONUS_DAYS, NOVELTY_BONUS_MULTIPLIER, QUALITY_PENALTY
+from scoring import (
+    FEATURE_COLUMNS, signals_to_columns, score_columns, normalize_scores_array,
+    compute_onchain_features, compute_dev_features, compute_social_features,
+    compute_momentum, compute_quality_penalty, compute_total_score, normalize_scores, z_score,
+)
+
+N_SIGNALS = 3000
+NOW = datetime(2025, 6, 15, 9, 30, tzinfo=timezone.utc)
+
+
+# ───── Reference: the original per-signal implementation ─────
+
+def ref_z_score(current: float, baseline: float, epsilon: float = 1e-6) -> float:
+    if baseline < epsilon:
+        return min(current / epsilon, 10.0)
+    return (current - baseline) / baseline
+
+
+def ref_features(source: str, signal: dict) -> dict:
+    return {
+        feature: ref_z_score(signal[cur], signal[base])
+        for feature, (cur, base) in FEATURE_COLUMNS[source].items()
+    }
+
+
+def ref_momentum(features: dict) -> float:
+    score = 0.0
+    for weights in SCORING_WEIGHTS.values():
+        for key, weight in weights.items():
+            if key in features:
+                score += max(-5.0, min(5.0, features[key])) * weight
+    return score
+
+
+def ref_novelty(first_seen: str, now: datetime) -> float:
+    age_days = (now - datetime.fromisoformat(first_seen)).days
+    if age_days <= NOVELTY_BONUS_DAYS:
+        return NOVELTY_BONUS_MULTIPLIER * (1.0 - age_days / NOVELTY_BONUS_DAYS)
+    return 0.0
+
+
+def ref_quality_penalty(features: dict, snippets: list[dict] | None) -> float:
+    penalty = 1.0
+    if features.get("z_new_wallet_share", 0) > 2.0 and features.get("z_retention", 0) < 0.0:
+        penalty *= QUALITY_PENALTY["penalty_multiplier"]
+    if snippets:
+        hype_count = sum(1 for s in snippets if s.get("class") == "hype")
+        if hype_count / len(snippets) > QUALITY_PENALTY["single_author_hype_ratio"]:
+            penalty *= QUALITY_PENALTY["penalty_multiplier"]
+    return penalty
+
+
+def ref_score(sig: dict, now: datetime) -> dict:
+    features = {}
+    for source in FEATURE_COLUMNS:
+        if source in sig:
+            features.update(ref_features(source, sig[source]))
+    momentum = ref_momentum(features)
+    novelty = ref_novelty(sig["first_seen"], now)
+    quality = ref_quality_penalty(features, sig.get("social", {}).get("snippets"))
+    return {
+        **features,
+        "momentum": momentum,
+        "novelty": novelty,
+        "quality": quality,
+        "total_score": max(0.0, (momentum + novelty) * quality),
+    }
+
+
+def ref_normalize(scores: list[float]) -> list[float]:
+    min_s, max_s = min(scores), max(scores)
+    if max_s - min_s < 1e-8:
+        return [0.5] * len(scores)
+    return [(s - min_s) / (max_s - min_s) for s in scores]
+
+
+# ───── Inputs ─────
+
+def _random_signals(seed: int) -> list[dict]:
+    """Heavy-tailed metrics, zero and sub-epsilon baselines, absent sources, hype snippets."""
+    rng = np.random.default_rng(seed)
+    signals = []
+    for i in range(N_SIGNALS):
+        sig = {"key": f"entity-{i}"}
+        for source, feature_cols in FEATURE_COLUMNS.items():
+            if rng.random() < 0.15:
+                continue  # source absent for this entity
+            src = {}
+            for cur, base in feature_cols.values():
+                roll = rng.random()
+                src[base] = 0.0 if roll < 0.05 else 1e-7 if roll < 0.1 else float(rng.lognormal(2.0, 1.5))
+                src[cur] = float(src[base] * rng.lognormal(0.0, 1.0) + rng.normal(0.0, 5.0))
+            sig[source] = src
+        if "social" in sig and rng.random() < 0.5:
+            sig["social"]["snippets"] = [
+                {"class": "hype" if rng.random() < 0.6 else "pain"}
+                for _ in range(rng.integers(0, 8))
+            ]
+        age = timedelta(seconds=int(rng.integers(-2 * 86_400, 90 * 86_400)), microseconds=int(rng.integers(0, 10**6)))
+        sig["first_seen"] = (NOW - age).isoformat()
+        signals.append(sig)
+    return signals
+
+
+@pytest.fixture(scope="module", params=[0, 1, 2])
+def scored(request):
+    signals = _random_signals(request.param)
+    return signals, [ref_score(sig, NOW) for sig in signals], score_columns(signals_to_columns(signals), NOW)
+
+
+# ───── Vectorized path ─────
+
+def test_scores_match_reference(scored):
+    _, ref, batch = scored
+    for name in ("momentum", "novelty", "quality", "total_score"):
+        expected = np.array([row[name] for row in ref], dtype=np.float64)
+        np.testing.assert_array_equal(batch[name], expected, err_msg=name)
+
+
+def test_features_match_reference(scored):
+    signals, ref, batch = scored
+    for source, feature_cols in FEATURE_COLUMNS.items():
+        has = np.array([source in sig for sig in signals])
+        np.testing.assert_array_equal(batch[f"has_{source}"], has)
+        for feature in feature_cols:
+            expected = np.array([row[feature] for row, h in zip(ref, has) if h])
+            np.testing.assert_array_equal(batch[feature][has], expected, err_msg=feature)
+
+
+def test_normalize_matches_reference(scored):
+    _, ref, batch = scored
+    expected = ref_normalize([row["total_score"] for row in ref])
+    np.testing.assert_array_equal(normalize_scores_array(batch["total_score"]), expected)
+
+
+# ───── Scalar API ─────
+
+SCALAR_FEATURES = {
+    "onchain": compute_onchain_features,
+    "dev": compute_dev_features,
+    "social": compute_social_features,
+}
+
+
+def test_scalar_api_matches_reference(scored):
+    signals, ref, _ = scored
+    for sig, expected in zip(signals[:500], ref):
+        features = {}
+        for source, compute in SCALAR_FEATURES.items():
+            if source in sig:
+                part = compute(sig[source])
+                assert part == ref_features(source, sig[source])
+                features.update(part)
+        momentum = compute_momentum(features)
+        quality = compute_quality_penalty(features, sig.get("social", {}).get("snippets"))
+        assert momentum == expected["momentum"]
+        assert quality == expected["quality"]
+        assert compute_total_score(momentum, expected["novelty"], quality) == expected["total_score"]
+
+
+def test_z_score_edge_cases():
+    for current, baseline in [(0.0, 0.0), (5.0, 0.0), (-3.0, 1e-7), (1e-6, 1e-7), (10.0, 1e-6), (2.0, 4.0)]:
+        assert z_score(current, baseline) == ref_z_score(current, baseline)
+    assert z_score(5.0, 0.0) == 10.0
+
+
+def test_normalize_flat_scores():
+    assert normalize_scores([2.0, 2.0, 2.0]) == [0.5, 0.5, 0.5]
+    assert normalize_scores([]) == []
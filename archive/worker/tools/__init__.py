@@ -2,14 +2,33 @@
 Investigation tools for the narrative hunter agent.
 Each tool takes inputs, performs analysis, and returns structured results.
 In demo mode, tools return pre-constructed results from fixtures.
+
+Tools are `Tool` objects: call them directly from sync code, or
+`await tool.run(...)` from asyncio. `run_tool_calls` fans calls out over
+threads, `run_tool_calls_async` over asyncio tasks.
 """
 
+import functools
+import importlib.util
 import json
-import time
-import requests
-from typing import Any
-from config import DEMO_MODE, GITHUB_TOKEN, FIXTURES_DIR, load_fixture
-from clustering import compute_saturation
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+from config import (
+    DEMO_MODE, GITHUB_TOKEN, FIXTURES_DIR, load_fixture,
+    INVESTIGATION_WORKERS, INVESTIGATION_MAX_IN_FLIGHT,
+)
+from clustering import compute_saturation, CorpusIndex
+from profiling import profiler
+from tools.cache import ToolCache, cache_key
+
+if TYPE_CHECKING:
+    import requests
+    from tools.async_http import AsyncResponse
+
+# Native async GitHub requests need aiohttp; without it async runs use threads
+HAS_AIOHTTP = importlib.util.find_spec("aiohttp") is not None
 
 
 # ───── Tool result type ─────
@@ -21,25 +40,70 @@ class ToolResult:
         output_summary: str,
         evidence_links: list[str],
         evidence_items: list[dict] | None = None,
+        cacheable: bool = True,
     ):
         self.tool = tool
         self.input_json = input_json
         self.output_summary = output_summary
         self.evidence_links = evidence_links
         self.evidence_items = evidence_items or []
+        # Transient failures (network errors etc.) must not be cached
+        self.cacheable = cacheable
+
+    def to_dict(self) -> dict:
+        return {
+            "tool": self.tool,
+            "input_json": self.input_json,
+            "output_summary": self.output_summary,
+            "evidence_links": self.evidence_links,
+            "evidence_items": self.evidence_items,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ToolResult":
+        return cls(**data)
+
+
+# ───── Tool protocol ─────
+class Tool:
+    """
+    An investigation tool, usable from sync and async code alike:
 
+        result = repo_inspector(key, label)              # blocking call
+        result = await repo_inspector.run(key, label)    # in an event loop
 
-# ───── Rate limiter ─────
-_last_request_time = 0.0
-REQUEST_INTERVAL = 1.0  # seconds
+    `run` awaits the tool's native coroutine if one was registered with
+    `@tool.native`; otherwise it runs the sync function on a worker thread,
+    or inline when the tool was declared with blocking=False (no I/O).
+    """
 
+    def __init__(self, fn: Callable[..., ToolResult], blocking: bool = True):
+        functools.update_wrapper(self, fn)
+        self.fn = fn
+        self.blocking = blocking
+        self._native: Callable[..., Awaitable[ToolResult]] | None = None
 
-def _rate_limit():
-    global _last_request_time
-    elapsed = time.time() - _last_request_time
-    if elapsed < REQUEST_INTERVAL:
-        time.sleep(REQUEST_INTERVAL - elapsed)
-    _last_request_time = time.time()
+    def __call__(self, *args: Any, **kwargs: Any) -> ToolResult:
+        return self.fn(*args, **kwargs)
+
+    async def run(self, *args: Any, **kwargs: Any) -> ToolResult:
+        if self._native is not None:
+            return await self._native(*args, **kwargs)
+        if self.blocking:
+            import asyncio
+
+            return await asyncio.to_thread(self.fn, *args, **kwargs)
+        return self.fn(*args, **kwargs)
+
+    def native(self, afn: Callable[..., Awaitable[ToolResult]]) -> Callable[..., Awaitable[ToolResult]]:
+        """Register `afn` as this tool's coroutine implementation (used as a decorator)."""
+        self._native = afn
+        return afn
+
+    @classmethod
+    def nonblocking(cls, fn: Callable[..., ToolResult]) -> "Tool":
+        """Decorator for tools that do no I/O, so `run` calls them on the event loop."""
+        return cls(fn, blocking=False)
 
 
 def _github_headers() -> dict:
@@ -49,9 +113,37 @@ def _github_headers() -> dict:
     return headers
 
 
+GITHUB_API_HOST = "api.github.com"
+
+
+def _github_get(path: str) -> "requests.Response":
+    """GET a GitHub API path through the shared keep-alive, revalidating client."""
+    # requests/urllib3 are imported on the first live call; demo runs never load them
+    from tools.http_client import get_http_client
+
+    return get_http_client().get(
+        f"https://{GITHUB_API_HOST}/{path}",
+        headers=_github_headers(),
+        timeout=10,
+    )
+
+
+async def _github_get_async(path: str) -> "AsyncResponse":
+    """GET a GitHub API path on the current AsyncHttpClient session (or a one-off one)."""
+    from tools.async_http import AsyncHttpClient, current_client
+
+    url = f"https://{GITHUB_API_HOST}/{path}"
+    client = current_client()
+    if client is None:
+        async with AsyncHttpClient() as client:
+            return await client.get(url, headers=_github_headers(), timeout=10)
+    return await client.get(url, headers=_github_headers(), timeout=10)
+
+
 # ═══════════════════════════════════════
 # TOOL: repo_inspector
 # ═══════════════════════════════════════
+@Tool
 def repo_inspector(entity_key: str, entity_label: str, **kwargs: Any) -> ToolResult:
     """Inspect a GitHub repository: README summary, recent commits, releases."""
     if DEMO_MODE:
@@ -60,74 +152,113 @@ def repo_inspector(entity_key: str, entity_label: str, **kwargs: Any) -> ToolRes
     # Try to find a GitHub repo URL from tracked protocols or entity key
     repo_slug = _resolve_repo_slug(entity_key)
     if not repo_slug:
-        return ToolResult(
-            tool="repo_inspector",
-            input_json={"entity_key": entity_key},
-            output_summary=f"No GitHub repository found for {entity_label}.",
-            evidence_links=[],
-        )
+        return _no_repo_result(entity_key, entity_label)
 
-    _rate_limit()
     try:
-        # Get repo info
-        resp = requests.get(
-            f"https://api.github.com/repos/{repo_slug}",
-            headers=_github_headers(),
-            timeout=10,
-        )
-        repo_data = resp.json() if resp.status_code == 200 else {}
-
-        # Get recent commits
-        _rate_limit()
-        commits_resp = requests.get(
-            f"https://api.github.com/repos/{repo_slug}/commits?per_page=5",
-            headers=_github_headers(),
-            timeout=10,
-        )
-        commits = commits_resp.json() if commits_resp.status_code == 200 else []
-
-        # Get releases
-        _rate_limit()
-        releases_resp = requests.get(
-            f"https://api.github.com/repos/{repo_slug}/releases?per_page=3",
-            headers=_github_headers(),
-            timeout=10,
-        )
-        releases = releases_resp.json() if releases_resp.status_code == 200 else []
-
-        desc = repo_data.get("description", "No description")
-        stars = repo_data.get("stargazers_count", 0)
-        forks = repo_data.get("forks_count", 0)
-        commit_msgs = [c.get("commit", {}).get("message", "")[:80] for c in commits[:5]]
-        release_names = [r.get("tag_name", "") for r in releases[:3]]
-
-        summary = (
-            f"Repository: {repo_slug} — {desc}. "
-            f"Stars: {stars}, Forks: {forks}. "
-            f"Recent commits: {'; '.join(commit_msgs[:3])}. "
-            f"Latest releases: {', '.join(release_names) or 'none'}."
-        )
+        responses = [_github_get(path) for path in _repo_paths(repo_slug)]
+        return _repo_result(repo_slug, entity_key, *responses)
+    except Exception as e:
+        return _repo_error_result(entity_key, e)
 
-        links = [f"https://github.com/{repo_slug}"]
-        evidence = [
-            {"type": "dev", "title": f"GitHub: {repo_slug}", "url": links[0],
-             "snippet": f"{stars} stars, {forks} forks. {desc}"},
-        ]
 
-        return ToolResult(
-            tool="repo_inspector",
-            input_json={"repo_slug": repo_slug, "entity_key": entity_key},
-            output_summary=summary,
-            evidence_links=links,
-            evidence_items=evidence,
-        )
+@repo_inspector.native
+async def _repo_inspector_async(entity_key: str, entity_label: str, **kwargs: Any) -> ToolResult:
+    """repo_inspector with its GitHub requests in flight concurrently."""
+    import asyncio
+
+    if DEMO_MODE:
+        return _demo_repo_inspector(entity_key, entity_label)
+    if not HAS_AIOHTTP:
+        return await asyncio.to_thread(repo_inspector.fn, entity_key, entity_label, **kwargs)
+
+    repo_slug = _resolve_repo_slug(entity_key)
+    if not repo_slug:
+        return _no_repo_result(entity_key, entity_label)
+
+    try:
+        responses = await asyncio.gather(*(_github_get_async(path) for path in _repo_paths(repo_slug)))
+        return _repo_result(repo_slug, entity_key, *responses)
     except Exception as e:
+        return _repo_error_result(entity_key, e)
+
+
+def _repo_paths(repo_slug: str) -> tuple[str, str, str]:
+    """API paths for repo info, recent commits and releases."""
+    return (
+        f"repos/{repo_slug}",
+        f"repos/{repo_slug}/commits?per_page=5",
+        f"repos/{repo_slug}/releases?per_page=3",
+    )
+
+
+def _repo_result(repo_slug: str, entity_key: str, resp: Any, commits_resp: Any, releases_resp: Any) -> ToolResult:
+    """
+    Summarize the responses to _repo_paths (requests or async responses alike).
+
+    The HTTP client hands back whatever status is left after its retries. A 404
+    is an answer (no such repo, or nothing listed) and may be cached; any other
+    non-200 (rate limited 403, 5xx) is transient, so the result is not cached.
+    """
+    if resp.status_code == 404:
         return ToolResult(
             tool="repo_inspector",
-            input_json={"entity_key": entity_key},
-            output_summary=f"Error inspecting repo: {str(e)}",
+            input_json={"repo_slug": repo_slug, "entity_key": entity_key},
+            output_summary=f"GitHub repository {repo_slug} not found.",
             evidence_links=[],
         )
+    if resp.status_code != 200:
+        return _repo_error_result(entity_key, f"GitHub returned HTTP {resp.status_code} for {repo_slug}")
+
+    repo_data = resp.json()
+    commits = commits_resp.json() if commits_resp.status_code == 200 else []
+    releases = releases_resp.json() if releases_resp.status_code == 200 else []
+
+    desc = repo_data.get("description", "No description")
+    stars = repo_data.get("stargazers_count", 0)
+    forks = repo_data.get("forks_count", 0)
+    commit_msgs = [c.get("commit", {}).get("message", "")[:80] for c in commits[:5]]
+    release_names = [r.get("tag_name", "") for r in releases[:3]]
+
+    summary = (
+        f"Repository: {repo_slug} — {desc}. "
+        f"Stars: {stars}, Forks: {forks}. "
+        f"Recent commits: {'; '.join(commit_msgs[:3])}. "
+        f"Latest releases: {', '.join(release_names) or 'none'}."
+    )
+
+    links = [f"https://github.com/{repo_slug}"]
+    evidence = [
+        {"type": "dev", "title": f"GitHub: {repo_slug}", "url": links[0],
+         "snippet": f"{stars} stars, {forks} forks. {desc}"},
+    ]
+
+    return ToolResult(
+        tool="repo_inspector",
+        input_json={"repo_slug": repo_slug, "entity_key": entity_key},
+        output_summary=summary,
+        evidence_links=links,
+        evidence_items=evidence,
+        cacheable=all(r.status_code in (200, 404) for r in (commits_resp, releases_resp)),
+    )
+
+
+def _no_repo_result(entity_key: str, entity_label: str) -> ToolResult:
+    return ToolResult(
+        tool="repo_inspector",
+        input_json={"entity_key": entity_key},
+        output_summary=f"No GitHub repository found for {entity_label}.",
+        evidence_links=[],
+    )
+
+
+def _repo_error_result(entity_key: str, error: Exception | str) -> ToolResult:
+    return ToolResult(
+        tool="repo_inspector",
+        input_json={"entity_key": entity_key},
+        output_summary=f"Error inspecting repo: {str(error)}",
+        evidence_links=[],
+        cacheable=False,
+    )
 
 
 def _resolve_repo_slug(entity_key: str) -> str | None:
@@ -192,6 +323,7 @@ def _demo_repo_inspector(entity_key: str, entity_label: str) -> ToolResult:
 # ═══════════════════════════════════════
 # TOOL: idl_differ
 # ═══════════════════════════════════════
+@Tool.nonblocking
 def idl_differ(entity_key: str, entity_label: str, **kwargs: Any) -> ToolResult:
     """Diff IDL or interface surface for tracked protocols."""
     # Always demo mode for IDL diffing (requires repo cloning)
@@ -229,6 +361,7 @@ def idl_differ(entity_key: str, entity_label: str, **kwargs: Any) -> ToolResult:
 # ═══════════════════════════════════════
 # TOOL: dependency_tracker
 # ═══════════════════════════════════════
+@Tool.nonblocking
 def dependency_tracker(entity_key: str, entity_label: str, **kwargs: Any) -> ToolResult:
     """Track dependency adoption across tracked repos."""
     demo_deps = {
@@ -264,6 +397,7 @@ def dependency_tracker(entity_key: str, entity_label: str, **kwargs: Any) -> Too
 # ═══════════════════════════════════════
 # TOOL: social_pain_finder
 # ═══════════════════════════════════════
+@Tool.nonblocking
 def social_pain_finder(
     entity_key: str, entity_label: str,
     snippets: list[dict] | None = None,
@@ -329,15 +463,17 @@ def social_pain_finder(
 # ═══════════════════════════════════════
 # TOOL: competitor_search (Blue Ocean)
 # ═══════════════════════════════════════
+@Tool
 def competitor_search(
     idea_text: str,
-    idea_embedding: list[float] | None = None,
-    corpus_embeddings: dict[str, list[float]] | None = None,
+    idea_embedding: Sequence[float] | None = None,
+    corpus_embeddings: Mapping[str, Sequence[float]] | CorpusIndex | None = None,
     corpus_meta: dict[str, dict] | None = None,
     **kwargs: Any,
 ) -> ToolResult:
     """Search project corpus for nearest competitors (Blue Ocean check)."""
-    if not corpus_embeddings or not idea_embedding:
+    # len(), not truthiness: embeddings may be NumPy rows (e.g. from an EmbeddingStore)
+    if corpus_embeddings is None or idea_embedding is None or not len(corpus_embeddings) or not len(idea_embedding):
         return ToolResult(
             tool="competitor_search",
             input_json={"idea_text": idea_text[:100]},
@@ -366,3 +502,118 @@ def competitor_search(
         output_summary=summary,
         evidence_links=[],
     )
+
+
+# ═══════════════════════════════════════
+# Concurrent executor
+# ═══════════════════════════════════════
+ToolCall = tuple[Callable[..., ToolResult], tuple, dict]
+
+
+def run_tool_calls(
+    calls: list[ToolCall],
+    max_workers: int = INVESTIGATION_WORKERS,
+    cache: ToolCache | None = None,
+    scope: str = "",
+) -> list[ToolResult]:
+    """
+    Run (tool, args, kwargs) calls on a thread pool and return results in call order.
+
+    Network-bound tools additionally respect per-host limits via `tools.ratelimit.host_slot`,
+    so max_workers only bounds total parallelism. With a `cache`, calls whose
+    (tool, inputs, scope) were already answered are served from it and only the
+    misses are executed. Exceptions propagate as they would from a sequential call.
+    """
+    results, keys, pending = _cached_results(calls, cache, scope)
+
+    def call(i: int) -> ToolResult:
+        tool, args, kwargs = calls[i]
+        with profiler.tool(tool.__name__):
+            return tool(*args, **kwargs)
+
+    if max_workers <= 1 or len(pending) <= 1:
+        fresh = [call(i) for i in pending]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool") as pool:
+            futures = [pool.submit(call, i) for i in pending]
+            fresh = [f.result() for f in futures]
+
+    _store_results(results, keys, pending, fresh, cache)
+    return results
+
+
+async def run_tool_calls_async(
+    calls: list[ToolCall],
+    max_in_flight: int = INVESTIGATION_MAX_IN_FLIGHT,
+    cache: ToolCache | None = None,
+    scope: str = "",
+) -> list[ToolResult]:
+    """
+    Asyncio counterpart of run_tool_calls: each call is a task awaiting `Tool.run`
+    (plain functions run on threads), at most max_in_flight at once, and the GitHub
+    requests share one AsyncHttpClient session. Per-host caps and rate limits
+    apply as with threads. On the first exception the remaining calls are cancelled.
+    """
+    import asyncio  # ~40 ms; only async runs pay for it
+
+    results, keys, pending = _cached_results(calls, cache, scope)
+    limit = asyncio.Semaphore(max(1, max_in_flight))
+
+    async def call(i: int) -> ToolResult:
+        tool, args, kwargs = calls[i]
+        run = tool.run if isinstance(tool, Tool) else Tool(tool).run
+        async with limit:
+            with profiler.tool(tool.__name__):
+                return await run(*args, **kwargs)
+
+    session = nullcontext()
+    if pending and HAS_AIOHTTP and not DEMO_MODE:
+        from tools.async_http import AsyncHttpClient
+        session = AsyncHttpClient()
+
+    async with session:
+        tasks = [asyncio.ensure_future(call(i)) for i in pending]
+        try:
+            fresh = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    _store_results(results, keys, pending, fresh, cache)
+    return results
+
+
+def _cached_results(
+    calls: list[ToolCall], cache: ToolCache | None, scope: str,
+) -> tuple[list[ToolResult | None], list[str | None], list[int]]:
+    """(results with cache hits filled in, cache keys, indices of calls still to run)."""
+    results: list[ToolResult | None] = [None] * len(calls)
+    keys: list[str | None] = [None] * len(calls)
+    if cache is None:
+        return results, keys, list(range(len(calls)))
+
+    pending = []
+    for i, (tool, args, kwargs) in enumerate(calls):
+        keys[i] = cache_key(tool.__name__, args, kwargs, scope)
+        hit = cache.get(keys[i])
+        if hit is not None:
+            results[i] = ToolResult.from_dict(hit)
+            profiler.count("tool_cache_hits")
+        else:
+            pending.append(i)
+    return results, keys, pending
+
+
+def _store_results(
+    results: list[ToolResult | None],
+    keys: list[str | None],
+    pending: list[int],
+    fresh: list[ToolResult],
+    cache: ToolCache | None,
+) -> None:
+    for i, result in zip(pending, fresh):
+        results[i] = result
+        if cache is not None and result.cacheable:
+            cache.put(keys[i], result.tool, result.to_dict())
@@ -0,0 +1,144 @@
+"""
+Asyncio HTTP client for investigation tools.
+
+The aiohttp counterpart of tools.http_client. Tools running as asyncio tasks
+keep many requests in flight on one event loop, where the threaded client
+needs a blocked thread per request. It shares everything that enforces limits
+or saves requests with the threaded client: the per-host token buckets
+(`rate_limiter`, fed back from X-RateLimit-* headers), the HOST_CONCURRENCY
+slots (`host_slot`, so threads and tasks together stay under one cap per
+host), the retry policy and the on-disk ETag / Last-Modified store, so either
+client revalidates what the other fetched.
+
+A client owns one aiohttp session and belongs to the event loop that opened it:
+
+    async with AsyncHttpClient() as client:
+        resp = await client.get(url)
+
+Inside that block `current_client()` returns it, so tools share the session
+without it being passed through every call.
+"""
+
+import asyncio
+import json
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Mapping
+
+import aiohttp
+from multidict import CIMultiDict
+
+from config import (
+    HTTP_CACHE_DIR, HTTP_MAX_RETRIES, HTTP_RETRY_BACKOFF,
+    HTTP_ASYNC_MAX_CONNECTIONS,
+)
+from profiling import profiler
+from tools.http_client import RETRY_STATUSES, ValidatorStore
+from tools.ratelimit import rate_limiter, host_slot_async, host_of
+
+_current: ContextVar["AsyncHttpClient | None"] = ContextVar("async_http_client", default=None)
+
+
+class AsyncResponse:
+    """A fully read response exposing the requests.Response attributes tools use."""
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: Mapping[str, str],
+        text: str,
+        from_cache: bool = False,
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CIMultiDict(headers)
+        self.text = text
+        self.from_cache = from_cache
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class AsyncHttpClient:
+    """aiohttp session with bounded retries, rate limiting and conditional GETs."""
+
+    def __init__(
+        self,
+        cache_dir: Path | None = HTTP_CACHE_DIR,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff: float = HTTP_RETRY_BACKOFF,
+        max_connections: int = HTTP_ASYNC_MAX_CONNECTIONS,
+    ):
+        self.validators = ValidatorStore(cache_dir) if cache_dir else None
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self.session: aiohttp.ClientSession | None = None
+        self._token: Token | None = None
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector)
+        self._token = _current.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        _current.reset(self._token)
+        await self.session.close()
+        self.session = None
+        return False
+
+    async def get(self, url: str, headers: dict | None = None, timeout: float = 10) -> AsyncResponse:
+        """GET `url`; a 304 revalidation is returned as the stored 200 response."""
+        host = host_of(url)
+        headers = dict(headers or {})
+        cached = await asyncio.to_thread(self.validators.get, url) if self.validators else None
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        async with host_slot_async(host):
+            resp = await self._fetch(url, host, headers, timeout)
+        profiler.count("http_requests")
+
+        if resp.status_code == 304 and cached:
+            profiler.count("http_not_modified")
+            return AsyncResponse(
+                url, 200, {**cached.get("headers", {}), **resp.headers}, cached["body"], from_cache=True,
+            )
+        if resp.status_code == 200 and self.validators and (
+            "ETag" in resp.headers or "Last-Modified" in resp.headers
+        ):
+            await asyncio.to_thread(self.validators.put, url, resp.headers, resp.text)
+        return resp
+
+    async def _fetch(self, url: str, host: str, headers: dict, timeout: float) -> AsyncResponse:
+        """
+        GET with up to max_retries retries on connection errors and RETRY_STATUSES.
+        Every attempt takes a rate-limit token; Retry-After pauses the host's bucket.
+        """
+        attempt = 0
+        while True:
+            await rate_limiter.acquire_async(host)
+            try:
+                async with self.session.get(
+                    url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout),
+                ) as raw:
+                    resp = AsyncResponse(str(raw.url), raw.status, raw.headers, await raw.text())
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                rate_limiter.observe(host, resp.headers, resp.status_code)
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return resp
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+
+def current_client() -> AsyncHttpClient | None:
+    """The client opened by the innermost enclosing `async with AsyncHttpClient()`, if any."""
+    return _current.get()
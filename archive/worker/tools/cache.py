@@ -0,0 +1,116 @@
+"""
+Content-addressed on-disk caches for investigation tool results and LLM responses.
+
+Entries are keyed by a SHA-256 of their inputs (for tools: tool name, normalized
+inputs and a scope carrying the report period and mode) and stored in SQLite
+as zlib-compressed JSON. Entries expire after a TTL, and the least recently
+used ones are evicted once the cache grows past its size budget.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any
+
+from config import TOOL_CACHE_PATH, TOOL_CACHE_TTL_SECONDS, TOOL_CACHE_MAX_BYTES
+
+# Bump to invalidate every cached result when tool output formats change
+CACHE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key      TEXT PRIMARY KEY,
+    kind     TEXT NOT NULL,
+    value    BLOB NOT NULL,
+    size     INTEGER NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+def cache_key(tool: str, args: tuple, kwargs: dict, scope: str = "") -> str:
+    """Stable hash of a tool call: tool name + canonical JSON of its inputs + scope."""
+    payload = json.dumps(
+        {"v": CACHE_VERSION, "tool": tool, "args": list(args), "kwargs": kwargs, "scope": scope},
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class DiskCache:
+    """SQLite-backed cache of JSON values with TTL and LRU eviction."""
+
+    def __init__(self, path: Path, ttl_seconds: float, max_bytes: int):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def get(self, key: str) -> dict | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, created FROM entries WHERE key = ?", (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, kind: str, value: dict[str, Any]) -> None:
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode())
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                """INSERT OR REPLACE INTO entries (key, kind, value, size, created, accessed)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (key, kind, blob, len(blob), now, now),
+            )
+
+    def evict(self) -> int:
+        """Drop expired entries, then LRU entries until under max_bytes. Returns rows removed."""
+        with self._lock:
+            removed = self._db.execute(
+                "DELETE FROM entries WHERE created < ?", (time.time() - self.ttl_seconds,),
+            ).rowcount
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return removed
+            excess = total - self.max_bytes
+            doomed, freed = [], 0
+            for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                if freed >= excess:
+                    break
+                doomed.append((key,))
+                freed += size
+            self._db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+            return removed + len(doomed)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class ToolCache(DiskCache):
+    """Cache of serialized ToolResult dicts (TOOL_CACHE_* settings)."""
+
+    def __init__(
+        self,
+        path: Path = TOOL_CACHE_PATH,
+        ttl_seconds: float = TOOL_CACHE_TTL_SECONDS,
+        max_bytes: int = TOOL_CACHE_MAX_BYTES,
+    ):
+        super().__init__(path, ttl_seconds, max_bytes)
@@ -0,0 +1,145 @@
+"""
+Shared HTTP client for investigation tools.
+
+One pooled `requests.Session` keeps connections alive across calls, retries
+transient failures with exponential backoff, and goes through the per-host
+concurrency caps and token buckets in `tools.ratelimit`. Successful responses
+carrying an ETag or Last-Modified are stored on disk, so the next run (e.g.
+the next fortnight) revalidates with If-None-Match / If-Modified-Since and a
+304 is served from the stored body. GitHub does not count 304s against the
+rate limit. tools.async_http is the asyncio counterpart and shares the same
+limits, retry policy and validator store.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Mapping
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from config import (
+    HTTP_CACHE_DIR, HTTP_MAX_RETRIES, HTTP_RETRY_BACKOFF,
+    HTTP_POOL_SIZE,
+)
+from profiling import profiler
+from tools.ratelimit import rate_limiter, host_slot, host_of
+
+# Response headers worth keeping alongside a cached body
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+# Statuses retried with exponential backoff
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class ValidatorStore:
+    """On-disk map of URL → {etag, last_modified, headers, body} for revalidation."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> dict | None:
+        try:
+            with open(self._path(url)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, url: str, headers: Mapping[str, str], body: str) -> None:
+        """Store a 200 response's validators (`headers` must be case-insensitive) and body."""
+        entry = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "headers": {k: headers[k] for k in _KEPT_HEADERS if k in headers},
+            "body": body,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(url)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+
+class HttpClient:
+    """Keep-alive session with bounded retries, rate limiting and conditional GETs."""
+
+    def __init__(
+        self,
+        cache_dir: Path | None = HTTP_CACHE_DIR,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff: float = HTTP_RETRY_BACKOFF,
+        pool_size: int = HTTP_POOL_SIZE,
+    ):
+        self.validators = ValidatorStore(cache_dir) if cache_dir else None
+        self.session = requests.Session()
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, headers: dict | None = None, timeout: float = 10) -> requests.Response:
+        """GET `url`; a 304 revalidation is returned as the stored 200 response."""
+        host = host_of(url)
+        headers = dict(headers or {})
+        cached = self.validators.get(url) if self.validators else None
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        with host_slot(host):
+            rate_limiter.acquire(host)
+            resp = self.session.get(url, headers=headers, timeout=timeout)
+        rate_limiter.observe(host, resp.headers, resp.status_code)
+        profiler.count("http_requests")
+
+        if resp.status_code == 304 and cached:
+            profiler.count("http_not_modified")
+            return _from_cache(url, cached, resp)
+        if resp.status_code == 200 and self.validators and (
+            "ETag" in resp.headers or "Last-Modified" in resp.headers
+        ):
+            self.validators.put(url, resp.headers, resp.text)
+        return resp
+
+
+def _from_cache(url: str, cached: dict, not_modified: requests.Response) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = url
+    resp._content = cached["body"].encode("utf-8")
+    resp.encoding = "utf-8"
+    resp.headers = CaseInsensitiveDict({**cached.get("headers", {}), **not_modified.headers})
+    resp.request = not_modified.request
+    resp.from_cache = True
+    return resp
+
+
+_client: HttpClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Process-wide shared client, created on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
@@ -0,0 +1,179 @@
+"""
+Per-host token-bucket rate limiting for investigation tools.
+
+Buckets hand out reservations under a short lock and callers sleep outside it,
+so the same limiter is safe to share between threads (`acquire`) and asyncio
+tasks (`acquire_async`). After each response, `observe` feeds the server's
+rate-limit headers back into the host's bucket so throughput tracks the budget
+the server actually reports.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Mapping
+from urllib.parse import urlparse
+
+from config import (
+    HOST_RATE_LIMITS, DEFAULT_HOST_RATE_LIMIT,
+    HOST_CONCURRENCY, DEFAULT_HOST_CONCURRENCY,
+)
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens/second up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Tokens may go negative: each waiter queues behind the previous ones
+            self.tokens -= 1.0
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Block every caller for `seconds` (e.g. on Retry-After)."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def adapt(self, remaining: int, reset_in: float) -> None:
+        """Spread the server-reported remaining budget evenly over its reset window."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if remaining <= 0:
+                self.blocked_until = max(self.blocked_until, now + reset_in)
+                return
+            self.rate = min(self.max_rate, remaining / max(reset_in, 1.0))
+            self.tokens = min(self.tokens, float(remaining))
+
+
+class RateLimiter:
+    """Registry of token buckets keyed by host, with budgets from HOST_RATE_LIMITS."""
+
+    def __init__(
+        self,
+        budgets: Mapping[str, tuple[float, float]] | None = None,
+        default: tuple[float, float] = DEFAULT_HOST_RATE_LIMIT,
+    ):
+        self.budgets = dict(HOST_RATE_LIMITS if budgets is None else budgets)
+        self.default = default
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        host = host_of(host)
+        with self._lock:
+            if host not in self._buckets:
+                rate, burst = self.budgets.get(host, self.default)
+                self._buckets[host] = TokenBucket(rate, burst)
+            return self._buckets[host]
+
+    def acquire(self, host: str) -> None:
+        self.bucket(host).acquire()
+
+    async def acquire_async(self, host: str) -> None:
+        await self.bucket(host).acquire_async()
+
+    def observe(self, host: str, headers: Mapping[str, str], status: int | None = None) -> None:
+        """Adapt a host's bucket to Retry-After / X-RateLimit-* response headers."""
+        bucket = self.bucket(host)
+
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None:
+            bucket.pause(retry_after)
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            try:
+                bucket.adapt(int(remaining), max(0.0, float(reset) - time.time()))
+            except ValueError:
+                pass
+        elif status == 429 and retry_after is None:
+            # Throttled without guidance: back off for one refill interval
+            bucket.pause(1.0 / bucket.rate)
+
+
+def host_of(url_or_host: str) -> str:
+    if "://" in url_or_host:
+        return urlparse(url_or_host).hostname or url_or_host
+    return url_or_host
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Shared process-wide limiter used by the tools
+rate_limiter = RateLimiter()
+
+
+# ───── Per-host concurrency limits ─────
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
+
+def host_slot(host: str) -> threading.BoundedSemaphore:
+    """Semaphore capping in-flight requests to `host` (see HOST_CONCURRENCY)."""
+    host = host_of(host)
+    with _host_slots_lock:
+        if host not in _host_slots:
+            limit = HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY)
+            _host_slots[host] = threading.BoundedSemaphore(max(1, limit))
+        return _host_slots[host]
+
+
+@asynccontextmanager
+async def host_slot_async(host: str) -> AsyncIterator[None]:
+    """
+    Hold one of `host_slot(host)`'s slots from an asyncio task, so threads and
+    tasks draw on the same cap. Polls rather than blocking the event loop or
+    parking an executor thread on the semaphore.
+    """
+    slot = host_slot(host)
+    delay = 0.005
+    while not slot.acquire(blocking=False):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.05)
+    try:
+        yield
+    finally:
+        slot.release()
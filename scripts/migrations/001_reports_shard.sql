@@ -0,0 +1,11 @@
+-- Reports are unique per (period, shard) so batch runs can write one report per
+-- entity shard for the same period. Matches apps/web/prisma/schema.prisma;
+-- `prisma db push` applies the same change. Safe to run more than once.
+ALTER TABLE reports ADD COLUMN IF NOT EXISTS shard TEXT NOT NULL DEFAULT '';
+
+UPDATE reports SET shard = config_json->>'shard'
+WHERE shard = '' AND COALESCE(config_json->>'shard', '') <> '';
+
+DROP INDEX IF EXISTS "reports_period_start_period_end_key";
+CREATE UNIQUE INDEX IF NOT EXISTS "reports_period_start_period_end_shard_key"
+    ON reports (period_start, period_end, shard);